@@ -1,24 +1,79 @@
+import asyncio
+import aiohttp
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Optional
 import pandas as pd
 from pathlib import Path
 from loguru import logger
 import openai
 import os
 from dotenv import load_dotenv
+from .map_reduce import chunk_records, estimate_tokens, gather_bounded, pack_texts
+from .sketches import ApproxSummary
+from .partitioned import Aggregates, Partition, aggregate_partitions
 
 load_dotenv()
 
+SYSTEM_PROMPT = "You are a data analysis expert. Provide detailed insights in markdown format."
+
+MAP_PROMPT = """
+Below is one chunk of a scraped dataset in CSV form. Summarize it for an analyst who
+will combine many such summaries: counts, value ranges, notable groups, outliers and
+recurring patterns. Use concrete numbers and names. Be concise.
+"""
+
+REDUCE_PROMPT = """
+Below are summaries of chunks of one dataset. Merge them into a single summary that
+keeps the concrete numbers, names, outliers and patterns. Be concise.
+"""
+
+
 class BaseAnalysis(ABC):
+    # Map-reduce insight settings (AI_* environment variables override them)
+    map_reduce = False
+    chunk_tokens = 3000
+    max_in_flight = 8
+    request_timeout = 60.0
+    # Columns summarized by analyze_approx: {'categorical': [...], 'numeric': [...], 'multi_valued': {column: separator}}
+    approx_columns: Dict[str, Any] = {}
+    
     def __init__(self):
         self.logger = logger.bind(analysis=self.__class__.__name__)
         openai.api_key = os.getenv('OPENAI_API_KEY')
+        if os.getenv('OPENAI_API_BASE'):
+            # e.g. a local stub endpoint for tests
+            openai.api_base = os.getenv('OPENAI_API_BASE')
+        self.model = os.getenv('OPENAI_MODEL', "gpt-3.5-turbo")
+        self.map_reduce = os.getenv('AI_MAP_REDUCE', str(self.map_reduce)).lower() in ("1", "true", "yes")
+        self.chunk_tokens = int(os.getenv('AI_CHUNK_TOKENS', self.chunk_tokens))
+        self.max_in_flight = int(os.getenv('AI_MAX_IN_FLIGHT', self.max_in_flight))
+        self.request_timeout = float(os.getenv('AI_REQUEST_TIMEOUT', self.request_timeout))
     
     @abstractmethod
     def analyze(self, data: pd.DataFrame) -> Dict[str, Any]:
         """Main analysis method to be implemented by subclasses"""
         pass
     
+    def analyze_approx(self, chunks: Iterable[pd.DataFrame], top_k: int = 10) -> Dict[str, Any]:
+        """Single-pass, bounded-memory statistics over a stream of chunks (no AI call)"""
+        summary = ApproxSummary(top_k=top_k, **self.approx_columns)
+        for chunk in chunks:
+            summary.update(chunk)
+        return summary.result()
+    
+    def partial_stats(self, data: pd.DataFrame) -> Aggregates:
+        """Mergeable statistics of one partition, for analyze_partitioned"""
+        raise NotImplementedError(f"{self.__class__.__name__} does not support partitioned analysis")
+    
+    def finalize_stats(self, stats: Aggregates) -> Dict[str, Any]:
+        """Insights from merged partition statistics, with the same keys and values as analyze()"""
+        raise NotImplementedError(f"{self.__class__.__name__} does not support partitioned analysis")
+    
+    def analyze_partitioned(self, partitions: Iterable[Partition], workers: Optional[int] = None) -> Dict[str, Any]:
+        """Out-of-core statistics: partial aggregates per partition in a process pool, merged (no AI call)"""
+        stats = aggregate_partitions(self.__class__, partitions, workers)
+        return self.finalize_stats(stats)
+    
     def generate_ai_insights(self, prompt: str, data_context: str = "") -> str:
         """Generate AI insights using OpenAI GPT"""
         try:
@@ -32,9 +87,9 @@ class BaseAnalysis(ABC):
             """
             
             response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
+                model=self.model,
                 messages=[
-                    {"role": "system", "content": "You are a data analysis expert. Provide detailed insights in markdown format."},
+                    {"role": "system", "content": SYSTEM_PROMPT},
                     {"role": "user", "content": full_prompt}
                 ],
                 max_tokens=1000,
@@ -46,6 +101,90 @@ class BaseAnalysis(ABC):
             self.logger.error(f"AI analysis failed: {e}")
             return f"AI analysis failed: {str(e)}"
     
+    def generate_insights(self, data: pd.DataFrame, prompt: str, data_context: str = "") -> str:
+        """AI insights from the aggregates, or from the whole dataset when map-reduce is enabled"""
+        if self.map_reduce:
+            return self.generate_map_reduce_insights(data, prompt, data_context)
+        return self.generate_ai_insights(prompt, data_context)
+    
+    def generate_map_reduce_insights(self, data: pd.DataFrame, prompt: str, data_context: str = "") -> str:
+        """Summarize every row of ``data`` in token-budgeted chunks, then reduce into the report.
+        
+        Chunk summaries run concurrently with at most ``max_in_flight`` requests
+        and a per-request timeout; summaries are merged level by level until they
+        fit one request, which produces the final report.
+        """
+        try:
+            return asyncio.run(self._map_reduce(data, prompt, data_context))
+        except Exception as e:
+            self.logger.error(f"Map-reduce AI analysis failed: {e}")
+            return f"AI analysis failed: {str(e)}"
+    
+    async def _complete(self, content: str, max_tokens: int) -> str:
+        response = await openai.ChatCompletion.acreate(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": content}
+            ],
+            max_tokens=max_tokens,
+            temperature=0.3,
+            request_timeout=self.request_timeout
+        )
+        return response.choices[0].message.content
+    
+    async def _summarize_all(self, instructions: str, texts: List[str], max_tokens: int) -> List[str]:
+        calls = [
+            lambda text=text: self._complete(f"{instructions}\n\n{text}", max_tokens)
+            for text in texts
+        ]
+        results = await gather_bounded(calls, self.max_in_flight, self.request_timeout)
+        failed = sum(result is None for result in results)
+        if failed:
+            self.logger.warning(f"{failed} of {len(texts)} summary calls failed")
+        return [result for result in results if result]
+    
+    async def _map_reduce(self, data: pd.DataFrame, prompt: str, data_context: str) -> str:
+        # One pooled HTTP session for all calls instead of a connection per request
+        async with aiohttp.ClientSession() as session:
+            openai.aiosession.set(session)
+            try:
+                return await self._run_map_reduce(data, prompt, data_context)
+            finally:
+                openai.aiosession.set(None)
+    
+    async def _run_map_reduce(self, data: pd.DataFrame, prompt: str, data_context: str) -> str:
+        chunks = chunk_records(data, self.chunk_tokens)
+        self.logger.info(f"Map-reduce: {len(data)} rows in {len(chunks)} chunks, {self.max_in_flight} calls in flight")
+        summaries = await self._summarize_all(MAP_PROMPT, chunks, max_tokens=400)
+        if not summaries:
+            raise RuntimeError("every chunk summary failed")
+        
+        # Merge summaries until they fit into the final request
+        while len(summaries) > 1 and estimate_tokens("\n\n".join(summaries)) > self.chunk_tokens:
+            batches = pack_texts(summaries, self.chunk_tokens)
+            if len(batches) == len(summaries):
+                # Each summary alone fills a request: merge pairs so the loop shrinks
+                batches = [summaries[i:i + 2] for i in range(0, len(summaries), 2)]
+            summaries = await self._summarize_all(
+                REDUCE_PROMPT, ["\n\n---\n\n".join(batch) for batch in batches], max_tokens=600
+            )
+            if not summaries:
+                raise RuntimeError("every reduce call failed")
+        
+        final_prompt = f"""
+            {data_context}
+            
+            Summaries covering all {len(data)} records:
+            {chr(10).join(summaries)}
+            
+            {prompt}
+            
+            Please provide comprehensive, data-driven insights in markdown format.
+            Include specific findings, trends, and actionable recommendations.
+            """
+        return await asyncio.wait_for(self._complete(final_prompt, max_tokens=1000), self.request_timeout)
+    
     def save_report(self, insights: str, domain: str, report_name: str):
         """Save analysis report"""
         report_dir = Path(f"outputs/report")
@@ -1,24 +1,15 @@
 import pandas as pd
 from .base_analysis import BaseAnalysis
+from .partitioned import Aggregates, FrequencyTable, GroupedStats, NumberStats
 from typing import Dict, Any
 
 class BooksAnalysis(BaseAnalysis):
+    approx_columns = {'categorical': ['rating', 'availability'], 'numeric': ['price']}
+
     def analyze(self, data: pd.DataFrame) -> Dict[str, Any]:
         """Analyze books data and generate insights"""
-        insights = {}
-        
-        # Basic statistics
-        insights['total_books'] = len(data)
-        insights['avg_price'] = data['price'].mean()
-        insights['price_range'] = (data['price'].min(), data['price'].max())
-        
-        # Rating distribution
-        rating_counts = data['rating'].value_counts().to_dict()
-        insights['rating_distribution'] = rating_counts
-        
-        # Price analysis by rating
-        price_by_rating = data.groupby('rating')['price'].agg(['mean', 'min', 'max']).to_dict()
-        insights['price_by_rating'] = price_by_rating
+        # Counts, sums, min/max and distributions (shared with analyze_partitioned)
+        insights = self.finalize_stats(self.partial_stats(data))
         
         # Generate AI insights
         ai_insights = self._generate_book_insights(data, insights)
@@ -26,6 +17,24 @@ class BooksAnalysis(BaseAnalysis):
         
         return insights
     
+    def partial_stats(self, data: pd.DataFrame) -> Aggregates:
+        stats = Aggregates(data)
+        stats.numbers['price'] = NumberStats.of(data['price'])
+        stats.frequencies['rating'] = FrequencyTable.of(data['rating'])
+        stats.grouped['price_by_rating'] = GroupedStats.of(data['rating'], data['price'])
+        return stats
+    
+    def finalize_stats(self, stats: Aggregates) -> Dict[str, Any]:
+        price = stats.numbers['price']
+        return {
+            'total_books': stats.rows,
+            'unique_items': stats.unique_items(),
+            'avg_price': price.mean,
+            'price_range': (price.min, price.max),
+            'rating_distribution': stats.frequencies['rating'].to_dict(),
+            'price_by_rating': stats.grouped['price_by_rating'].to_dict(['mean', 'min', 'max']),
+        }
+    
     def _generate_book_insights(self, data: pd.DataFrame, basic_stats: Dict) -> str:
         """Generate comprehensive AI insights about books data"""
         
@@ -48,4 +57,4 @@ class BooksAnalysis(BaseAnalysis):
         Format the response as a comprehensive market analysis report.
         """
         
-        return self.generate_ai_insights(prompt, data_context)
\ No newline at end of file
+        return self.generate_insights(data, prompt, data_context)
\ No newline at end of file
@@ -1,54 +1,59 @@
 import pandas as pd
 from .base_analysis import BaseAnalysis
-from typing import Dict, Any
+from .partitioned import Aggregates, FrequencyTable, NumberStats
+from typing import Dict, Any, List
 import re
 
 class EcommerceAnalysis(BaseAnalysis):
+    approx_columns = {'categorical': ['availability', 'rating'], 'numeric': ['price']}
+
     def analyze(self, data: pd.DataFrame) -> Dict[str, Any]:
         """Analyze e-commerce data and generate insights"""
-        insights = {}
+        # Counts, sums, min/max and distributions (shared with analyze_partitioned)
+        insights = self.finalize_stats(self.partial_stats(data))
         
-        # Basic statistics
-        insights['total_products'] = len(data)
+        # Generate AI insights
+        ai_insights = self._generate_ecommerce_insights(data, insights)
+        insights['ai_analysis'] = ai_insights
         
-        # Price analysis
+        return insights
+    
+    def _prices(self, column: pd.Series) -> List[float]:
         prices = []
-        for price_str in data['price']:
-            if price_str != "N/A":
+        for price_str in column:
+            if isinstance(price_str, str) and price_str != "N/A":
                 numeric_price = re.sub(r'[^\d.]', '', price_str)
                 if numeric_price:
                     prices.append(float(numeric_price))
-        
-        if prices:
-            insights['avg_price'] = sum(prices) / len(prices)
-            insights['min_price'] = min(prices)
-            insights['max_price'] = max(prices)
-        else:
-            insights['avg_price'] = insights['min_price'] = insights['max_price'] = 0
-        
-        # Rating analysis
+        return prices
+    
+    def _ratings(self, column: pd.Series) -> List[float]:
         ratings = []
-        for rating_str in data['rating']:
-            if rating_str != "N/A":
-                numeric_rating = re.search(r'\d\.\d', rating_str)
+        for rating_str in column:
+            if pd.notna(rating_str) and rating_str != "N/A":
+                numeric_rating = re.search(r'\d\.\d', str(rating_str))
                 if numeric_rating:
                     ratings.append(float(numeric_rating.group()))
-        
-        if ratings:
-            insights['avg_rating'] = sum(ratings) / len(ratings)
-            insights['min_rating'] = min(ratings)
-            insights['max_rating'] = max(ratings)
-        else:
-            insights['avg_rating'] = insights['min_rating'] = insights['max_rating'] = 0
-        
-        # Availability analysis
-        availability_counts = data['availability'].value_counts().to_dict()
-        insights['availability_distribution'] = availability_counts
-        
-        # Generate AI insights
-        ai_insights = self._generate_ecommerce_insights(data, insights)
-        insights['ai_analysis'] = ai_insights
-        
+        return ratings
+    
+    def partial_stats(self, data: pd.DataFrame) -> Aggregates:
+        stats = Aggregates(data)
+        stats.numbers['price'] = NumberStats.of(self._prices(data['price']))
+        stats.numbers['rating'] = NumberStats.of(self._ratings(data['rating']))
+        stats.frequencies['availability'] = FrequencyTable.of(data['availability'])
+        return stats
+    
+    def finalize_stats(self, stats: Aggregates) -> Dict[str, Any]:
+        insights = {'total_products': stats.rows, 'unique_items': stats.unique_items()}
+        for name in ('price', 'rating'):
+            numbers = stats.numbers[name]
+            if numbers.count:
+                insights[f'avg_{name}'] = numbers.mean
+                insights[f'min_{name}'] = numbers.min
+                insights[f'max_{name}'] = numbers.max
+            else:
+                insights[f'avg_{name}'] = insights[f'min_{name}'] = insights[f'max_{name}'] = 0
+        insights['availability_distribution'] = stats.frequencies['availability'].to_dict()
         return insights
     
     def _generate_ecommerce_insights(self, data: pd.DataFrame, basic_stats: Dict) -> str:
@@ -74,4 +79,4 @@ class EcommerceAnalysis(BaseAnalysis):
         Format the response as a comprehensive e-commerce market analysis report.
         """
         
-        return self.generate_ai_insights(prompt, data_context)
\ No newline at end of file
+        return self.generate_insights(data, prompt, data_context)
\ No newline at end of file
@@ -1,38 +1,30 @@
 import pandas as pd
 from .base_analysis import BaseAnalysis
-from typing import Dict, Any
+from .partitioned import Aggregates, FrequencyTable, NumberStats
+from .skills_analysis import SkillMatrix
+from .topic_clustering import cluster_topics
+from typing import Dict, Any, List
 import re
 
 class EducationAnalysis(BaseAnalysis):
+    approx_columns = {'categorical': ['instructor', 'duration'], 'numeric': ['rating'], 'multi_valued': {'skills': ','}}
+
     def analyze(self, data: pd.DataFrame) -> Dict[str, Any]:
         """Analyze education data and generate insights"""
-        insights = {}
-        
-        # Basic statistics
-        insights['total_courses'] = len(data)
-        
-        # Instructor analysis
-        instructor_counts = data['instructor'].value_counts().to_dict()
-        insights['instructor_distribution'] = instructor_counts
+        # Counts, sums, min/max and distributions (shared with analyze_partitioned)
+        insights = self.finalize_stats(self.partial_stats(data))
         
-        # Rating analysis
-        ratings = []
-        for rating_str in data['rating']:
-            if rating_str != "N/A":
-                numeric_rating = re.search(r'\d\.\d', rating_str)
-                if numeric_rating:
-                    ratings.append(float(numeric_rating.group()))
-        
-        if ratings:
-            insights['avg_rating'] = sum(ratings) / len(ratings)
-            insights['min_rating'] = min(ratings)
-            insights['max_rating'] = max(ratings)
+        # Skills analysis
+        if 'skills' in data.columns:
+            skills = SkillMatrix.from_series(data['skills'])
+            insights['skill_pairs'] = skills.pmi_pairs(10)
+            insights['instructor_skill_profiles'] = skills.group_profiles(data['instructor'])
         else:
-            insights['avg_rating'] = insights['min_rating'] = insights['max_rating'] = 0
+            insights['skill_pairs'] = []
+            insights['instructor_skill_profiles'] = {}
         
-        # Duration analysis
-        duration_counts = data['duration'].value_counts().to_dict()
-        insights['duration_distribution'] = duration_counts
+        # Topic clusters from course titles
+        insights['topic_clusters'] = cluster_topics(data['course'].tolist(), k=8, name='education_courses')['topics']
         
         # Generate AI insights
         ai_insights = self._generate_education_insights(data, insights)
@@ -40,6 +32,42 @@ class EducationAnalysis(BaseAnalysis):
         
         return insights
     
+    def _ratings(self, column: pd.Series) -> List[float]:
+        ratings = []
+        for rating_str in column:
+            if pd.notna(rating_str) and rating_str != "N/A":
+                numeric_rating = re.search(r'\d\.\d', str(rating_str))
+                if numeric_rating:
+                    ratings.append(float(numeric_rating.group()))
+        return ratings
+    
+    def partial_stats(self, data: pd.DataFrame) -> Aggregates:
+        stats = Aggregates(data)
+        stats.frequencies['instructor'] = FrequencyTable.of(data['instructor'])
+        stats.numbers['rating'] = NumberStats.of(self._ratings(data['rating']))
+        stats.frequencies['duration'] = FrequencyTable.of(data['duration'])
+        if 'skills' in data.columns:
+            stats.frequencies['skills'] = FrequencyTable.of_items(data['skills'])
+        return stats
+    
+    def finalize_stats(self, stats: Aggregates) -> Dict[str, Any]:
+        insights = {
+            'total_courses': stats.rows,
+            'unique_items': stats.unique_items(),
+            'instructor_distribution': stats.frequencies['instructor'].to_dict(),
+        }
+        rating = stats.numbers['rating']
+        if rating.count:
+            insights['avg_rating'] = rating.mean
+            insights['min_rating'] = rating.min
+            insights['max_rating'] = rating.max
+        else:
+            insights['avg_rating'] = insights['min_rating'] = insights['max_rating'] = 0
+        insights['duration_distribution'] = stats.frequencies['duration'].to_dict()
+        skills = stats.frequencies.get('skills')
+        insights['top_skills'] = skills.top(10) if skills is not None else {}
+        return insights
+    
     def _generate_education_insights(self, data: pd.DataFrame, basic_stats: Dict) -> str:
         """Generate comprehensive AI insights about education data"""
         
@@ -50,6 +78,9 @@ class EducationAnalysis(BaseAnalysis):
         - Rating range: {basic_stats['min_rating']:.1f} - {basic_stats['max_rating']:.1f}
         - Top instructors: {dict(list(basic_stats['instructor_distribution'].items())[:5])}
         - Course durations: {dict(list(basic_stats['duration_distribution'].items())[:5])}
+        - Most taught skills: {basic_stats['top_skills']}
+        - Skills most often taught together: {[pair['skills'] for pair in basic_stats['skill_pairs'][:5]]}
+        - Course topics (size, terms): {[(c['size'], c['terms'][:3]) for c in basic_stats['topic_clusters']]}
         """
         
         prompt = """
@@ -63,4 +94,4 @@ class EducationAnalysis(BaseAnalysis):
         Format the response as a comprehensive education market analysis report.
         """
         
-        return self.generate_ai_insights(prompt, data_context)
\ No newline at end of file
+        return self.generate_insights(data, prompt, data_context)
\ No newline at end of file
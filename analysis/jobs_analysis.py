@@ -1,32 +1,26 @@
 import pandas as pd
 from .base_analysis import BaseAnalysis
+from .partitioned import Aggregates, FrequencyTable
+from .skills_analysis import SkillMatrix
+from .topic_clustering import cluster_topics
 from typing import Dict, Any
 import re
 
 class JobsAnalysis(BaseAnalysis):
+    approx_columns = {'categorical': ['company', 'location'], 'multi_valued': {'tags': ','}}
+
     def analyze(self, data: pd.DataFrame) -> Dict[str, Any]:
         """Analyze jobs data and generate insights"""
-        insights = {}
-        
-        # Basic statistics
-        insights['total_jobs'] = len(data)
-        
-        # Company distribution
-        company_counts = data['company'].value_counts().to_dict()
-        insights['company_distribution'] = company_counts
-        
-        # Location analysis
-        location_counts = data['location'].value_counts().to_dict()
-        insights['location_distribution'] = location_counts
+        # Counts, sums, min/max and distributions (shared with analyze_partitioned)
+        insights = self.finalize_stats(self.partial_stats(data))
         
         # Skills/tags analysis
-        all_tags = []
-        for tags in data['tags']:
-            if tags != "N/A":
-                all_tags.extend([tag.strip() for tag in tags.split(',')])
+        skills = SkillMatrix.from_series(data['tags'])
+        insights['skill_pairs'] = skills.pmi_pairs(10)
+        insights['company_skill_profiles'] = skills.group_profiles(data['company'])
         
-        tag_counts = pd.Series(all_tags).value_counts().to_dict()
-        insights['top_skills'] = dict(list(tag_counts.items())[:10])
+        # Role clusters from job titles
+        insights['role_clusters'] = cluster_topics(data['title'].tolist(), k=8, name='jobs_titles')['topics']
         
         # Generate AI insights
         ai_insights = self._generate_jobs_insights(data, insights)
@@ -34,6 +28,22 @@ class JobsAnalysis(BaseAnalysis):
         
         return insights
     
+    def partial_stats(self, data: pd.DataFrame) -> Aggregates:
+        stats = Aggregates(data)
+        stats.frequencies['company'] = FrequencyTable.of(data['company'])
+        stats.frequencies['location'] = FrequencyTable.of(data['location'])
+        stats.frequencies['tags'] = FrequencyTable.of_items(data['tags'])
+        return stats
+    
+    def finalize_stats(self, stats: Aggregates) -> Dict[str, Any]:
+        return {
+            'total_jobs': stats.rows,
+            'unique_items': stats.unique_items(),
+            'company_distribution': stats.frequencies['company'].to_dict(),
+            'location_distribution': stats.frequencies['location'].to_dict(),
+            'top_skills': stats.frequencies['tags'].top(10),
+        }
+    
     def _generate_jobs_insights(self, data: pd.DataFrame, basic_stats: Dict) -> str:
         """Generate comprehensive AI insights about jobs data"""
         
@@ -43,6 +53,8 @@ class JobsAnalysis(BaseAnalysis):
         - Top companies: {dict(list(basic_stats['company_distribution'].items())[:5])}
         - Top locations: {dict(list(basic_stats['location_distribution'].items())[:5])}
         - Top skills in demand: {basic_stats['top_skills']}
+        - Skills most often required together: {[pair['skills'] for pair in basic_stats['skill_pairs'][:5]]}
+        - Role clusters (size, terms): {[(c['size'], c['terms'][:3]) for c in basic_stats['role_clusters']]}
         """
         
         prompt = """
@@ -56,4 +68,4 @@ class JobsAnalysis(BaseAnalysis):
         Format the response as a comprehensive job market analysis report.
         """
         
-        return self.generate_ai_insights(prompt, data_context)
\ No newline at end of file
+        return self.generate_insights(data, prompt, data_context)
\ No newline at end of file
@@ -0,0 +1,72 @@
+import asyncio
+from typing import Awaitable, Callable, Iterable, List, Optional
+
+import pandas as pd
+from loguru import logger
+
+# Columns that cost tokens without telling the model anything
+SKIPPED_COLUMNS = ('scraped_timestamp', 'cluster_id', 'url')
+
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token for English text)"""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def _row_lines(data: pd.DataFrame) -> Iterable[str]:
+    for row in data.itertuples(index=False):
+        yield ",".join("" if v in (None, "N/A") or v != v else str(v).replace(",", ";").replace("\n", " ") for v in row)
+
+
+def chunk_records(data: pd.DataFrame, token_budget: int) -> List[str]:
+    """Split the dataset into CSV chunks (header repeated) of at most ``token_budget`` tokens each"""
+    data = data.drop(columns=[c for c in SKIPPED_COLUMNS if c in data.columns])
+    header = ",".join(map(str, data.columns))
+    header_tokens = estimate_tokens(header)
+
+    chunks, lines, used = [], [], header_tokens
+    for line in _row_lines(data):
+        cost = estimate_tokens(line)
+        if lines and used + cost > token_budget:
+            chunks.append("\n".join([header] + lines))
+            lines, used = [], header_tokens
+        lines.append(line)
+        used += cost
+    if lines:
+        chunks.append("\n".join([header] + lines))
+    return chunks
+
+
+def pack_texts(texts: List[str], token_budget: int) -> List[List[str]]:
+    """Group texts into batches whose combined size stays within ``token_budget``"""
+    batches, batch, used = [], [], 0
+    for text in texts:
+        cost = estimate_tokens(text)
+        if batch and used + cost > token_budget:
+            batches.append(batch)
+            batch, used = [], 0
+        batch.append(text)
+        used += cost
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+async def gather_bounded(calls: List[Callable[[], Awaitable[str]]], concurrency: int,
+                         timeout: float) -> List[Optional[str]]:
+    """Run the calls with at most ``concurrency`` in flight; a call that fails or times out yields None"""
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(call):
+        async with semaphore:
+            try:
+                return await asyncio.wait_for(call(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"AI call timed out after {timeout:.0f}s")
+            except Exception as e:
+                logger.warning(f"AI call failed: {e}")
+            return None
+
+    return await asyncio.gather(*(run(call) for call in calls))
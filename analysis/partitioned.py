@@ -0,0 +1,291 @@
+import io
+import math
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import chardet
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class CsvSlice:
+    """Byte range of a CSV file holding whole records; ``header`` is the file's first line"""
+    path: Path
+    start: int
+    end: int
+    header: bytes
+
+    def read(self) -> pd.DataFrame:
+        with open(self.path, 'rb') as f:
+            f.seek(self.start)
+            body = self.header + f.read(self.end - self.start)
+        try:
+            return pd.read_csv(io.BytesIO(body))
+        except UnicodeDecodeError:
+            return pd.read_csv(io.BytesIO(body), encoding=chardet.detect(body)['encoding'])
+
+
+Partition = Union[pd.DataFrame, Path, CsvSlice]
+
+SCAN_BLOCK = 4 << 20
+QUOTE, NEWLINE = ord('"'), ord('\n')
+
+
+def split_csv(path: Path, rows_per_slice: int) -> List[CsvSlice]:
+    """Cut a CSV into slices of about ``rows_per_slice`` records without parsing it.
+
+    Slice ends are newlines outside quoted fields (even quote count so far),
+    so records with embedded newlines stay whole. The slice size in bytes is
+    estimated from the first rows.
+    """
+    size = path.stat().st_size
+    with open(path, 'rb') as f:
+        header = f.readline()
+        start = f.tell()
+        sample = f.read(SCAN_BLOCK)
+        rows = max(1, sample.count(b"\n"))
+        chunk_bytes = max(1, int(len(sample) / rows * rows_per_slice))
+
+        f.seek(start)
+        boundaries, target = [start], start + chunk_bytes
+        offset, parity = start, 0
+        while target < size:
+            block = f.read(SCAN_BLOCK)
+            if not block:
+                break
+            data = np.frombuffer(block, dtype=np.uint8)
+            # Quote parity after each byte; uint8 wrap-around keeps parity intact
+            quoted = (parity + np.cumsum(data == QUOTE, dtype=np.uint8)) & 1
+            ends = np.flatnonzero((data == NEWLINE) & (quoted == 0)) + offset + 1
+            while target < size:
+                i = np.searchsorted(ends, target)
+                if i == len(ends):
+                    break
+                boundaries.append(int(ends[i]))
+                target = int(ends[i]) + chunk_bytes
+            parity = int(quoted[-1])
+            offset += len(block)
+    if boundaries[-1] < size:
+        boundaries.append(size)
+    return [CsvSlice(path, a, b, header) for a, b in zip(boundaries, boundaries[1:]) if b > a]
+
+
+def exact_sum(values) -> Tuple[float, float]:
+    """Correctly rounded sum and its rounding residual; together they carry the exact sum through merges"""
+    values = list(values)
+    total = math.fsum(values)
+    return total, math.fsum(values + [-total])
+
+
+@dataclass
+class NumberStats:
+    """Count, sum, min and max of a numeric column (NaN skipped).
+
+    Sums are kept as (correctly rounded sum, residual), so the mean of merged
+    partitions does not depend on how the data was split.
+    """
+    count: int = 0
+    total: float = 0.0
+    residual: float = 0.0
+    min: float = np.nan
+    max: float = np.nan
+
+    @classmethod
+    def of(cls, values) -> "NumberStats":
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return cls()
+        total, residual = exact_sum(values.tolist())
+        return cls(len(values), total, residual, float(values.min()), float(values.max()))
+
+    def merge(self, other: "NumberStats") -> "NumberStats":
+        if not other.count:
+            return self
+        if not self.count:
+            return other
+        total, residual = exact_sum([self.total, self.residual, other.total, other.residual])
+        return NumberStats(self.count + other.count, total, residual,
+                           min(self.min, other.min), max(self.max, other.max))
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else np.nan
+
+
+class FrequencyTable:
+    """Value counts plus each value's first position, so merged tables keep first-seen order on ties.
+
+    ``length`` is the number of positions the table covers; merging shifts
+    the right-hand table's positions by it.
+    """
+
+    def __init__(self, table: Optional[pd.DataFrame] = None, length: int = 0):
+        self.table = table if table is not None else pd.DataFrame({'count': [], 'first': []}, dtype='int64')
+        self.length = length
+
+    @classmethod
+    def of(cls, series: pd.Series) -> "FrequencyTable":
+        """Counts of the non-null values of a column"""
+        values = series.reset_index(drop=True)
+        present = values.dropna()
+        first = present.drop_duplicates()
+        table = pd.DataFrame({
+            'count': present.value_counts(sort=False),
+            'first': pd.Series(first.index.to_numpy(), index=first.to_numpy()),
+        })
+        return cls(table, len(values))
+
+    @classmethod
+    def of_items(cls, series: pd.Series, sep: str = ',',
+                 missing: Iterable[str] = ("N/A", "")) -> "FrequencyTable":
+        """Number of items listing each value of a separator-joined column (same rules as SkillMatrix)"""
+        values = series.reset_index(drop=True).fillna("").astype(str)
+        exploded = values.str.split(sep).explode().str.strip()
+        exploded = exploded[~exploded.isin(list(missing))].dropna()
+        pairs = pd.DataFrame({'item': exploded.index.to_numpy(), 'value': exploded.to_numpy(),
+                              'position': np.arange(len(exploded))})
+        first = pairs.groupby('value', sort=False)['position'].min()
+        count = pairs.drop_duplicates(['item', 'value']).groupby('value', sort=False).size()
+        return cls(pd.DataFrame({'count': count, 'first': first}), len(exploded))
+
+    def merge(self, other: "FrequencyTable") -> "FrequencyTable":
+        shifted = other.table.assign(first=other.table['first'] + self.length)
+        combined = pd.concat([self.table, shifted]).groupby(level=0, sort=False).agg({'count': 'sum', 'first': 'min'})
+        return FrequencyTable(combined, self.length + other.length)
+
+    def ranked(self) -> pd.Series:
+        """Counts by descending count, first-seen order on ties (as ``value_counts``)"""
+        table = self.table.sort_values('first', kind='stable').sort_values('count', ascending=False, kind='stable')
+        return table['count'].astype(int)
+
+    def to_dict(self) -> Dict[Any, int]:
+        return {value: int(count) for value, count in self.ranked().items()}
+
+    def top(self, k: int) -> Dict[Any, int]:
+        return {value: int(count) for value, count in self.ranked().head(k).items() if count > 0}
+
+
+class GroupedStats:
+    """Per-group count, exact sum (see NumberStats), min and max of a numeric column"""
+
+    COLUMNS = ['count', 'total', 'residual', 'min', 'max']
+
+    def __init__(self, table: Optional[pd.DataFrame] = None):
+        self.table = table if table is not None else pd.DataFrame(columns=self.COLUMNS)
+
+    @staticmethod
+    def _sums(groups) -> pd.DataFrame:
+        sums = groups.apply(lambda v: exact_sum(v.dropna().tolist()))
+        return pd.DataFrame(sums.tolist(), index=sums.index, columns=['total', 'residual'])
+
+    @classmethod
+    def of(cls, keys: pd.Series, values: pd.Series) -> "GroupedStats":
+        groups = values.groupby(keys)
+        table = groups.agg(['count', 'min', 'max']).join(cls._sums(groups))
+        return cls(table[cls.COLUMNS])
+
+    def merge(self, other: "GroupedStats") -> "GroupedStats":
+        parts = [t for t in (self.table, other.table) if len(t)]
+        if len(parts) < 2:
+            return GroupedStats(parts[0] if parts else None)
+        combined = pd.concat(parts)
+        table = combined.groupby(level=0).agg({'count': 'sum', 'min': 'min', 'max': 'max'})
+        both = pd.concat([combined['total'], combined['residual']])
+        table = table.join(self._sums(both.groupby(level=0)))
+        return GroupedStats(table[self.COLUMNS])
+
+    def to_dict(self, stats: List[str]) -> Dict[str, Dict[Any, float]]:
+        """Same layout as ``groupby(...).agg(stats).to_dict()``"""
+        table = self.table.sort_index()
+        columns = {
+            'mean': table['total'] / table['count'].where(table['count'] > 0),
+            'min': table['min'], 'max': table['max'],
+            'count': table['count'], 'sum': table['total'],
+        }
+        return {stat: columns[stat].to_dict() for stat in stats}
+
+
+class Aggregates:
+    """Partial statistics of one partition; merging partitions in order gives the whole dataset's.
+
+    Domain analyses fill ``numbers``, ``frequencies`` and ``grouped`` in
+    ``partial_stats`` and read them back in ``finalize_stats``.
+    """
+
+    def __init__(self, data: Optional[pd.DataFrame] = None):
+        self.rows = 0 if data is None else len(data)
+        # Near-duplicate cluster ids, so unique_items counts each cluster once across partitions
+        self.clusters: Optional[set] = None
+        if data is not None and 'cluster_id' in data.columns:
+            self.clusters = set(data['cluster_id'].dropna())
+        self.numbers: Dict[str, NumberStats] = {}
+        self.frequencies: Dict[str, FrequencyTable] = {}
+        self.grouped: Dict[str, GroupedStats] = {}
+
+    def merge(self, other: "Aggregates") -> "Aggregates":
+        merged = Aggregates()
+        merged.rows = self.rows + other.rows
+        if self.clusters is not None or other.clusters is not None:
+            merged.clusters = (self.clusters or set()) | (other.clusters or set())
+        for name in self.numbers.keys() | other.numbers.keys():
+            merged.numbers[name] = self.numbers.get(name, NumberStats()).merge(other.numbers.get(name, NumberStats()))
+        for name in list(self.frequencies) + [n for n in other.frequencies if n not in self.frequencies]:
+            left = self.frequencies.get(name, FrequencyTable(length=0))
+            merged.frequencies[name] = left.merge(other.frequencies.get(name, FrequencyTable()))
+        for name in self.grouped.keys() | other.grouped.keys():
+            merged.grouped[name] = self.grouped.get(name, GroupedStats()).merge(other.grouped.get(name, GroupedStats()))
+        return merged
+
+    def unique_items(self) -> int:
+        return len(self.clusters) if self.clusters is not None else self.rows
+
+
+def read_partition(source: Partition) -> pd.DataFrame:
+    if isinstance(source, pd.DataFrame):
+        return source
+    if isinstance(source, CsvSlice):
+        return source.read()
+    from utils.file_utils import safe_read_csv, safe_read_json, safe_read_excel
+    if source.suffix == '.csv':
+        return safe_read_csv(source)
+    if source.suffix == '.json':
+        return safe_read_json(source)
+    return safe_read_excel(source)
+
+
+_worker_analysis = None
+
+
+def _init_worker(analysis_class):
+    global _worker_analysis
+    _worker_analysis = analysis_class()
+
+
+def _partial(source: Partition) -> Aggregates:
+    return _worker_analysis.partial_stats(read_partition(source))
+
+
+def aggregate_partitions(analysis_class, partitions: Iterable[Partition],
+                         workers: Optional[int] = None) -> Aggregates:
+    """Compute ``partial_stats`` of every partition in a process pool and merge them in input order.
+
+    At most two partitions per worker are in flight, so memory stays bounded
+    by the partition size rather than the dataset size.
+    """
+    workers = workers or os.cpu_count() or 1
+    result = Aggregates()
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(analysis_class,)) as pool:
+        for source in partitions:
+            pending.append(pool.submit(_partial, source))
+            if len(pending) >= 2 * workers:
+                result = result.merge(pending.popleft().result())
+        while pending:
+            result = result.merge(pending.popleft().result())
+    return result
@@ -1,47 +1,58 @@
 import pandas as pd
 from .base_analysis import BaseAnalysis
-from typing import Dict, Any
+from .partitioned import Aggregates, FrequencyTable, NumberStats
+from typing import Dict, Any, List
 import re
 
 class RealEstateAnalysis(BaseAnalysis):
+    approx_columns = {'categorical': ['agent'], 'numeric': ['price']}
+
     def analyze(self, data: pd.DataFrame) -> Dict[str, Any]:
         """Analyze real estate data and generate insights"""
-        insights = {}
+        # Counts, sums, min/max and distributions (shared with analyze_partitioned)
+        insights = self.finalize_stats(self.partial_stats(data))
         
-        # Basic statistics
-        insights['total_properties'] = len(data)
+        # Generate AI insights
+        ai_insights = self._generate_real_estate_insights(data, insights)
+        insights['ai_analysis'] = ai_insights
         
-        # Extract numeric prices
+        return insights
+    
+    def _prices(self, column: pd.Series) -> List[float]:
         prices = []
-        for price_str in data['price']:
-            if price_str != "N/A":
+        for price_str in column:
+            if isinstance(price_str, str) and price_str != "N/A":
                 numeric_price = re.sub(r'[^\d]', '', price_str)
                 if numeric_price:
                     prices.append(float(numeric_price))
-        
-        if prices:
-            insights['avg_price'] = sum(prices) / len(prices)
-            insights['min_price'] = min(prices)
-            insights['max_price'] = max(prices)
-        else:
-            insights['avg_price'] = insights['min_price'] = insights['max_price'] = 0
-        
-        # Location analysis (from addresses)
+        return prices
+    
+    def _locations(self, column: pd.Series) -> List[str]:
         locations = []
-        for address in data['address']:
-            if address != "N/A":
+        for address in column:
+            if isinstance(address, str) and address != "N/A":
                 # Extract city/state from address
                 parts = address.split(',')
                 if len(parts) >= 2:
                     locations.append(parts[-2].strip() + ', ' + parts[-1].strip())
-        
-        location_counts = pd.Series(locations).value_counts().to_dict()
-        insights['location_distribution'] = location_counts
-        
-        # Generate AI insights
-        ai_insights = self._generate_real_estate_insights(data, insights)
-        insights['ai_analysis'] = ai_insights
-        
+        return locations
+    
+    def partial_stats(self, data: pd.DataFrame) -> Aggregates:
+        stats = Aggregates(data)
+        stats.numbers['price'] = NumberStats.of(self._prices(data['price']))
+        stats.frequencies['location'] = FrequencyTable.of(pd.Series(self._locations(data['address']), dtype=object))
+        return stats
+    
+    def finalize_stats(self, stats: Aggregates) -> Dict[str, Any]:
+        insights = {'total_properties': stats.rows, 'unique_items': stats.unique_items()}
+        price = stats.numbers['price']
+        if price.count:
+            insights['avg_price'] = price.mean
+            insights['min_price'] = price.min
+            insights['max_price'] = price.max
+        else:
+            insights['avg_price'] = insights['min_price'] = insights['max_price'] = 0
+        insights['location_distribution'] = stats.frequencies['location'].to_dict()
         return insights
     
     def _generate_real_estate_insights(self, data: pd.DataFrame, basic_stats: Dict) -> str:
@@ -66,4 +77,4 @@ class RealEstateAnalysis(BaseAnalysis):
         Format the response as a comprehensive real estate market analysis report.
         """
         
-        return self.generate_ai_insights(prompt, data_context)
\ No newline at end of file
+        return self.generate_insights(data, prompt, data_context)
\ No newline at end of file
@@ -0,0 +1,216 @@
+import math
+from statistics import NormalDist
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+MISSING = ("", "N/A", "nan", "None")
+
+
+def to_numeric(series: pd.Series) -> np.ndarray:
+    """Finite numbers from a column that may hold strings like "$1,250", "4.7" or "N/A" """
+    if pd.api.types.is_numeric_dtype(series):
+        values = series.to_numpy(dtype=float)
+    else:
+        cleaned = series.astype(str).str.replace(",", "", regex=False).str.extract(r"(-?\d+(?:\.\d+)?)")[0]
+        values = pd.to_numeric(cleaned, errors='coerce').to_numpy(dtype=float)
+    return values[np.isfinite(values)]
+
+
+def _z(confidence: float) -> float:
+    return NormalDist().inv_cdf(0.5 + confidence / 2)
+
+
+class ReservoirSample:
+    """Uniform fixed-size sample of a numeric stream (Algorithm R) plus exact running moments.
+
+    Count, mean, variance, min and max are exact (merged chunk by chunk); quantiles come
+    from the sample with distribution-free confidence intervals.
+    """
+
+    def __init__(self, size: int = 10000, seed: int = 0):
+        self.size = size
+        self.rng = np.random.default_rng(seed)
+        self.sample = np.empty(size, dtype=float)
+        self.filled = 0
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def extend(self, values: np.ndarray):
+        values = np.asarray(values, dtype=float)
+        if not len(values):
+            return
+        # Exact moments, merged chunk-wise (Chan et al.)
+        n, chunk_mean = len(values), float(values.mean())
+        chunk_m2 = float(((values - chunk_mean) ** 2).sum())
+        total = self.count + n
+        delta = chunk_mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += chunk_m2 + delta ** 2 * self.count * n / total
+        self.min, self.max = min(self.min, float(values.min())), max(self.max, float(values.max()))
+
+        # Fill the reservoir first, then replace slots with probability size / position
+        take = min(self.size - self.filled, n)
+        if take:
+            self.sample[self.filled:self.filled + take] = values[:take]
+            self.filled += take
+        rest = values[take:]
+        if len(rest):
+            positions = self.count + take + np.arange(1, len(rest) + 1)
+            slots = (self.rng.random(len(rest)) * positions).astype(np.int64)
+            keep = slots < self.size
+            self.sample[slots[keep]] = rest[keep]
+        self.count = total
+
+    def quantile(self, q: float, confidence: float = 0.95) -> Dict[str, float]:
+        """Sample quantile with an order-statistic confidence interval"""
+        data = np.sort(self.sample[:self.filled])
+        m = len(data)
+        if m == 0:
+            return {}
+        half = _z(confidence) * math.sqrt(m * q * (1 - q))
+        low = max(0, int(math.floor(m * q - half)) - 1)
+        high = min(m - 1, int(math.ceil(m * q + half)))
+        return {
+            'value': round(float(np.quantile(data, q)), 4),
+            'ci_low': round(float(data[low]), 4),
+            'ci_high': round(float(data[high]), 4),
+        }
+
+    def summary(self, confidence: float = 0.95) -> Dict[str, Any]:
+        if self.count == 0:
+            return {'count': 0}
+        std = math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+        return {
+            'count': self.count,
+            'mean': round(self.mean, 4),
+            'std': round(std, 4),
+            'min': self.min,
+            'max': self.max,
+            'median': self.quantile(0.5, confidence),
+            'p90': self.quantile(0.9, confidence),
+            'sampled': self.filled,
+        }
+
+
+class SpaceSaving:
+    """Top-k heavy hitters in ``capacity`` counters (Metwally et al.).
+
+    Each estimate overcounts by at most its recorded error; any value whose
+    true count exceeds ``total / capacity`` is guaranteed to be tracked.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        self.capacity = capacity
+        self.counts: Dict[Any, int] = {}
+        self.errors: Dict[Any, int] = {}
+        self.total = 0
+
+    def update(self, counts: pd.Series):
+        """Add pre-aggregated counts (value -> count) from one chunk.
+
+        Values not yet tracked start from the smallest tracked count when the
+        table is full (the SpaceSaving overestimate), then only the
+        ``capacity`` largest counters are kept.
+        """
+        if counts.empty:
+            return
+        self.total += int(counts.sum())
+        table = pd.Series(self.counts, dtype='int64')
+        floor = int(table.min()) if len(table) >= self.capacity else 0
+        merged = table.add(counts.astype('int64'), fill_value=0)
+        errors = pd.Series(self.errors, dtype='int64').reindex(merged.index)
+        fresh = errors.isna()
+        merged[fresh] += floor
+        errors = errors.fillna(floor)
+        kept = merged.nlargest(self.capacity)
+        self.counts = {value: int(count) for value, count in kept.items()}
+        self.errors = {value: int(errors[value]) for value in kept.index}
+
+    def top(self, k: int = 10) -> Dict[Any, int]:
+        ranked = sorted(self.counts.items(), key=lambda kv: -kv[1])[:k]
+        return {value: count for value, count in ranked}
+
+    def top_with_error(self, k: int = 10) -> List[Tuple[Any, int, int]]:
+        return [(value, count, self.errors[value]) for value, count in self.top(k).items()]
+
+
+class HyperLogLog:
+    """Distinct-count estimate in ``2**precision`` one-byte registers (about 1.04 / sqrt(m) error)"""
+
+    def __init__(self, precision: int = 14):
+        self.p = precision
+        self.m = 1 << precision
+        self.registers = np.zeros(self.m, dtype=np.uint8)
+
+    def update(self, values: pd.Series):
+        if values.empty:
+            return
+        hashes = pd.util.hash_pandas_object(values.astype(str), index=False).to_numpy(dtype=np.uint64)
+        index = (hashes >> np.uint64(64 - self.p)).astype(np.int64)
+        rest = hashes & np.uint64((1 << (64 - self.p)) - 1)
+        # Position of the leftmost 1-bit in the remaining 64 - p bits
+        high = (rest >> np.uint64(32)).astype(np.float64)
+        low = (rest & np.uint64(0xFFFFFFFF)).astype(np.float64)
+        with np.errstate(divide='ignore'):
+            bits = np.where(high > 0, 33 + np.floor(np.log2(high)),
+                            np.where(low > 0, 1 + np.floor(np.log2(low)), 0))
+        rank = ((64 - self.p) - bits + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def count(self) -> int:
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        estimate = alpha * self.m ** 2 / np.sum(2.0 ** -self.registers.astype(np.float64))
+        zeros = int((self.registers == 0).sum())
+        if estimate <= 2.5 * self.m and zeros:
+            # Small-range correction: linear counting
+            estimate = self.m * math.log(self.m / zeros)
+        return int(round(estimate))
+
+
+class ApproxSummary:
+    """Single-pass, bounded-memory summary of a dataset fed in chunks.
+
+    ``categorical`` columns get SpaceSaving top-k and a HyperLogLog distinct
+    count, ``multi_valued`` columns (e.g. comma-separated tags) are split
+    first, and ``numeric`` columns get exact moments plus a reservoir sample
+    for quantiles.
+    """
+
+    def __init__(self, categorical: Iterable[str] = (), numeric: Iterable[str] = (),
+                 multi_valued: Optional[Dict[str, str]] = None, top_k: int = 10,
+                 capacity: int = 1000, reservoir_size: int = 10000, seed: int = 0):
+        self.top_k = top_k
+        self.rows = 0
+        self.multi_valued = dict(multi_valued or {})
+        self.heavy = {c: SpaceSaving(capacity) for c in list(categorical) + list(self.multi_valued)}
+        self.distinct = {c: HyperLogLog() for c in self.heavy}
+        self.numeric = {c: ReservoirSample(reservoir_size, seed) for c in numeric}
+
+    def update(self, chunk: pd.DataFrame):
+        self.rows += len(chunk)
+        for column in self.heavy:
+            if column not in chunk.columns:
+                continue
+            values = chunk[column].dropna().astype(str).str.strip()
+            if column in self.multi_valued:
+                values = values.str.split(self.multi_valued[column]).explode().str.strip()
+            values = values[~values.isin(MISSING)]
+            self.heavy[column].update(values.value_counts())
+            self.distinct[column].update(values)
+        for column, reservoir in self.numeric.items():
+            if column in chunk.columns:
+                reservoir.extend(to_numeric(chunk[column]))
+
+    def result(self) -> Dict[str, Any]:
+        result: Dict[str, Any] = {'total_items': self.rows, 'approximate': True}
+        for column, sketch in self.heavy.items():
+            result[f'{column}_top'] = sketch.top(self.top_k)
+            result[f'{column}_distinct'] = self.distinct[column].count()
+        for column, reservoir in self.numeric.items():
+            result[f'{column}_stats'] = reservoir.summary()
+        return result
@@ -0,0 +1,137 @@
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+class SkillMatrix:
+    """Sparse item-by-skill incidence matrix built from comma-separated skill columns.
+
+    Rows are items (jobs, courses), columns are distinct skills and every
+    stored value is 1. All statistics are computed with sparse matrix
+    products, so they stay fast at hundreds of thousands of rows.
+    """
+
+    def __init__(self, matrix: sparse.csr_matrix, skills: np.ndarray):
+        self.matrix = matrix
+        self.skills = skills
+
+    @classmethod
+    def from_series(cls, series: pd.Series, sep: str = ',',
+                    missing: Iterable[str] = ("N/A", "")) -> "SkillMatrix":
+        """Build the matrix from a column of separator-joined skills (one row per item)"""
+        values = series.reset_index(drop=True).fillna("").astype(str)
+        exploded = values.str.split(sep).explode().str.strip()
+        exploded = exploded[~exploded.isin(list(missing))].dropna()
+
+        codes, skills = pd.factorize(exploded, sort=False)
+        rows = exploded.index.to_numpy()
+        matrix = sparse.csr_matrix(
+            (np.ones(len(codes), dtype=np.int32), (rows, codes)),
+            shape=(len(values), len(skills)),
+        )
+        # Repeated skills on one item count once
+        matrix.sum_duplicates()
+        matrix.data[:] = 1
+        return cls(matrix, np.asarray(skills, dtype=object))
+
+    @classmethod
+    def from_frame(cls, data: pd.DataFrame, columns: List[str], sep: str = ',') -> "SkillMatrix":
+        """Combine several skill columns (e.g. ``tags`` and ``skills``) into one matrix"""
+        present = [column for column in columns if column in data.columns]
+        if not present:
+            return cls.from_series(pd.Series([""] * len(data)), sep)
+        combined = data[present].fillna("").astype(str).agg(sep.join, axis=1)
+        return cls.from_series(combined, sep)
+
+    @property
+    def n_items(self) -> int:
+        return self.matrix.shape[0]
+
+    def skill_counts(self) -> np.ndarray:
+        return np.asarray(self.matrix.sum(axis=0)).ravel()
+
+    def top_skills(self, k: int = 10) -> Dict[str, int]:
+        counts = self.skill_counts()
+        order = np.argsort(-counts, kind='stable')[:k]
+        return {self.skills[i]: int(counts[i]) for i in order if counts[i] > 0}
+
+    def cooccurrence(self) -> sparse.csr_matrix:
+        """Skill-by-skill counts of items having both skills (diagonal = skill counts)"""
+        return (self.matrix.T @ self.matrix).tocsr()
+
+    def pmi_pairs(self, k: int = 20, min_count: int = 2) -> List[Dict[str, Any]]:
+        """Skill pairs ranked by pointwise mutual information.
+
+        ``min_count`` drops pairs seen on fewer items, which would otherwise
+        dominate the ranking with spuriously high PMI.
+        """
+        if self.n_items == 0 or len(self.skills) < 2:
+            return []
+        co = self.cooccurrence()
+        counts = co.diagonal().astype(np.float64)
+        pairs = sparse.triu(co, k=1).tocoo()
+        keep = pairs.data >= min_count
+        i, j, joint = pairs.row[keep], pairs.col[keep], pairs.data[keep].astype(np.float64)
+        if len(joint) == 0:
+            return []
+
+        n = float(self.n_items)
+        pmi = np.log(joint * n / (counts[i] * counts[j]))
+        p_joint = joint / n
+        # Normalised PMI is 1 for pairs that always occur together
+        with np.errstate(divide='ignore', invalid='ignore'):
+            npmi = np.where(p_joint < 1, pmi / -np.log(p_joint), 1.0)
+
+        order = np.lexsort((-joint, -pmi))[:k]
+        return [
+            {
+                'skills': (self.skills[i[o]], self.skills[j[o]]),
+                'count': int(joint[o]),
+                'pmi': round(float(pmi[o]), 4),
+                'npmi': round(float(npmi[o]), 4),
+            }
+            for o in order
+        ]
+
+    def group_profiles(self, groups: pd.Series, k: int = 5, max_groups: int = 20,
+                       missing: Iterable[str] = ("N/A", "")) -> Dict[str, Dict[str, float]]:
+        """Top skills per group (company, instructor) as the share of the group's items with the skill"""
+        groups = groups.reset_index(drop=True).fillna("N/A").astype(str)
+        valid = ~groups.isin(list(missing)).to_numpy()
+        codes, names = pd.factorize(groups)
+        rows = np.flatnonzero(valid)
+        if len(rows) == 0:
+            return {}
+
+        membership = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int32), (codes[rows], rows)),
+            shape=(len(names), self.n_items),
+        )
+        sizes = np.asarray(membership.sum(axis=1)).ravel()
+        profile = (membership @ self.matrix).tocsr()
+        profile = sparse.diags(1.0 / np.maximum(sizes, 1)) @ profile
+        profile = profile.tocsr()
+
+        result = {}
+        for g in np.argsort(-sizes, kind='stable')[:max_groups]:
+            start, end = profile.indptr[g], profile.indptr[g + 1]
+            if start == end:
+                continue
+            cols, shares = profile.indices[start:end], profile.data[start:end]
+            top = np.argsort(-shares, kind='stable')[:k]
+            result[names[g]] = {self.skills[cols[t]]: round(float(shares[t]), 3) for t in top}
+        return result
+
+    def summary(self, groups: Optional[pd.Series] = None, k: int = 10) -> Dict[str, Any]:
+        """Top skills, PMI-ranked pairs and (optionally) per-group skill profiles"""
+        summary = {
+            'distinct_skills': int(len(self.skills)),
+            'items_with_skills': int((self.matrix.getnnz(axis=1) > 0).sum()),
+            'top_skills': self.top_skills(k),
+            'skill_pairs': self.pmi_pairs(k),
+        }
+        if groups is not None:
+            summary['skill_profiles'] = self.group_profiles(groups)
+        return summary
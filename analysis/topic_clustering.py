@@ -0,0 +1,235 @@
+import hashlib
+import re
+import zlib
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+from scipy import sparse
+
+CACHE_DIR = Path("outputs/state/topics")
+
+STOP_WORDS = frozenset("""
+a an and are as at be by for from in into is it of on or the to with without your you
+course courses job jobs senior junior lead remote
+""".split())
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lower-cased word unigrams and bigrams, stop words removed"""
+    if not isinstance(text, str) or text in ("", "N/A"):
+        return []
+    words = [w for w in re.findall(r"[a-z0-9+#]+", text.lower()) if w not in STOP_WORDS]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def _column(token: str, n_features: int) -> int:
+    return zlib.crc32(token.encode('utf-8')) % n_features
+
+
+class HashedVectorCache:
+    """Append-only on-disk cache of hashed term counts, one row per distinct text.
+
+    Rows are stored CSR-style in flat binary files (``indices``, ``counts``,
+    ``indptr``) that are memory-mapped for reading, so a run only hashes the
+    texts it has not seen before and never loads the whole cache into memory.
+    Row ids follow ``indptr``; a run that stopped part-way through an append
+    leaves tails past the last complete row, which are cut off on open.
+    """
+
+    def __init__(self, directory: Path, n_features: int = 2 ** 18):
+        self.dir = Path(directory)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.n_features = n_features
+        meta = self.dir / "n_features"
+        if meta.exists() and int(meta.read_text()) != n_features:
+            # Hashing space changed: the cached columns are meaningless
+            for name in ("keys", "indices", "counts", "indptr"):
+                (self.dir / name).unlink(missing_ok=True)
+        meta.write_text(str(n_features))
+        self._repair()
+        self._rows = {key: i for i, key in enumerate(self._read_keys())}
+
+    def _path(self, name: str) -> Path:
+        return self.dir / name
+
+    def _repair(self):
+        """Truncate every file to the rows complete in all of them"""
+        sizes = {name: self._path(name).stat().st_size if self._path(name).exists() else 0
+                 for name in ("keys", "indices", "counts", "indptr")}
+        entries = sizes["indptr"] // 8
+        indptr = np.memmap(self._path("indptr"), dtype=np.int64, mode='r', shape=(entries,)) if entries else []
+        rows = min(sizes["keys"] // 16, max(len(indptr) - 1, 0))
+        # A row is complete once its indices and counts are on disk as well
+        while rows and int(indptr[rows]) > min(sizes["indices"], sizes["counts"]) // 4:
+            rows -= 1
+        end = int(indptr[rows]) if rows else 0
+        del indptr
+        expected = {"keys": rows * 16, "indices": end * 4, "counts": end * 4,
+                    "indptr": (rows + 1) * 8 if rows else 0}
+        for name, size in expected.items():
+            if sizes[name] != size:
+                with open(self._path(name), 'r+b') as f:
+                    f.truncate(size)
+
+    def _read_keys(self) -> List[bytes]:
+        path = self._path("keys")
+        if not path.exists():
+            return []
+        raw = path.read_bytes()
+        return [raw[i:i + 16] for i in range(0, len(raw), 16)]
+
+    def _memmap(self, name: str, dtype) -> np.ndarray:
+        path = self._path(name)
+        if not path.exists() or path.stat().st_size == 0:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode='r')
+
+    @staticmethod
+    def key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+    def add(self, texts: Iterable[str]) -> int:
+        """Hash and append the texts not in the cache yet; returns how many were added"""
+        indptr = self._memmap("indptr", np.int64)
+        start = int(indptr[-1]) if len(indptr) else 0
+        rows = max(len(indptr) - 1, 0)
+        keys, indices, counts, lengths = [], [], [], []
+        added = {}
+        for text in texts:
+            key = self.key(text)
+            if key in self._rows or key in added:
+                continue
+            added[key] = rows + len(keys)
+            columns = Counter(_column(token, self.n_features) for token in tokenize(text))
+            keys.append(key)
+            indices.extend(columns.keys())
+            counts.extend(columns.values())
+            lengths.append(len(columns))
+        if not keys:
+            return 0
+
+        offsets = start + np.cumsum(lengths, dtype=np.int64)
+        if not len(indptr):
+            offsets = np.concatenate([[0], offsets]).astype(np.int64)
+        del indptr
+
+        with open(self._path("indices"), 'ab') as f:
+            f.write(np.asarray(indices, dtype=np.int32).tobytes())
+        with open(self._path("counts"), 'ab') as f:
+            f.write(np.asarray(counts, dtype=np.float32).tobytes())
+        with open(self._path("indptr"), 'ab') as f:
+            f.write(offsets.tobytes())
+        with open(self._path("keys"), 'ab') as f:
+            f.write(b"".join(keys))
+        # Only rows whose files were all written are looked up
+        self._rows.update(added)
+        return len(keys)
+
+    def matrix(self, texts: Sequence[str]) -> sparse.csr_matrix:
+        """Raw term counts for ``texts`` (in order) from the memory-mapped cache"""
+        indptr = self._memmap("indptr", np.int64)
+        cached = sparse.csr_matrix(
+            (self._memmap("counts", np.float32), self._memmap("indices", np.int32), indptr),
+            shape=(max(len(indptr) - 1, 0), self.n_features),
+        )
+        rows = np.fromiter((self._rows[self.key(text)] for text in texts), dtype=np.int64, count=len(texts))
+        return cached[rows]
+
+
+def tfidf(counts: sparse.csr_matrix) -> sparse.csr_matrix:
+    """Sublinear TF, smoothed IDF and L2-normalised rows"""
+    n = counts.shape[0]
+    df = np.bincount(counts.indices, minlength=counts.shape[1])
+    idf = np.log((1 + n) / (1 + df)) + 1
+    weighted = counts.copy().astype(np.float32)
+    weighted.data = (1 + np.log(weighted.data)) * idf[weighted.indices].astype(np.float32)
+    norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel())
+    return (sparse.diags(1 / np.maximum(norms, 1e-12)) @ weighted).tocsr().astype(np.float32)
+
+
+def minibatch_kmeans(X: sparse.csr_matrix, k: int, batch_size: int = 1024, iterations: int = 100,
+                     seed: int = 0) -> np.ndarray:
+    """Spherical mini-batch k-means on L2-normalised sparse rows; returns the unit centers.
+
+    Centers are seeded with k-means++ on a sample and updated with per-center
+    learning rates (Sculley, 2010), so each iteration only touches one batch.
+    """
+    rng = np.random.RandomState(seed)
+    n = X.shape[0]
+    sample = X[rng.choice(n, size=min(n, max(10 * k, batch_size)), replace=False)]
+
+    centers = np.empty((k, X.shape[1]), dtype=np.float32)
+    centers[0] = sample[rng.randint(sample.shape[0])].toarray()
+    closest = 1 - np.asarray(sample @ centers[0]).ravel()
+    for c in range(1, k):
+        weights = np.maximum(closest, 0)
+        total = weights.sum()
+        pick = rng.choice(sample.shape[0], p=weights / total) if total > 0 else rng.randint(sample.shape[0])
+        centers[c] = sample[pick].toarray()
+        closest = np.minimum(closest, 1 - np.asarray(sample @ centers[c]).ravel())
+
+    seen = np.zeros(k, dtype=np.int64)
+    for _ in range(iterations):
+        batch = X[rng.choice(n, size=min(batch_size, n), replace=False)]
+        labels = np.asarray((batch @ centers.T).argmax(axis=1)).ravel()
+        for c in np.unique(labels):
+            members = batch[labels == c]
+            seen[c] += members.shape[0]
+            rate = members.shape[0] / seen[c]
+            centers[c] = (1 - rate) * centers[c] + rate * np.asarray(members.mean(axis=0)).ravel()
+        norms = np.linalg.norm(centers, axis=1, keepdims=True)
+        centers /= np.maximum(norms, 1e-12)
+    return centers
+
+
+def assign(X: sparse.csr_matrix, centers: np.ndarray, chunk_size: int = 50000) -> np.ndarray:
+    return np.concatenate([
+        np.asarray((X[start:start + chunk_size] @ centers.T).argmax(axis=1)).ravel()
+        for start in range(0, X.shape[0], chunk_size)
+    ]) if X.shape[0] else np.zeros(0, dtype=np.int64)
+
+
+def cluster_topics(texts: Sequence[Optional[str]], k: int = 8, name: str = "default",
+                   n_features: int = 2 ** 18, cache_dir: Optional[Path] = None,
+                   seed: int = 0) -> Dict[str, Any]:
+    """Group short texts (course or job titles) into ``k`` topics on the CPU.
+
+    Vectors come from the on-disk cache under ``cache_dir/name``, so repeated
+    runs only vectorize new titles. Returns per-text labels and, per topic,
+    its size, top terms and example titles.
+    """
+    texts = ["" if not isinstance(t, str) or t == "N/A" else t for t in texts]
+    cache = HashedVectorCache(Path(cache_dir or CACHE_DIR) / name, n_features)
+    added = cache.add(texts)
+    X = tfidf(cache.matrix(texts))
+    valid = np.flatnonzero(X.getnnz(axis=1) > 0)
+    labels = np.full(len(texts), -1, dtype=np.int64)
+    if len(valid) == 0:
+        return {'labels': labels.tolist(), 'topics': [], 'vectorized': added}
+
+    k = min(k, len(valid))
+    centers = minibatch_kmeans(X[valid], k, seed=seed)
+    labels[valid] = assign(X[valid], centers)
+
+    # Hashed columns are not invertible, so name topics from their members' tokens
+    df = np.bincount(X.indices, minlength=n_features)
+    topics = []
+    for c in range(k):
+        members = np.flatnonzero(labels == c)
+        if len(members) == 0:
+            continue
+        terms = Counter(token for i in members for token in set(tokenize(texts[i])))
+        scored = sorted(
+            terms.items(),
+            key=lambda kv: -kv[1] * np.log((1 + len(valid)) / (1 + df[_column(kv[0], n_features)])),
+        )
+        topics.append({
+            'topic': c,
+            'size': int(len(members)),
+            'terms': [term for term, _ in scored[:5]],
+            'examples': [texts[i] for i in members[:3]],
+        })
+    topics.sort(key=lambda t: -t['size'])
+    return {'labels': labels.tolist(), 'topics': topics, 'vectorized': added}
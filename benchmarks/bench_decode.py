@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Compare text-first and bytes-first handling of large responses.
+
+Builds synthetic UTF-8 listing pages of increasing size, served as
+``text/html`` without a charset in the Content-Type header, and times:
+
+- text path: ``BeautifulSoup(response.text, 'lxml')``. For text/* without a
+  charset requests decodes as ISO-8859-1 (no detection), so this is one
+  decoded copy of the page, and the non-ASCII text comes out garbled
+- bytes path: ``BaseScraper.parse_response`` (declared encoding, bytes straight to lxml)
+
+The last column shows whether each path recovered the page's text intact.
+
+Usage: python benchmarks/bench_decode.py [--sizes 1,4,16] [--repeat 3]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import requests
+from bs4 import BeautifulSoup
+from requests.utils import get_encoding_from_headers
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scrapers.transfer import declared_encoding  # noqa: E402
+
+CARD = (
+    '<article class="product_pod"><h3><a href="/item-{i}.html">Café crème {i} – naïve résumé</a></h3>'
+    '<p class="price_color">£{price:.2f}</p><p class="star-rating Three"></p>'
+    '<p class="instock availability">In stock</p></article>\n'
+)
+
+
+def build_page(target_mb: float) -> bytes:
+    head = '<html><head><meta charset="utf-8"><title>bench</title></head><body>\n'
+    cards, size, i = [], len(head), 0
+    while size < target_mb * 1024 * 1024:
+        card = CARD.format(i=i, price=10 + i % 50)
+        cards.append(card)
+        size += len(card.encode('utf-8'))
+        i += 1
+    return (head + ''.join(cards) + '</body></html>').encode('utf-8')
+
+
+def make_response(body: bytes) -> requests.Response:
+    response = requests.models.Response()
+    response._content = body
+    response.status_code = 200
+    response.headers['Content-Type'] = 'text/html'
+    # As requests' HTTPAdapter.build_response sets it: ISO-8859-1 for text/* without a charset
+    response.encoding = get_encoding_from_headers(response.headers)
+    return response
+
+
+def time_it(fn, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def text_path(body: bytes):
+    return BeautifulSoup(make_response(body).text, 'lxml')
+
+
+def bytes_path(body: bytes):
+    response = make_response(body)
+    encoding = declared_encoding(response) or 'utf-8'
+    return BeautifulSoup(response.content, 'lxml', from_encoding=encoding)
+
+
+def intact_text(soup: BeautifulSoup) -> bool:
+    return soup.h3.get_text().startswith('Café crème')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='1,4,16', help='Page sizes in MB')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'size MB':>8} {'decode text s':>14} {'decode bytes s':>15} {'parse text s':>13} {'parse bytes s':>14} "
+          f"{'intact text/bytes':>18}")
+    for size in [float(s) for s in args.sizes.split(',')]:
+        body = build_page(size)
+        decode_text = time_it(lambda: make_response(body).text and None, args.repeat)
+        decode_bytes = time_it(lambda: declared_encoding(make_response(body)), args.repeat)
+        parse_text = time_it(lambda: text_path(body), args.repeat)
+        parse_bytes = time_it(lambda: bytes_path(body), args.repeat)
+        intact = [intact_text(path(body)) for path in (text_path, bytes_path)]
+        print(f"{size:>8.1f} {decode_text:>14.4f} {decode_bytes:>15.6f} {parse_text:>13.4f} {parse_bytes:>14.4f} "
+              f"{'/'.join('yes' if ok else 'no' for ok in intact):>18}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Compare one exit with an egress pool against local proxy stand-ins.
+
+Starts the mock site and ``--exits`` mock proxies, each answering 429 above
+``--exit-rps`` (the per-IP throttle of a strict site). One proxy adds
+latency, one returns 502 for a share of requests, and one goes down a
+third of the way through the run and comes back at two thirds. The books
+listing pages are then fetched from ``--threads`` threads:
+
+- single: every request through the first (healthy) proxy, no pool
+- pool: the egress pool over all proxies, each exit limited to ``--exit-rps``
+
+Usage: python benchmarks/bench_egress.py [--requests 300] [--exits 4] [--exit-rps 10] [--threads 8]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+from loguru import logger
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.chdir(Path(__file__).resolve().parent.parent)
+
+from benchmarks.mock_proxy import MockProxy, MockProxyConfig, ProxyServer  # noqa: E402
+from benchmarks.mock_site import MockServer, MockSite, MockSiteConfig  # noqa: E402
+from scrapers.books_scraper import BooksScraper  # noqa: E402
+from scrapers.egress import EgressPool  # noqa: E402
+
+
+def make_scraper(site_url: str, egress) -> BooksScraper:
+    scraper = BooksScraper()
+    scraper.archive = scraper.changes = scraper.history = scraper.search_index = None
+    scraper.rate_limiter = None
+    scraper.config['base_url'] = f"{site_url}/books/"
+    if egress:
+        scraper.config['egress'] = egress
+    scraper.egress = EgressPool.from_config(scraper.config)
+    return scraper
+
+
+def run(name: str, scraper: BooksScraper, urls, threads: int, flaky: ProxyServer) -> dict:
+    results = {'ok': 0, 'failed': 0}
+    lock = threading.Lock()
+    done = [0]
+
+    def worker(offset: int):
+        for i in range(offset, len(urls), threads):
+            response = scraper.make_request(urls[i])
+            with lock:
+                results['ok' if response is not None else 'failed'] += 1
+                done[0] += 1
+                # The unstable exit drops out for the middle third of the run
+                flaky.proxy.config.down = len(urls) / 3 <= done[0] < 2 * len(urls) / 3
+
+    started = time.perf_counter()
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    flaky.proxy.config.down = False
+    return {'mode': name, 'seconds': elapsed, 'pages_per_s': results['ok'] / elapsed, **results,
+            'exits': scraper.egress.stats() if scraper.egress is not None else []}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=300)
+    parser.add_argument('--exits', type=int, default=4)
+    parser.add_argument('--exit-rps', type=float, default=10.0, help='Rate above which each proxy answers 429')
+    parser.add_argument('--threads', type=int, default=8)
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+    site = MockServer(MockSite(MockSiteConfig(pages=50, cards=20, latency_ms=10))).start()
+    behaviours = [MockProxyConfig(max_rps=args.exit_rps) for _ in range(max(4, args.exits))][:max(4, args.exits)]
+    behaviours[1].latency_ms = 150
+    behaviours[2].error_rate = 0.3
+    proxies = [ProxyServer(MockProxy(b, seed=i)).start() for i, b in enumerate(behaviours)]
+    flaky = proxies[3]
+    urls = [f"{site.url}/books/catalogue/page-{i % 50 + 1}.html" for i in range(args.requests)]
+
+    try:
+        # Single: the plain session pointed at one proxy, as without an egress block
+        single = make_scraper(site.url, None)
+        single.session.proxies = {'http': proxies[0].url}
+        pooled = make_scraper(site.url, {
+            'exits': [p.url for p in proxies], 'requests_per_second': args.exit_rps, 'burst': 5,
+            'eject_after': 3, 'eject_seconds': 2,
+        })
+        results = [run('single', single, urls, args.threads, flaky), run('pool', pooled, urls, args.threads, flaky)]
+    finally:
+        for proxy in proxies:
+            proxy.stop()
+        site.stop()
+
+    print(f"{'mode':>7} {'seconds':>8} {'ok':>5} {'failed':>7} {'pages/s':>8}")
+    for r in results:
+        print(f"{r['mode']:>7} {r['seconds']:>8.2f} {r['ok']:>5} {r['failed']:>7} {r['pages_per_s']:>8.1f}")
+    print("\npool exits:")
+    for exit_stats in results[1]['exits']:
+        print(f"  {exit_stats}")
+    print("\nrequests seen per proxy:", [dict(p.proxy.stats) for p in proxies])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Compare the HTTP/1.1 and HTTP/2 transports on concurrent detail fetches.
+
+Starts the mock site behind a local TLS server that speaks both protocols
+(see ``mock_h2.py``) and fetches ``--requests`` books detail pages through
+``make_request`` from ``--threads`` threads, as the detail enricher does,
+with a fresh scraper per transport:
+
+- http1.1: the default ``requests`` session, one connection per request in flight
+- http2: ``"transport": "http2"``, requests multiplexed as streams over one connection
+
+Each new connection is held for two ``--rtt-ms`` round trips on top of its
+handshake, the cost of TCP + TLS 1.3 setup over a network rather than
+loopback. Reports connections opened and total handshake time (both
+measured by the server), the most concurrent streams on one HTTP/2
+connection, and throughput.
+
+Usage: python benchmarks/bench_http2.py [--requests 500] [--threads 16] [--latency-ms 30] [--page-kb 8] [--rtt-ms 20]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from loguru import logger
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.chdir(Path(__file__).resolve().parent.parent)
+
+from benchmarks.mock_h2 import TLSMockServer, make_certificate  # noqa: E402
+from benchmarks.mock_site import MockSite, MockSiteConfig  # noqa: E402
+from scrapers.books_scraper import BooksScraper  # noqa: E402
+from scrapers.transport import make_transport  # noqa: E402
+
+
+def make_scraper(site_url: str, transport: str, certfile: str, max_connections: int) -> BooksScraper:
+    scraper = BooksScraper()
+    scraper.archive = scraper.changes = scraper.history = scraper.search_index = None
+    scraper.rate_limiter = None
+    scraper.config['base_url'] = f"{site_url}/books/"
+    scraper.config['transport'] = {'type': transport, 'max_connections': max_connections}
+    # Trust the self-signed certificate (REQUESTS_CA_BUNDLE would otherwise override it)
+    scraper.session.trust_env = False
+    scraper.session.verify = certfile
+    scraper.transport = make_transport(scraper.session, scraper.config)
+    return scraper
+
+
+def run(transport: str, server: TLSMockServer, urls, threads: int, certfile: str, max_connections: int) -> dict:
+    scraper = make_scraper(server.url, transport, certfile, max_connections)
+    server.reset()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        responses = list(executor.map(lambda url: scraper.make_request(url, kind="detail"), urls))
+    elapsed = time.perf_counter() - started
+    scraper.transport.close()
+    scraper.session.close()
+    ok = sum(r is not None for r in responses)
+    return {
+        'transport': transport,
+        'seconds': elapsed,
+        'ok': ok,
+        'connections': sum(v for k, v in server.stats.items() if k.endswith('connections')),
+        'handshake_ms': server.handshake_seconds * 1000,
+        'max_streams': server.max_streams,
+        'pages_per_s': ok / elapsed,
+        'server': dict(server.stats),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--latency-ms', type=float, default=30.0)
+    parser.add_argument('--page-kb', type=float, default=8.0)
+    parser.add_argument('--rtt-ms', type=float, default=20.0, help='Simulated network round trip for connection setup')
+    parser.add_argument('--max-connections', type=int, default=10, help='HTTP/2 transport pool limit')
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+    with tempfile.TemporaryDirectory() as directory:
+        certfile, keyfile = make_certificate(directory)
+        site = MockSite(MockSiteConfig(latency_ms=args.latency_ms, page_kb=args.page_kb))
+        server = TLSMockServer(site, certfile, keyfile, connect_delay_ms=2 * args.rtt_ms).start()
+        urls = [f"{server.url}/books/catalogue/book_{i}/index.html" for i in range(args.requests)]
+        try:
+            results = [run(transport, server, urls, args.threads, certfile, args.max_connections)
+                       for transport in ('http1.1', 'http2')]
+        finally:
+            server.stop()
+
+    print(f"{'transport':>9} {'seconds':>8} {'ok':>5} {'conns':>6} {'handshake ms':>13} {'streams':>8} {'pages/s':>8}")
+    for r in results:
+        print(f"{r['transport']:>9} {r['seconds']:>8.2f} {r['ok']:>5} {r['connections']:>6} "
+              f"{r['handshake_ms']:>13.1f} {r['max_streams']:>8} {r['pages_per_s']:>8.1f}")
+    print("\nserver counters:", [r['server'] for r in results])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Measure what logging costs on the scraper's hot path.
+
+Runs ``BaseScraper.make_request`` from several threads against canned
+responses (no network, so logging is not hidden behind latency) under each
+logging setup; ``--parse`` also parses every page, to put the cost next to
+real per-page work:
+
+- off: no sink at all (the cost of the calls themselves)
+- legacy: loguru's default sink plus a second text sink, every card error
+  logged with its traceback (the old run.py setup)
+- dev: ``configure_logging('dev')``, one synchronous text sink
+- prod: ``configure_logging('prod')``, one enqueued JSON sink, request lines
+  rate limited, card errors counted per selector
+
+Log output goes to a temporary file. The caller column is the best of
+``--repeat`` runs of the time the scraper threads spent; total also includes
+draining the prod queue.
+
+Usage: python benchmarks/bench_logging.py [--requests 20000] [--threads 8] [--error-rate 0.05] [--parse]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import requests
+from loguru import logger
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.chdir(Path(__file__).resolve().parent.parent)
+
+from scrapers.books_scraper import BooksScraper  # noqa: E402
+from utils.logging_utils import TEXT_FORMAT, configure_logging  # noqa: E402
+
+CARD = (
+    '<article class="product_pod"><h3><a href="book-{i}/index.html" title="Book {i}">Book {i}</a></h3>'
+    '<p class="star-rating Three"></p><div class="product_price"><p class="price_color">£{i}.99</p>'
+    '<p class="instock availability">In stock</p></div></article>'
+)
+PAGE = ("<html><body><ol class='row'>" + "".join(CARD.format(i=i) for i in range(20)) + "</ol></body></html>").encode()
+
+
+def canned_response(url: str) -> requests.Response:
+    response = requests.models.Response()
+    response._content = PAGE
+    response.status_code = 200
+    response.headers['Content-Type'] = 'text/html; charset=utf-8'
+    response.url = url
+    return response
+
+
+def make_scraper() -> BooksScraper:
+    scraper = BooksScraper()
+    scraper.archive = scraper.changes = scraper.history = scraper.search_index = None
+    scraper.rate_limiter = None
+    scraper.session.request = lambda method, url, **kwargs: canned_response(url)
+    return scraper
+
+
+def setup(mode: str, path: str):
+    logger.remove()
+    if mode == "legacy":
+        logger.add(path, level="DEBUG")
+        logger.add(path, format=TEXT_FORMAT, level="INFO")
+    elif mode in ("dev", "prod"):
+        configure_logging(mode, level="INFO", sink=open(path, "a", encoding="utf-8"))
+
+
+def run(mode: str, total: int, threads: int, error_rate: float, parse: bool) -> dict:
+    scraper = make_scraper()
+    selector = scraper.config['selectors']['book']
+    error_every = int(1 / error_rate) if error_rate else 0
+    handle, path = tempfile.mkstemp(suffix=".log")
+    os.close(handle)
+    setup(mode, path)
+
+    def worker(offset: int):
+        for n in range(offset, total, threads):
+            response = scraper.make_request(f"https://books.example/catalogue/page-{n}.html")
+            if parse:
+                assert len(scraper.parse_page(scraper.parse_response(response))) == 20
+            if error_every and n % error_every == 0:
+                try:
+                    raise ValueError(f"malformed card on page {n}")
+                except ValueError as e:
+                    if mode == "legacy":
+                        scraper.logger.exception(f"Error parsing book: {e}")
+                    else:
+                        scraper.parse_errors.record(selector, e)
+
+    started = time.perf_counter()
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    caller = time.perf_counter() - started
+    logger.remove()  # waits for an enqueued sink to drain
+    elapsed = time.perf_counter() - started
+    scraper.parse_errors.summary()
+
+    with open(path, encoding="utf-8") as f:
+        lines = sum(1 for _ in f)
+    os.remove(path)
+    return {'mode': mode, 'caller_s': caller, 'total_s': elapsed, 'lines': lines}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=20000)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--error-rate', type=float, default=0.05, help='Share of pages with a card parse error')
+    parser.add_argument('--parse', action='store_true', help='Also parse every page')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--modes', default='off,legacy,dev,prod')
+    args = parser.parse_args()
+
+    results = [
+        min((run(mode, args.requests, args.threads, args.error_rate, args.parse) for _ in range(args.repeat)),
+            key=lambda r: r['caller_s'])
+        for mode in args.modes.split(',')
+    ]
+    configure_logging('dev', level="WARNING", sink=sys.stderr)
+    base = next((r for r in results if r['mode'] == 'off'), None)
+    print(f"{'mode':>7} {'caller s':>9} {'total s':>8} {'us/request':>11} {'logging us/req':>15} {'log lines':>10}")
+    for r in results:
+        per_request = r['caller_s'] / args.requests * 1e6
+        overhead = (r['caller_s'] - base['caller_s']) / args.requests * 1e6 if base else float('nan')
+        print(f"{r['mode']:>7} {r['caller_s']:>9.2f} {r['total_s']:>8.2f} {per_request:>11.1f} {overhead:>15.1f} {r['lines']:>10}")
+
+
+if __name__ == '__main__':
+    main()
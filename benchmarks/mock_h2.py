@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""TLS front for the mock site that speaks HTTP/2 and HTTP/1.1.
+
+Serves the same pages as ``mock_site.py`` over HTTPS with a self-signed
+certificate. ALPN picks the protocol per connection: HTTP/2 (via ``h2``)
+for clients that offer it, keep-alive HTTP/1.1 (via ``h11``) otherwise.
+``--connect-delay-ms`` holds every new connection after its handshake,
+standing in for the round trips connection setup costs over a real
+network. Counts connections, handshake time (including that delay) and
+requests per protocol, and the most HTTP/2 streams open at once on one
+connection. Needs ``httpx[http2]``
+(which brings ``h2`` and ``h11``) and the ``openssl`` command.
+
+Usage: python benchmarks/mock_h2.py [--port 8943] [--latency-ms 20] [--page-kb 0] [--connect-delay-ms 0]
+"""
+import argparse
+import asyncio
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+import h11
+import h2.config
+import h2.connection
+import h2.events
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.mock_site import MockSite, MockSiteConfig  # noqa: E402
+
+
+def make_certificate(directory: str) -> Tuple[str, str]:
+    """Self-signed certificate for 127.0.0.1/localhost; returns (certfile, keyfile)"""
+    cert, key = str(Path(directory) / "cert.pem"), str(Path(directory) / "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-keyout", key, "-out", cert,
+         "-days", "1", "-subj", "/CN=localhost", "-addext", "subjectAltName=IP:127.0.0.1,DNS:localhost"],
+        check=True, capture_output=True,
+    )
+    return cert, key
+
+
+class TLSMockServer:
+    """Run a ``MockSite`` over TLS with HTTP/2 and HTTP/1.1 on a background event loop thread"""
+
+    def __init__(self, site: MockSite, certfile: str, keyfile: str, host: str = "127.0.0.1", port: int = 0,
+                 connect_delay_ms: float = 0.0):
+        self.site = site
+        # Added to every new connection, standing in for the network round trips of TCP + TLS setup
+        self.connect_delay_ms = connect_delay_ms
+        self.host = host
+        self.port = port
+        self.context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        self.context.load_cert_chain(certfile, keyfile)
+        self.context.set_alpn_protocols(["h2", "http/1.1"])
+        self.stats: Counter = Counter()
+        self.handshake_seconds = 0.0
+        self.max_streams = 0
+        self.loop = asyncio.new_event_loop()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._writers: set = set()
+        self._thread = threading.Thread(target=self.loop.run_forever, daemon=True, name="mock-h2")
+
+    @property
+    def url(self) -> str:
+        return f"https://{self.host}:{self.port}"
+
+    def reset(self):
+        self.stats.clear()
+        self.handshake_seconds = 0.0
+        self.max_streams = 0
+
+    def start(self) -> "TLSMockServer":
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._start(), self.loop).result()
+        return self
+
+    async def _start(self):
+        self._server = await asyncio.start_server(self._connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    def stop(self):
+        if self._server is not None:
+            asyncio.run_coroutine_threadsafe(self._stop(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=5)
+
+    async def _stop(self):
+        self._server.close()
+        for writer in list(self._writers):
+            writer.close()
+        # Let the connection handlers see end-of-stream and return
+        while self._writers:
+            await asyncio.sleep(0.01)
+
+    async def _connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._writers.add(writer)
+        try:
+            # The handshake is done here rather than by start_server so it can be timed
+            started = time.perf_counter()
+            await writer.start_tls(self.context)
+            if self.connect_delay_ms:
+                # After the handshake: bytes the client sent early would be lost to start_tls
+                await asyncio.sleep(self.connect_delay_ms / 1000)
+            self.handshake_seconds += time.perf_counter() - started
+            protocol = writer.get_extra_info('ssl_object').selected_alpn_protocol() or "http/1.1"
+            self.stats[f'{protocol} connections'] += 1
+            if protocol == "h2":
+                await self._serve_h2(reader, writer)
+            else:
+                await self._serve_h1(reader, writer)
+        except (ConnectionError, ssl.SSLError, h11.ProtocolError):
+            pass
+        finally:
+            writer.close()
+            self._writers.discard(writer)
+
+    async def _render(self, target: str) -> Tuple[int, bytes, List[Tuple[str, str]]]:
+        parts = urlsplit(target)
+        domain, _, tail = parts.path.lstrip('/').partition('/')
+        if domain not in self.site.counters:
+            return 404, b"Not Found", [('content-type', 'text/plain; charset=utf-8')]
+        status, text, headers = await self.site.respond(domain, tail, dict(parse_qsl(parts.query)))
+        content_type = 'text/html' if status == 200 else 'text/plain'
+        headers = [('content-type', f'{content_type}; charset=utf-8')] + [(k.lower(), v) for k, v in headers.items()]
+        return status, text.encode('utf-8'), headers
+
+    async def _serve_h1(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        conn = h11.Connection(h11.SERVER)
+        while True:
+            event = conn.next_event()
+            if event is h11.NEED_DATA:
+                conn.receive_data(await reader.read(65536))
+                continue
+            if isinstance(event, h11.Request):
+                self.stats['http/1.1 requests'] += 1
+                status, body, headers = await self._render(event.target.decode('ascii'))
+                headers.append(('content-length', str(len(body))))
+                writer.write(conn.send(h11.Response(status_code=status, headers=headers)))
+                writer.write(conn.send(h11.Data(data=body)))
+                writer.write(conn.send(h11.EndOfMessage()))
+                await writer.drain()
+            elif isinstance(event, h11.ConnectionClosed) or conn.our_state is h11.MUST_CLOSE:
+                return
+            if conn.our_state is h11.DONE and conn.their_state is h11.DONE:
+                conn.start_next_cycle()
+
+    async def _serve_h2(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        conn = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False, header_encoding='utf-8'))
+        conn.initiate_connection()
+        writer.write(conn.data_to_send())
+        windows: Dict[int, asyncio.Event] = {}
+        tasks = set()
+
+        async def stream(stream_id: int, headers: Dict[str, str]):
+            self.stats['h2 requests'] += 1
+            status, body, extra = await self._render(headers[':path'])
+            conn.send_headers(stream_id, [(':status', str(status)), ('content-length', str(len(body)))] + extra)
+            while body:
+                # Respect HTTP/2 flow control: wait for a WINDOW_UPDATE when the window is spent
+                size = min(conn.local_flow_control_window(stream_id), conn.max_outbound_frame_size, len(body))
+                if size <= 0:
+                    windows[stream_id] = asyncio.Event()
+                    await windows[stream_id].wait()
+                    continue
+                conn.send_data(stream_id, body[:size])
+                body = body[size:]
+                writer.write(conn.data_to_send())
+            conn.end_stream(stream_id)
+            writer.write(conn.data_to_send())
+
+        while True:
+            data = await reader.read(65536)
+            if not data:
+                break
+            for event in conn.receive_data(data):
+                if isinstance(event, h2.events.RequestReceived):
+                    task = asyncio.ensure_future(stream(event.stream_id, dict(event.headers)))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                    self.max_streams = max(self.max_streams, len(tasks))
+                elif isinstance(event, h2.events.WindowUpdated):
+                    for stream_id, window in list(windows.items()):
+                        if event.stream_id in (0, stream_id):
+                            windows.pop(stream_id).set()
+                elif isinstance(event, h2.events.ConnectionTerminated):
+                    writer.write(conn.data_to_send())
+                    return
+            writer.write(conn.data_to_send())
+            await writer.drain()
+        for task in tasks:
+            task.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8943)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--page-kb", type=float, default=0.0)
+    parser.add_argument("--connect-delay-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        certfile, keyfile = make_certificate(directory)
+        server = TLSMockServer(MockSite(MockSiteConfig(latency_ms=args.latency_ms, page_kb=args.page_kb)),
+                               certfile, keyfile, host=args.host, port=args.port,
+                               connect_delay_ms=args.connect_delay_ms).start()
+        print(f"Serving on {server.url} (self-signed; certificate {certfile})")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
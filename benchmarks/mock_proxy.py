@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""Local HTTP forward proxy stand-in for testing the egress pool.
+
+Relays plain-HTTP requests (absolute-form targets, as ``requests`` sends
+them to an HTTP proxy) and can misbehave like a real exit: extra latency,
+a share of 502 responses, 429 throttling above a request rate, or being
+down altogether. Counts requests and the User-Agents it relayed.
+
+Usage: python benchmarks/mock_proxy.py [--port 8910] [--latency-ms 0] [--error-rate 0] [--max-rps 0]
+"""
+import argparse
+import asyncio
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Optional
+
+import aiohttp
+from aiohttp import web
+
+HOP_BY_HOP = {
+    'connection', 'keep-alive', 'proxy-authenticate', 'proxy-authorization', 'proxy-connection',
+    'te', 'trailer', 'transfer-encoding', 'upgrade', 'content-length', 'host',
+}
+
+
+@dataclass
+class MockProxyConfig:
+    """How the proxy behaves; fields can be changed while it runs"""
+    latency_ms: float = 0.0
+    error_rate: float = 0.0
+    max_rps: float = 0.0
+    burst: int = 5
+    down: bool = False
+
+
+class MockProxy:
+    def __init__(self, config: Optional[MockProxyConfig] = None, seed: int = 0):
+        self.config = config or MockProxyConfig()
+        self.rng = random.Random(seed)
+        self.stats: Counter = Counter()
+        self.user_agents: Counter = Counter()
+        self._tokens = float(self.config.burst)
+        self._updated = time.monotonic()
+        self._client: Optional[aiohttp.ClientSession] = None
+
+    def _throttled(self) -> bool:
+        if not self.config.max_rps:
+            return False
+        now = time.monotonic()
+        self._tokens = min(self.config.burst, self._tokens + (now - self._updated) * self.config.max_rps)
+        self._updated = now
+        if self._tokens < 1:
+            return True
+        self._tokens -= 1
+        return False
+
+    async def handle(self, request: web.Request) -> web.StreamResponse:
+        self.stats['requests'] += 1
+        self.user_agents[request.headers.get('User-Agent', '')] += 1
+        if self.config.down:
+            self.stats['down'] += 1
+            request.transport.close()
+            return web.Response(status=502)
+        if self.config.latency_ms:
+            await asyncio.sleep(self.config.latency_ms / 1000)
+        if self._throttled():
+            self.stats['429'] += 1
+            return web.Response(status=429, text="Too Many Requests")
+        if self.rng.random() < self.config.error_rate:
+            self.stats['502'] += 1
+            return web.Response(status=502, text="Bad Gateway")
+
+        headers = {k: v for k, v in request.headers.items() if k.lower() not in HOP_BY_HOP}
+        async with self._client.request(request.method, request.raw_path, headers=headers,
+                                        data=await request.read()) as upstream:
+            body = await upstream.read()
+            response_headers = {k: v for k, v in upstream.headers.items() if k.lower() not in HOP_BY_HOP}
+        self.stats['relayed'] += 1
+        return web.Response(status=upstream.status, body=body, headers=response_headers)
+
+    def app(self) -> web.Application:
+        async def open_client(app):
+            # Bodies are relayed as they arrived, still compressed
+            self._client = aiohttp.ClientSession(auto_decompress=False)
+            yield
+            await self._client.close()
+
+        app = web.Application()
+        app.cleanup_ctx.append(open_client)
+        app.router.add_route('*', '/{tail:.*}', self.handle)
+        return app
+
+
+class ProxyServer:
+    """Run a ``MockProxy`` on a background event loop thread"""
+
+    def __init__(self, proxy: MockProxy, host: str = "127.0.0.1", port: int = 0):
+        self.proxy = proxy
+        self.host = host
+        self.port = port
+        self.loop = asyncio.new_event_loop()
+        self._runner: Optional[web.AppRunner] = None
+        self._thread = threading.Thread(target=self.loop.run_forever, daemon=True, name="mock-proxy")
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> "ProxyServer":
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._start(), self.loop).result()
+        return self
+
+    async def _start(self):
+        self._runner = web.AppRunner(self.proxy.app(), access_log=None)
+        await self._runner.setup()
+        tcp = web.TCPSite(self._runner, self.host, self.port)
+        await tcp.start()
+        self.port = tcp._server.sockets[0].getsockname()[1]
+
+    def stop(self):
+        if self._runner is not None:
+            asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=5)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8910)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--max-rps", type=float, default=0.0, help="Answer 429 above this request rate (0 = off)")
+    parser.add_argument("--burst", type=int, default=5)
+    args = parser.parse_args()
+
+    proxy = MockProxy(MockProxyConfig(
+        latency_ms=args.latency_ms, error_rate=args.error_rate, max_rps=args.max_rps, burst=args.burst,
+    ))
+    print(f"Proxying on http://{args.host}:{args.port}")
+    web.run_app(proxy.app(), host=args.host, port=args.port, access_log=None, print=None)
+
+
+if __name__ == "__main__":
+    main()
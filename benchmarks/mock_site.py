@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""Synthetic mock site for end-to-end load tests of the domain scrapers.
+
+Serves listing and detail pages for every domain under ``/<domain>/`` with
+markup that matches the selectors in ``data/<domain>/<domain>_url.json``, so
+each scraper can run unchanged with its ``base_url`` pointed here. Card
+count, page count and size, latency, error rate and 429 throttling are
+configurable.
+
+Usage: python benchmarks/mock_site.py [--port 8900] [--cards 20] [--latency-ms 20] [--max-rps 50]
+"""
+import argparse
+import asyncio
+import random
+import re
+import threading
+import time
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+from aiohttp import web
+
+WORDS = (
+    "python data science machine learning deep web development cloud security design "
+    "finance marketing analytics rust go java react sql kubernetes docker aws azure"
+).split()
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries", "Wayne Enterprises"]
+CITIES = ["Austin, TX", "Denver, CO", "Seattle, WA", "Miami, FL", "Boston, MA", "Chicago, IL"]
+RATINGS = ["One", "Two", "Three", "Four", "Five"]
+
+
+@dataclass
+class MockSiteConfig:
+    """Shape and behaviour of the generated site"""
+    pages: int = 5
+    cards: int = 20
+    page_kb: float = 0.0
+    latency_ms: float = 20.0
+    latency_sigma: float = 0.5
+    error_rate: float = 0.0
+    max_rps: float = 0.0
+    burst: int = 10
+    seed: int = 0
+
+
+class _Throttle:
+    """Server-side token bucket; an empty bucket answers 429"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+
+    def allow(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+def _rng(config: MockSiteConfig, *key) -> random.Random:
+    return random.Random(zlib.crc32(repr((config.seed,) + key).encode('utf-8')))
+
+
+def _title(rng: random.Random, words: int = 3) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).title()
+
+
+def _page(body: str, config: MockSiteConfig) -> str:
+    html = f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>mock</title></head><body>{body}'
+    missing = int(config.page_kb * 1024) - len(html)
+    if missing > 0:
+        # Inert filler so pages reach the configured size
+        html += '<div hidden>' + ("lorem ipsum " * (missing // 12 + 1))[:missing] + '</div>'
+    return html + '</body></html>'
+
+
+# --- listing cards and detail pages per domain --------------------------------------------
+
+def _books_card(rng, item_id):
+    title = _title(rng, 4)
+    return (
+        f'<article class="product_pod"><h3><a href="{title.lower().replace(" ", "-")}_{item_id}/index.html" '
+        f'title="{title}">{title}</a></h3><p class="star-rating {rng.choice(RATINGS)}"></p>'
+        f'<p class="price_color">£{rng.uniform(5, 60):.2f}</p><p class="instock availability">In stock</p></article>'
+    )
+
+
+def _books_detail(rng, item_id):
+    return (
+        f'<div class="product_main"><h1>{_title(rng, 4)}</h1><p class="price_color">£{rng.uniform(5, 60):.2f}</p>'
+        f'<p class="star-rating {rng.choice(RATINGS)}"></p><p class="availability">In stock</p></div>'
+        f'<ul class="breadcrumb"><li><a href="/">Home</a></li><li><a href="#">Books</a></li>'
+        f'<li><a href="#">{rng.choice(WORDS).title()}</a></li></ul>'
+        f'<div id="product_description"><h2>Product Description</h2></div><p>{_title(rng, 12)}</p>'
+        f'<table class="table table-striped"><tr><th>UPC</th><td>{item_id:016x}</td></tr></table>'
+    )
+
+
+def _jobs_card(rng, item_id):
+    tags = "".join(f'<a class="tag">{t}</a>' for t in rng.sample(WORDS, 3))
+    return (
+        f'<tr class="job" data-url="remote-jobs/{item_id}"><td><h2>{_title(rng, 2)} Engineer</h2>'
+        f'<h3>{rng.choice(COMPANIES)}</h3><div class="location">Remote</div>'
+        f'<div class="salary">${rng.randint(60, 200)}k</div><div class="tags">{tags}</div></td></tr>'
+    )
+
+
+def _jobs_detail(rng, item_id):
+    return f'<div class="description">{_title(rng, 30)}</div>'
+
+
+def _ecommerce_card(rng, item_id):
+    return (
+        f'<div class="s-result-item"><h2><a href="dp/{item_id}"><span>{_title(rng, 3)} Laptop</span></a></h2>'
+        f'<span class="a-price-whole">{rng.randint(200, 2500)}</span>'
+        f'<span class="a-icon-alt">{rng.uniform(3, 5):.1f} out of 5 stars</span>'
+        f'<div class="a-row"><span class="a-color-success">In Stock</span></div></div>'
+    )
+
+
+def _ecommerce_detail(rng, item_id):
+    return f'<div id="productTitle">{_title(rng, 3)}</div>'
+
+
+def _real_estate_card(rng, item_id):
+    beds, baths, sqft = rng.randint(1, 5), rng.randint(1, 4), rng.randint(600, 4000)
+    return (
+        f'<article class="list-card"><a href="homedetails/{item_id}_zpid/">'
+        f'<address class="list-card-addr">{rng.randint(1, 9999)} {rng.choice(WORDS).title()} St, {rng.choice(CITIES)}</address></a>'
+        f'<div class="list-card-price">${rng.randint(150, 2000) * 1000:,}</div>'
+        f'<ul class="list-card-details"><li>{beds} bds</li><li>{baths} ba</li><li>{sqft:,} sqft</li></ul>'
+        f'<div class="list-card-footer">{rng.choice(COMPANIES)} Realty</div></article>'
+    )
+
+
+def _real_estate_detail(rng, item_id):
+    return (
+        f'<div class="summary-container">{rng.randint(1, 5)} bd {rng.randint(1, 4)} ba '
+        f'{rng.randint(600, 4000):,} sqft</div>'
+    )
+
+
+def _education_card(rng, item_id):
+    skills = ", ".join(rng.sample(WORDS, 3)).title()
+    return (
+        f'<li class="cds-9 cds-grid-item"><a data-click-key="search.search.click.search_card" href="learn/course-{item_id}">'
+        f'<h3 class="cds-CommonCard-title">{_title(rng, 3)}</h3></a>'
+        f"<p class=\"css-vac8rf\">Skills you'll gain: {skills}</p>"
+        f'<div class="cds-RatingStat-sizeLabel"><span class="css-6ecy9b">{rng.uniform(3.5, 5):.1f}</span>'
+        f'<div class="css-vac8rf">({rng.randint(1, 90)}K reviews)</div></div>'
+        f'<div class="cds-CommonCard-metadata"><p class="css-vac8rf">Beginner · Course · 1 - 3 Months</p></div></li>'
+    )
+
+
+def _education_detail(rng, item_id):
+    return (
+        f'<div class="partners"><p class="cds-ProductCard-partnerNames">{rng.choice(COMPANIES)} University</p></div>'
+        f'<div class="about">{_title(rng, 40)}</div>'
+    )
+
+
+# domain -> (listing path regex with a ``page`` group, card, detail, listing wrapper, next link)
+DOMAINS: Dict[str, Tuple[str, Callable, Callable, Tuple[str, str], Callable[[int], str]]] = {
+    'books': (
+        r"catalogue/page-(?P<page>\d+)\.html$", _books_card, _books_detail, ('<ol class="row">', '</ol>'),
+        lambda page: f'<ul class="pager"><li class="next"><a href="page-{page + 1}.html">next</a></li></ul>',
+    ),
+    'jobs': (
+        r"remote-dev-jobs/(?P<page>\d+)$", _jobs_card, _jobs_detail, ('<table id="jobsboard">', '</table>'),
+        lambda page: "",
+    ),
+    'ecommerce': (
+        r"s$", _ecommerce_card, _ecommerce_detail, ('<div class="s-main-slot">', '</div>'),
+        lambda page: f'<a class="s-pagination-next" href="?page={page + 1}">Next</a>',
+    ),
+    'real_estate': (
+        r"homes/(?P<page>\d+)_p/?$", _real_estate_card, _real_estate_detail, ('<ul class="photo-cards">', '</ul>'),
+        lambda page: f'<a title="Next page" href="../{page + 1}_p/">Next</a>',
+    ),
+    'education': (
+        r"search$", _education_card, _education_detail, ('<ul class="cds-9">', '</ul>'),
+        lambda page: "",
+    ),
+}
+
+
+class MockSite:
+    """aiohttp application serving the synthetic domains, with per-domain request counters"""
+
+    def __init__(self, config: Optional[MockSiteConfig] = None):
+        self.config = config or MockSiteConfig()
+        self.throttle = _Throttle(self.config.max_rps, self.config.burst) if self.config.max_rps > 0 else None
+        self.random = random.Random(self.config.seed)
+        self.counters: Dict[str, Counter] = {domain: Counter() for domain in DOMAINS}
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/{domain}/{tail:.*}", self.handle)
+        return app
+
+    def _latency(self) -> float:
+        if self.config.latency_ms <= 0:
+            return 0.0
+        return self.config.latency_ms / 1000 * self.random.lognormvariate(0, self.config.latency_sigma)
+
+    async def handle(self, request: web.Request) -> web.Response:
+        domain, tail = request.match_info['domain'], request.match_info['tail']
+        if domain not in DOMAINS:
+            raise web.HTTPNotFound()
+        status, text, headers = await self.respond(domain, tail, dict(request.query))
+        return web.Response(status=status, text=text, headers=headers,
+                            content_type='text/html' if status == 200 else 'text/plain', charset='utf-8')
+
+    async def respond(self, domain: str, tail: str, query: Dict[str, str]) -> Tuple[int, str, Dict[str, str]]:
+        """Status, body and extra headers for ``/<domain>/<tail>``, after the simulated latency"""
+        counter = self.counters[domain]
+        counter['requests'] += 1
+
+        await asyncio.sleep(self._latency())
+        if self.throttle is not None and not self.throttle.allow():
+            counter['429'] += 1
+            return 429, "Too Many Requests", {'Retry-After': '1'}
+        if self.config.error_rate and self.random.random() < self.config.error_rate:
+            counter['5xx'] += 1
+            return 500, "Internal Server Error", {}
+
+        pattern, card, detail, (open_tag, close_tag), next_link = DOMAINS[domain]
+        match = re.match(pattern, tail)
+        if match:
+            page = int(match.groupdict().get('page') or query.get('page', 1))
+            body = ""
+            if 1 <= page <= self.config.pages:
+                cards = "".join(
+                    card(_rng(self.config, domain, page, i), page * 100000 + i) for i in range(self.config.cards)
+                )
+                body = open_tag + cards + close_tag
+                if page < self.config.pages:
+                    body += next_link(page)
+            counter['listing'] += 1
+        else:
+            item_id = int((re.findall(r"\d+", tail) or ["0"])[-1])
+            body = detail(_rng(self.config, domain, 'detail', item_id), item_id)
+            counter['detail'] += 1
+
+        html = _page(body, self.config)
+        counter['bytes'] += len(html)
+        return 200, html, {}
+
+    def stats(self, domain: str) -> Dict[str, int]:
+        return dict(self.counters[domain])
+
+
+class MockServer:
+    """Run a ``MockSite`` on a background event loop thread"""
+
+    def __init__(self, site: MockSite, host: str = "127.0.0.1", port: int = 0):
+        self.site = site
+        self.host = host
+        self.port = port
+        self.loop = asyncio.new_event_loop()
+        self._runner: Optional[web.AppRunner] = None
+        self._thread = threading.Thread(target=self.loop.run_forever, daemon=True, name="mock-site")
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> "MockServer":
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._start(), self.loop).result()
+        return self
+
+    async def _start(self):
+        self._runner = web.AppRunner(self.site.app(), access_log=None)
+        await self._runner.setup()
+        tcp = web.TCPSite(self._runner, self.host, self.port)
+        await tcp.start()
+        self.port = tcp._server.sockets[0].getsockname()[1]
+
+    def stop(self):
+        if self._runner is not None:
+            asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=5)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--cards", type=int, default=20)
+    parser.add_argument("--page-kb", type=float, default=0.0)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--latency-sigma", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--max-rps", type=float, default=0.0, help="Answer 429 above this request rate (0 = off)")
+    parser.add_argument("--burst", type=int, default=10)
+    args = parser.parse_args()
+
+    site = MockSite(MockSiteConfig(
+        pages=args.pages, cards=args.cards, page_kb=args.page_kb, latency_ms=args.latency_ms,
+        latency_sigma=args.latency_sigma, error_rate=args.error_rate, max_rps=args.max_rps, burst=args.burst,
+    ))
+    print(f"Serving {', '.join(DOMAINS)} on http://{args.host}:{args.port}/<domain>/")
+    web.run_app(site.app(), host=args.host, port=args.port, access_log=None, print=None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Local stand-in for the OpenAI chat completions endpoint.
+
+Answers ``POST /v1/chat/completions`` with a short canned summary after a
+configurable delay and reports the peak number of concurrent requests, so the
+map-reduce insight pipeline can be exercised without an API key or network.
+
+Usage:
+    python benchmarks/stub_openai.py --port 8901 --latency-ms 300
+    OPENAI_API_BASE=http://127.0.0.1:8901/v1 OPENAI_API_KEY=stub \\
+        python run.py analyze jobs --map-reduce
+"""
+import argparse
+import asyncio
+import time
+
+from aiohttp import web
+
+
+class StubCompletions:
+    def __init__(self, latency_ms: float = 300.0, fail_every: int = 0):
+        self.latency = latency_ms / 1000
+        self.fail_every = fail_every
+        self.requests = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def complete(self, request: web.Request) -> web.Response:
+        payload = await request.json()
+        self.requests += 1
+        number = self.requests
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+            if self.fail_every and number % self.fail_every == 0:
+                return web.json_response({'error': {'message': 'stub failure', 'type': 'server_error'}}, status=500)
+            prompt = payload['messages'][-1]['content']
+            content = f"Stub summary #{number}: {len(prompt)} characters, {prompt.count(chr(10)) + 1} lines."
+        finally:
+            self.in_flight -= 1
+        return web.json_response({
+            'id': f"stub-{number}",
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': payload.get('model', 'stub'),
+            'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': content}, 'finish_reason': 'stop'}],
+            'usage': {'prompt_tokens': len(prompt) // 4, 'completion_tokens': 20, 'total_tokens': len(prompt) // 4 + 20},
+        })
+
+    async def stats(self, request: web.Request) -> web.Response:
+        return web.json_response({'requests': self.requests, 'peak_in_flight': self.peak_in_flight})
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", self.complete)
+        app.router.add_get("/stats", self.stats)
+        return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8901)
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--fail-every", type=int, default=0, help="Answer every Nth request with a 500")
+    args = parser.parse_args()
+    stub = StubCompletions(args.latency_ms, args.fail_every)
+    print(f"Stub completions on http://{args.host}:{args.port}/v1 (peak concurrency at /stats)")
+    web.run_app(stub.app(), host=args.host, port=args.port, access_log=None, print=None)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,28 @@
 #!/usr/bin/env python3
 import typer
-from typing import Optional
+from typing import List, Optional
 from pathlib import Path
 import importlib
+import json
 import pandas as pd
 from loguru import logger
-import sys
 import chardet
-# Configure logging
-logger.add(sys.stdout, format="{time} {level} {message}", level="INFO")
+from utils.logging_utils import configure_logging
+# Configure logging (one sink; LOG_MODE=prod for enqueued JSON lines)
+configure_logging()
 
 app = typer.Typer(help="AI-Powered Multi-Domain Web Scraper")
 
+
+@app.callback()
+def main(log_mode: Optional[str] = typer.Option(None, help="dev (text) or prod (async JSON, sampled request logs); default LOG_MODE"),
+         memory_mb: Optional[float] = typer.Option(None, help="Memory budget; fetching slows down near it (default SCRAPER_MEMORY_MB, 0 = none)")):
+    """AI-Powered Multi-Domain Web Scraper"""
+    if log_mode:
+        configure_logging(log_mode)
+    from utils.backpressure import configure_memory_budget
+    configure_memory_budget(memory_mb)
+
 # Available domains
 DOMAINS = {
     'books': {
@@ -50,7 +61,12 @@ def scrape(
     site: str = typer.Argument(..., help="Domain to scrape (books, jobs, real_estate, ecommerce, education)"),
     pages: int = typer.Option(None, help="Number of pages to scrape (overrides config)"),
     output: str = typer.Option("scraped_data", help="Output filename"),
-    save_db: bool = typer.Option(False, help="Save to database")
+    save_db: bool = typer.Option(False, help="Save to database"),
+    db_delta: bool = typer.Option(True, help="Only write new and changed items to the database"),
+    query: Optional[List[str]] = typer.Option(None, "--query", help="Search term (repeatable; defaults to config search_terms)"),
+    query_concurrency: Optional[int] = typer.Option(None, help="Search terms run at the same time"),
+    discover: bool = typer.Option(False, help="Find items through robots.txt/sitemaps instead of listing pages"),
+    db_stream: bool = typer.Option(True, help="With --save-db, write batches in the background while scraping")
 ):
     """Run scraper for a specific domain"""
     if site not in DOMAINS:
@@ -61,35 +77,118 @@ def scrape(
         # Load and run scraper
         scraper_class = load_class(DOMAINS[site]['scraper'], 'scraper')
         scraper = scraper_class()
-        
-        logger.info(f"Starting {site} scraper...")
-        
-        # Handle special parameters for specific scrapers
-        if site == 'ecommerce':
-            data = scraper.scrape(max_pages=pages, search_term="laptop")
-        elif site == 'education':
-            data = scraper.scrape(max_pages=pages, search_term="data science")
+        run_scraper(scraper, site, pages, output, save_db, db_delta,
+                    queries=query, query_concurrency=query_concurrency, discover=discover, db_stream=db_stream)
+            
+    except Exception as e:
+        logger.error(f"Scraping failed: {e}")
+
+
+def run_scraper(scraper, site: str, pages: Optional[int] = None, output: str = "scraped_data",
+                save_db: bool = False, db_delta: bool = True, db_manager=None,
+                queries: Optional[List[str]] = None, query_concurrency: Optional[int] = None,
+                discover: bool = False, db_stream: bool = True) -> list:
+    """Scrape with an existing scraper instance, then save files, the delta and optionally the DB.
+
+    The change-detection baseline moves only after the database write
+    succeeded, and only for the pages and queries this run covered.
+    """
+    logger.info(f"Starting {site} scraper...")
+    
+    sink = None
+    delta = None
+    written = True
+    scraper.coverage_gaps = 0
+    if save_db:
+        if db_manager is None:
+            from utils.db import DatabaseManager
+            db_manager = DatabaseManager()
+        if db_stream:
+            # Write pages to the database while the crawl runs
+            sink = db_manager.stream(site, f"{site}_scraper")
+            scraper.stages['db'] = sink.stage
+            scraper.item_sink = _stream_filter(sink, scraper.changes if db_delta else None)
+    
+    try:
+        if discover or scraper.config.get('discovery', {}).get('enabled', False):
+            # Item URLs come from the sitemaps; only new or modified pages are fetched
+            data = scraper.discover()
+        # Search-driven scrapers fan out over every search term
+        elif scraper.supports_search:
+            terms = queries or scraper.search_terms()
+            data = scraper.scrape_queries(terms, max_pages=pages, concurrency=query_concurrency)
         else:
+            if queries:
+                logger.warning(f"{site} scraper does not take search terms; ignoring --query")
             data = scraper.scrape(max_pages=pages)
         
+        # Fewer pages or queries than configured, or pages that failed: not a full snapshot
+        full = not pages and not (queries and scraper.supports_search) and not scraper.coverage_gaps
         if data:
             # Save to files
             scraper.save_data(data, output)
+            delta = scraper.record_changes(data, full=full)
+            scraper.record_history(data)
+            scraper.index_items(data, full=full)
             
             # Optional: Save to database
             if save_db:
-                from utils.db import DatabaseManager
-                db_manager = DatabaseManager()
-                db_manager.save_data(site, data, f"{site}_scraper")
+                if db_delta and delta is not None:
+                    records = delta['new'] + [change['item'] for change in delta['changed']]
+                else:
+                    records = data
+                if sink is not None:
+                    # Items streamed at page time lack clusters and merged queries: the final version of
+                    # every new or changed item is sent again (rows identical to the last one sent are skipped)
+                    sink.put(records)
+                else:
+                    written = db_manager.save_data(site, records, f"{site}_scraper")
             
             logger.success(f"Successfully scraped {len(data)} items from {site}")
         else:
             logger.warning(f"No data scraped from {site}")
-            
-    except Exception as e:
-        logger.error(f"Scraping failed: {e}")
-        
+    finally:
+        if sink is not None:
+            scraper.item_sink = None
+            written = sink.close()['failed'] == 0 and written
+    if delta is not None:
+        if written:
+            scraper.commit_changes(data, full=full)
+        else:
+            logger.warning(f"Database write failed; keeping the previous {site} baseline so these changes are found again")
+    scraper.log_transfer_stats()
+    scraper.log_pipeline_stats()
+    scraper.stages.pop('db', None)
+    scraper.parse_errors.log_summary()
+    scraper.selector_profile.save()
+    return data
+
 
+def _stream_filter(sink, tracker=None):
+    """Item sink that forwards pages to the DB sink, skipping items unchanged since the last run.
+
+    Queries are merged into ``matched_queries`` only after the crawl, so the
+    comparison leaves that field out.
+    """
+    if tracker is None:
+        return sink.put
+    from utils.change_tracker import fingerprint_item
+    
+    def page_version(item):
+        return {key: value for key, value in item.items() if key != 'matched_queries'}
+    
+    previous = {}
+    for item in tracker.baseline():
+        item = page_version(item)
+        previous[tracker.item_key(item)] = fingerprint_item(item)
+    
+    def put(items):
+        sink.put([
+            item for item in items
+            if previous.get(tracker.item_key(page_version(item))) != fingerprint_item(page_version(item))
+        ])
+    return put
+        
 
 def read_file_with_fallback(file_path: Path):
     """Read file with encoding detection & fallback for CSV/JSON/Excel"""
@@ -116,11 +215,32 @@ def read_file_with_fallback(file_path: Path):
         logger.error(f"Failed reading {file_path}: {e}")
         raise
     
+def _partitions(data_paths: List[Path], chunk_size: int, load: bool = True):
+    """Data in chunks of about ``chunk_size`` rows (non-CSV files whole).
+
+    With ``load`` False, chunks are CSV byte ranges and file paths, read by
+    the worker processes instead of the caller.
+    """
+    from utils.file_utils import safe_read_csv
+    from analysis.partitioned import read_partition, split_csv
+    for path in data_paths:
+        if path.suffix != '.csv':
+            yield read_partition(path) if load else path
+        elif load:
+            yield from safe_read_csv(path, chunksize=chunk_size)
+        else:
+            yield from split_csv(path, chunk_size)
+
 @app.command()
 def analyze(
     site: str = typer.Argument(..., help="Domain to analyze"),
     input_file: Optional[str] = typer.Option(None, help="Input data file"),
-    generate_report: bool = typer.Option(True, help="Generate AI report")
+    generate_report: bool = typer.Option(True, help="Generate AI report"),
+    map_reduce: bool = typer.Option(False, help="Summarize every record in concurrent chunks before writing the report"),
+    approx: bool = typer.Option(False, help="Single-pass sampled/sketched statistics in bounded memory (no AI report)"),
+    partitioned: bool = typer.Option(False, help="Exact statistics computed per chunk in a process pool and merged (no AI report)"),
+    workers: Optional[int] = typer.Option(None, help="Worker processes for --partitioned (default: CPU count)"),
+    chunk_size: int = typer.Option(100000, help="Rows per chunk in --approx/--partitioned mode (CSV input)")
 ):
     """Run analysis for a specific domain"""
     if site not in DOMAINS:
@@ -128,24 +248,12 @@ def analyze(
         return
     
     try:
-        # Import safe reading functions
-        from utils.file_utils import safe_read_csv, safe_read_json, safe_read_excel
-        
-        # Load data
+        # Locate data
         if input_file:
-            data_path = Path(f"outputs/scrapped_data/{site}/{input_file}")
-            if not data_path.exists():
-                logger.error(f"File not found: {data_path}")
-                return
-                
-            if data_path.suffix == '.csv':
-                data = safe_read_csv(data_path)
-            elif data_path.suffix == '.json':
-                data = safe_read_json(data_path)
-            elif data_path.suffix in ['.xlsx', '.xls']:
-                data = safe_read_excel(data_path)
-            else:
-                logger.error(f"Unsupported file format: {data_path.suffix}")
+            # A glob pattern (e.g. "*.csv") selects several files
+            data_paths = sorted(Path(f"outputs/scrapped_data/{site}").glob(input_file))
+            if not data_paths:
+                logger.error(f"File not found: outputs/scrapped_data/{site}/{input_file}")
                 return
         else:
             # Load latest data
@@ -162,41 +270,60 @@ def analyze(
             # Get the latest file based on modification time
             latest_file = max(files, key=lambda x: x.stat().st_mtime)
             logger.info(f"Loading latest file: {latest_file}")
-            
-            if latest_file.suffix == '.csv':
-                data = safe_read_csv(latest_file)
-            elif latest_file.suffix == '.json':
-                data = safe_read_json(latest_file)
-            elif latest_file.suffix in ['.xlsx', '.xls']:
-                data = safe_read_excel(latest_file)
-            else:
-                logger.error(f"Unsupported file format: {latest_file.suffix}")
-                return
+            data_paths = [latest_file]
         
-        # Check if data is empty
-        if data.empty:
-            logger.error(f"No data found in the file")
+        unsupported = [p for p in data_paths if p.suffix not in ['.csv', '.json', '.xlsx', '.xls']]
+        if unsupported:
+            logger.error(f"Unsupported file format: {unsupported[0].suffix}")
             return
-            
-        logger.info(f"Loaded {len(data)} records for analysis")
         
-        # Load and run analysis
+        from analysis.partitioned import read_partition
         analysis_class = load_class(DOMAINS[site]['analysis'], 'analysis')
         analyzer = analysis_class()
         
-        logger.info(f"Analyzing {site} data...")
-        insights = analyzer.analyze(data)
-        
-        if generate_report and 'ai_analysis' in insights:
-            analyzer.save_report(insights['ai_analysis'], site, "market_analysis")
-            logger.success(f"AI report generated for {site}")
+        if approx or partitioned:
+            if approx:
+                logger.info(f"Analyzing {site} data (approximate)...")
+                insights = analyzer.analyze_approx(_partitions(data_paths, chunk_size))
+                report_name = "approx_insights"
+            else:
+                logger.info(f"Analyzing {site} data in partitions...")
+                insights = analyzer.analyze_partitioned(_partitions(data_paths, chunk_size, load=False), workers)
+                report_name = "partitioned_insights"
+            report_dir = Path("outputs/report")
+            report_dir.mkdir(parents=True, exist_ok=True)
+            report_path = report_dir / f"{site}_{report_name}.json"
+            with open(report_path, 'w', encoding='utf-8') as f:
+                json.dump(insights, f, indent=2, default=str)
+            logger.info(f"Statistics saved to {report_path}")
+        else:
+            data = pd.concat([read_partition(path) for path in data_paths], ignore_index=True)
+            
+            # Check if data is empty
+            if data.empty:
+                logger.error(f"No data found in the file")
+                return
+                
+            logger.info(f"Loaded {len(data)} records for analysis")
+            
+            # Run analysis
+            if map_reduce:
+                analyzer.map_reduce = True
+            
+            logger.info(f"Analyzing {site} data...")
+            insights = analyzer.analyze(data)
+            
+            if generate_report and 'ai_analysis' in insights:
+                analyzer.save_report(insights['ai_analysis'], site, "market_analysis")
+                logger.success(f"AI report generated for {site}")
         
         # Print basic insights
         item_count = insights.get('total_books', 
                                  insights.get('total_jobs', 
                                              insights.get('total_properties', 
                                                          insights.get('total_products', 
-                                                                     insights.get('total_courses', 0)))))
+                                                                     insights.get('total_courses', 
+                                                                                 insights.get('total_items', 0))))))
         logger.info(f"Analysis completed. {item_count} items analyzed")
         
     except Exception as e:
@@ -208,12 +335,318 @@ def analyze(
 def run_all(
     site: str = typer.Argument(..., help="Domain to process"),
     pages: int = typer.Option(None, help="Number of pages to scrape"),
-    analyze_data: bool = typer.Option(True, help="Run analysis after scraping")
+    analyze_data: bool = typer.Option(True, help="Run analysis after scraping"),
+    map_reduce: bool = typer.Option(False, help="Summarize every record in concurrent chunks before writing the report")
 ):
     """Run both scraping and analysis for a domain"""
-    scrape(site=site, pages=pages)
+    # Called as plain functions, so every option needs an explicit value
+    scrape(site=site, pages=pages, output="scraped_data", save_db=False, db_delta=True,
+           query=None, query_concurrency=None, discover=False, db_stream=True)
     if analyze_data:
-        analyze(site=site)
+        analyze(site=site, input_file=None, generate_report=True, map_reduce=map_reduce, approx=False, partitioned=False, workers=None, chunk_size=100000)
+
+@app.command()
+def enqueue(
+    site: str = typer.Argument(..., help="Domain to queue page tasks for"),
+    pages: int = typer.Option(None, help="Number of pages to queue (overrides config)"),
+    search_term: Optional[str] = typer.Option(None, help="Search term for search-driven scrapers"),
+    queue_path: Optional[str] = typer.Option(None, "--queue", help="Work queue SQLite file or database URL (defaults to WORK_QUEUE_URL)")
+):
+    """Queue listing page tasks for distributed workers"""
+    if site not in DOMAINS:
+        logger.error(f"Domain {site} not supported. Available: {list(DOMAINS.keys())}")
+        return
+
+    from utils.work_queue import open_work_queue
+    from scrapers.worker import seed_pages
+
+    scraper_class = load_class(DOMAINS[site]['scraper'], 'scraper')
+    if search_term and not scraper_class.supports_search:
+        logger.error(f"{site} does not support search terms")
+        return
+    scraper = scraper_class()
+    queue = open_work_queue(queue_path)
+    params = {'search_term': search_term} if search_term else {}
+    added = seed_pages(queue, site, pages or scraper.config.get('pages', 1), params)
+    logger.success(f"Queued {added} page tasks for {site}. Queue: {queue.stats(site)}")
+
+@app.command()
+def worker(
+    site: str = typer.Argument(..., help="Domain to work on"),
+    queue_path: Optional[str] = typer.Option(None, "--queue", help="Work queue SQLite file or database URL (defaults to WORK_QUEUE_URL)"),
+    worker_id: Optional[str] = typer.Option(None, help="Worker name (defaults to host-pid)"),
+    lease_seconds: float = typer.Option(120, help="Seconds before an unacknowledged task is reassigned"),
+    batch_size: int = typer.Option(4, help="Tasks leased per round trip"),
+    forever: bool = typer.Option(False, help="Keep polling after the queue is drained")
+):
+    """Pull page and detail tasks from a shared queue until it is drained"""
+    if site not in DOMAINS:
+        logger.error(f"Domain {site} not supported. Available: {list(DOMAINS.keys())}")
+        return
+
+    from utils.work_queue import open_work_queue
+    from scrapers.worker import CrawlWorker
+
+    scraper = load_class(DOMAINS[site]['scraper'], 'scraper')()
+    queue = open_work_queue(queue_path)
+    crawl_worker = CrawlWorker(scraper, queue, worker_id, lease_seconds, batch_size)
+    stats = crawl_worker.run(drain=not forever)
+    scraper.selector_profile.save()
+    logger.success(f"Worker {crawl_worker.worker_id} done: {stats}")
+
+@app.command()
+def collect(
+    site: str = typer.Argument(..., help="Domain to export from the work queue"),
+    queue_path: Optional[str] = typer.Option(None, "--queue", help="Work queue SQLite file or database URL (defaults to WORK_QUEUE_URL)"),
+    output: str = typer.Option("scraped_data", help="Output filename"),
+    save_db: bool = typer.Option(False, help="Save to database")
+):
+    """Save the items gathered by distributed workers"""
+    if site not in DOMAINS:
+        logger.error(f"Domain {site} not supported. Available: {list(DOMAINS.keys())}")
+        return
+
+    from utils.work_queue import open_work_queue
+
+    queue = open_work_queue(queue_path)
+    data = queue.items(site)
+    logger.info(f"Queue status for {site}: {queue.stats(site)}")
+    if not data:
+        logger.warning(f"No items collected for {site}")
+        return
+
+    scraper = load_class(DOMAINS[site]['scraper'], 'scraper')()
+    scraper.save_data(data, output)
+    scraper.record_history(data)
+    # The queue may hold only part of a crawl (some pages, a search term), so nothing is pruned
+    scraper.index_items(data, full=False)
+    if save_db:
+        from utils.db import DatabaseManager
+        DatabaseManager().save_data(site, data, f"{site}_worker")
+    logger.success(f"Collected {len(data)} items for {site}")
+
+@app.command()
+def reparse(
+    site: str = typer.Argument(..., help="Domain whose archived pages should be reparsed"),
+    workers: Optional[int] = typer.Option(None, help="Parser processes (defaults to all cores)"),
+    since: Optional[str] = typer.Option(None, help="Only pages fetched on/after this date"),
+    until: Optional[str] = typer.Option(None, help="Only pages fetched before this date"),
+    output: str = typer.Option("reparsed_data", help="Output filename")
+):
+    """Rerun the current extractors over archived pages without touching the network"""
+    if site not in DOMAINS:
+        logger.error(f"Domain {site} not supported. Available: {list(DOMAINS.keys())}")
+        return
+
+    from scrapers.reparse import reparse_archive
+
+    scraper_class = load_class(DOMAINS[site]['scraper'], 'scraper')
+    data = reparse_archive(
+        scraper_class, site, workers=workers,
+        since=pd.Timestamp(since).timestamp() if since else None,
+        until=pd.Timestamp(until).timestamp() if until else None,
+    )
+    if not data:
+        logger.warning(f"No archived pages found for {site}")
+        return
+
+    scraper_class().save_data(data, output)
+    logger.success(f"Reparsed {len(data)} items for {site}")
+
+@app.command()
+def history(
+    site: str = typer.Argument(..., help="Domain whose history to query"),
+    field: Optional[str] = typer.Option(None, help="Numeric field to trend per item, e.g. price"),
+    key: str = typer.Option("url", help="Column identifying an item"),
+    item: Optional[List[str]] = typer.Option(None, "--item", help="Only these item keys (repeatable)"),
+    count_by: Optional[str] = typer.Option(None, help="Count items per day by this column, e.g. company or tags"),
+    sep: Optional[str] = typer.Option(None, help="Split --count-by values on this separator (e.g. ',' for tags)"),
+    since: Optional[str] = typer.Option(None, help="First snapshot date (inclusive)"),
+    until: Optional[str] = typer.Option(None, help="Last snapshot date (inclusive)"),
+    top: int = typer.Option(20, help="Rows to print"),
+    output: Optional[str] = typer.Option(None, help="Write the full result to this CSV file")
+):
+    """Query the partitioned history, e.g. price trend per URL or job demand per company"""
+    if site not in DOMAINS:
+        logger.error(f"Domain {site} not supported. Available: {list(DOMAINS.keys())}")
+        return
+    if bool(field) == bool(count_by):
+        logger.error("Pass exactly one of --field or --count-by")
+        return
+
+    from utils.history_store import HistoryStore, summarize_trend
+
+    store = HistoryStore(site)
+    if field:
+        result = store.trend(field, key=key, since=since, until=until, keys=item)
+        summary = summarize_trend(result, key, field).sort_values('change', key=abs, ascending=False)
+    else:
+        result = store.counts(count_by, since=since, until=until, sep=sep)
+        summary = summarize_trend(result, count_by, 'count').sort_values('last', ascending=False)
+    if result.empty:
+        logger.warning(f"No history for {site} in the requested range")
+        return
+
+    typer.echo(summary.head(top).to_string())
+    if output:
+        result.to_csv(output, index=False)
+        logger.info(f"Saved {len(result)} rows to {output}")
+
+@app.command()
+def search(
+    query: str = typer.Argument(..., help='FTS5 query, e.g. pytorch, "pyth*", tags:rust, "company:google AND title:engineer"'),
+    site: Optional[str] = typer.Option(None, "--site", help="Only this domain"),
+    field: Optional[str] = typer.Option(None, help="Only this field (title, skills, tags, company, address)"),
+    limit: int = typer.Option(20, help="Maximum results"),
+    rank: bool = typer.Option(False, help="Order by relevance (BM25) instead of most recent")
+):
+    """Search scraped items across domains with the full-text index"""
+    import time
+    from utils.search_index import SearchIndex, SEARCH_FIELDS
+
+    started = time.perf_counter()
+    try:
+        results = SearchIndex().search(query, domain=site, field=field, limit=limit, rank=rank)
+    except Exception as e:
+        logger.error(f"Search failed: {e}")
+        return
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    for result in results:
+        title = next((result[c] for c in SEARCH_FIELDS['title'] if result.get(c) not in (None, "N/A")), "N/A")
+        typer.echo(f"[{result['domain']}] {title}  {result.get('url', '')}")
+    logger.info(f"{len(results)} results in {elapsed_ms:.2f} ms")
+
+@app.command("profile-selectors")
+def profile_selectors(
+    site: Optional[str] = typer.Argument(None, help="Domain to show (default: all)"),
+    reset: bool = typer.Option(False, help="Forget the collected stats")
+):
+    """Show hit rate and time per selector and field, in the order the extractor tries them"""
+    from scrapers.selector_profile import SelectorProfiler
+
+    if site and site not in DOMAINS:
+        logger.error(f"Domain {site} not supported. Available: {list(DOMAINS.keys())}")
+        return
+    for domain in [site] if site else list(DOMAINS):
+        profile = SelectorProfiler(domain)
+        if reset:
+            profile.reset()
+            logger.info(f"Selector stats for {domain} cleared")
+            continue
+        rows = profile.report()
+        if not rows:
+            logger.warning(f"No selector stats for {domain} yet; they are collected while scraping")
+            continue
+        typer.echo(f"== {domain} ==")
+        typer.echo(pd.DataFrame(rows).set_index(['field', 'rank']).to_string())
+
+@app.command()
+def serve(
+    sites: str = typer.Option(",".join(DOMAINS), help="Comma-separated domains to schedule"),
+    interval: float = typer.Option(360, help="Default recrawl interval in minutes (config 'schedule' overrides)"),
+    jitter: float = typer.Option(0.1, help="Random +/- fraction applied to each interval"),
+    concurrency: int = typer.Option(1, help="Domains crawled at the same time"),
+    stats_port: int = typer.Option(8765, help="Port for the JSON stats endpoint (0 to disable)"),
+    save_db: bool = typer.Option(False, help="Save to database")
+):
+    """Run as a daemon that recrawls domains on a schedule with warm sessions"""
+    import signal
+    from scrapers.scheduler import CrawlScheduler, start_stats_server
+
+    selected = [site.strip() for site in sites.split(',') if site.strip()]
+    unknown = [site for site in selected if site not in DOMAINS]
+    if unknown:
+        logger.error(f"Domains {unknown} not supported. Available: {list(DOMAINS.keys())}")
+        return
+
+    db_manager = None
+    if save_db:
+        from utils.db import DatabaseManager
+        db_manager = DatabaseManager()
+
+    scheduler = CrawlScheduler(
+        selected,
+        scraper_factory=lambda site: load_class(DOMAINS[site]['scraper'], 'scraper')(),
+        run_job=lambda scraper, site: run_scraper(scraper, site, save_db=save_db, db_manager=db_manager),
+        default_interval=interval * 60,
+        jitter=jitter,
+        concurrency=concurrency,
+    )
+    server = start_stats_server(scheduler, port=stats_port) if stats_port else None
+    signal.signal(signal.SIGTERM, lambda *_: scheduler.stop())
+    try:
+        scheduler.serve_forever()
+    except KeyboardInterrupt:
+        scheduler.stop()
+    finally:
+        if server:
+            server.shutdown()
+        logger.info("Scheduler stopped")
+
+@app.command("bench-e2e")
+def bench_e2e(
+    sites: str = typer.Option(",".join(DOMAINS), help="Comma-separated domains to benchmark"),
+    pages: int = typer.Option(5, help="Listing pages per domain"),
+    cards: int = typer.Option(20, help="Items per listing page"),
+    page_kb: float = typer.Option(0.0, help="Pad every page to at least this size"),
+    latency_ms: float = typer.Option(20.0, help="Median server latency"),
+    latency_sigma: float = typer.Option(0.5, help="Log-normal spread of the latency"),
+    error_rate: float = typer.Option(0.0, help="Share of requests answered with 500"),
+    max_rps: float = typer.Option(0.0, help="Server answers 429 above this request rate (0 = off)"),
+    details: bool = typer.Option(True, help="Fetch detail pages where enrichment is configured"),
+    polite: bool = typer.Option(False, help="Keep each domain's configured rate limit and page delay")
+):
+    """Run every scraper against a local synthetic site and report items/sec"""
+    import time
+    from benchmarks.mock_site import MockServer, MockSite, MockSiteConfig
+
+    site = MockSite(MockSiteConfig(
+        pages=pages, cards=cards, page_kb=page_kb, latency_ms=latency_ms,
+        latency_sigma=latency_sigma, error_rate=error_rate, max_rps=max_rps,
+    ))
+    server = MockServer(site).start()
+    logger.info(f"Mock site running on {server.url}")
+
+    rows = []
+    try:
+        for name in [s.strip() for s in sites.split(",") if s.strip()]:
+            if name not in DOMAINS:
+                logger.error(f"Domain {name} not supported. Available: {list(DOMAINS.keys())}")
+                continue
+            scraper = load_class(DOMAINS[name]['scraper'], 'scraper')()
+            scraper.config['base_url'] = f"{server.url}/{name}/"
+            # Measure scraping only: no archive, change state, history or index writes
+            scraper.archive = scraper.changes = scraper.history = scraper.search_index = None
+            if not polite:
+                scraper.rate_limiter = None
+                scraper.config['delay'] = 0
+            if scraper.enricher is not None:
+                if details:
+                    scraper.enricher.cache = None
+                else:
+                    scraper.enricher = None
+
+            started = time.perf_counter()
+            data = scraper.scrape(max_pages=pages)
+            elapsed = time.perf_counter() - started
+            stats = site.stats(name)
+            rows.append({
+                'site': name,
+                'items': len(data),
+                'seconds': round(elapsed, 2),
+                'items_per_sec': round(len(data) / elapsed, 1) if elapsed else 0.0,
+                'requests': stats.get('requests', 0),
+                'detail_pages': stats.get('detail', 0),
+                '429': stats.get('429', 0),
+                '5xx': stats.get('5xx', 0),
+                'MB': round(stats.get('bytes', 0) / 1e6, 2),
+            })
+    finally:
+        server.stop()
+
+    if rows:
+        typer.echo(pd.DataFrame(rows).to_string(index=False))
 
 if __name__ == "__main__":
     app()
\ No newline at end of file
@@ -1,11 +1,14 @@
 import logging
 import json
 import time
+import os
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, Iterator, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from pathlib import Path
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import requests
 from bs4 import BeautifulSoup
 from tenacity import retry, stop_after_attempt, wait_exponential
@@ -14,6 +17,23 @@ import pandas as pd
 import logging
 from loguru import logger
 
+from .pagination import PageResult, Paginator
+from .streaming import DetailStats, stream_select
+from .enrichment import DetailEnricher, EnrichmentConfig, extract_fields
+from .discovery import DiscoveryConfig, SitemapDiscovery
+from .rate_limit import RateLimiter
+from .egress import EgressPool
+from .selector_profile import SelectorProfiler
+from .transport import make_transport, transport_settings
+from .transfer import ACCEPT_ENCODING, BandwidthStats, declared_encoding, wire_bytes
+from utils.page_archive import PageArchive
+from utils.change_tracker import ChangeTracker
+from utils.history_store import HistoryStore
+from utils.search_index import SearchIndex
+from utils.near_duplicates import cluster_items
+from utils.logging_utils import ErrorCounts, request_log
+from utils.backpressure import Stage, memory_budget
+
 # Remove handlers from standard logging so loguru is the only one active
 # logging.getLogger().handlers.clear()
 
@@ -38,14 +58,42 @@ class ScraperConfig:
     delay: float = 1.0
 
 class BaseScraper(ABC):
+    # Search-driven scrapers accept a ``search_term`` in scrape()/page_url()
+    supports_search = False
+    default_search_term: Optional[str] = None
+    
     def __init__(self, domain: str):
         self.domain = domain
         self.config = self._load_config(domain)
         self.session = requests.Session()
         self.session.headers.update({
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+            "Accept-Encoding": ACCEPT_ENCODING
         })
         self.logger = logger.bind(scraper=self.__class__.__name__)
+        self.archive = PageArchive(domain) if self.config.get('archive', True) else None
+        self.changes = ChangeTracker(domain) if self.config.get('change_detection', True) else None
+        self.history = HistoryStore(domain) if self.config.get('history', True) else None
+        self.search_index = SearchIndex() if self.config.get('search_index', True) else None
+        self.detail_stats = DetailStats()
+        self.bandwidth = BandwidthStats()
+        self.rate_limiter = RateLimiter.from_config(self.config)
+        # Proxies / user-agent profiles with their own limits; None sends everything from the session
+        self.egress = EgressPool.from_config(self.config)
+        # HTTP/1.1 through the session, or HTTP/2 multiplexed over one connection per host
+        self.transport_settings = transport_settings(self.config)
+        self.transport = make_transport(self.session, self.config)
+        # Bounded hand-offs between pipeline stages, by name; see pipeline_stats()
+        self.stages: Dict[str, Stage] = {'pages': Stage('pages')}
+        self.enricher = self._make_enricher()
+        # Listing pages or queries this run could not fetch; a run with gaps is not a full snapshot
+        self.coverage_gaps = 0
+        # Called with each page of items as it is scraped (e.g. a streaming DB sink)
+        self.item_sink: Optional[Callable[[List[Dict[str, Any]]], None]] = None
+        self.parse_errors = ErrorCounts(self.logger)
+        self.selector_profile = SelectorProfiler(
+            domain, self.config.get('selectors', {}), adaptive=self.config.get('adaptive_selectors', True)
+        )
         
     def _load_config(self, domain: str) -> Dict[str, Any]:
         """Load configuration from data folder"""
@@ -56,37 +104,324 @@ class BaseScraper(ABC):
         with open(config_path, 'r') as f:
             return json.load(f)
     
+    def reload_config(self):
+        """Re-read the domain config, keeping the session and its connection pool"""
+        self.config = self._load_config(self.domain)
+        self.rate_limiter = RateLimiter.from_config(self.config)
+        self.egress = EgressPool.from_config(self.config)
+        settings = transport_settings(self.config)
+        if settings != self.transport_settings:
+            # Type or pool limits edited: open connections are dropped with the old transport
+            self.transport.close()
+            self.transport = make_transport(self.session, self.config)
+            self.transport_settings = settings
+        self.enricher = self._make_enricher()
+    
+    def _make_enricher(self) -> Optional[DetailEnricher]:
+        settings = EnrichmentConfig.from_config(self.config)
+        if not settings.enabled:
+            self.stages.pop('details', None)
+            return None
+        enricher = DetailEnricher(self, settings)
+        self.stages['details'] = enricher.stage
+        return enricher
+    
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
-    def make_request(self, url: str, method: str = "GET", **kwargs) -> Optional[requests.Response]:
-        """Make HTTP request with retry logic"""
+    def make_request(self, url: str, method: str = "GET", kind: str = "page", **kwargs) -> Optional[requests.Response]:
+        """Make HTTP request with retry logic; successful GETs are archived under ``kind``"""
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
         try:
-            response = self.session.request(
-                method, 
-                url, 
-                timeout=self.config.get('timeout', 30),
-                **kwargs
-            )
+            response = self._send(method, url, **kwargs)
             response.raise_for_status()
-            self.logger.info(f"Successfully fetched {url}")
+            # One line per fetch; rate limited in prod log mode
+            dropped = request_log.allow("fetch")
+            if dropped is not None:
+                self.logger.info(f"Successfully fetched {url}" + (f" ({dropped} fetches not logged)" if dropped else ""))
+            if not kwargs.get('stream'):
+                body = response.content
+                self.bandwidth.add(wire_bytes(response, len(body)), len(body),
+                                   response.headers.get('Content-Encoding'))
+                if self.archive is not None and method == "GET":
+                    self._archive_bytes(url, body, kind, response.status_code, declared_encoding(response))
             return response
         except requests.RequestException as e:
             self.logger.error(f"Failed to fetch {url}: {e}")
             return None
     
-    def parse_html(self, html_content: str) -> BeautifulSoup:
-        """Parse HTML content with BeautifulSoup"""
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send one request, through the healthiest egress exit when a pool is configured.
+
+        A connection error or an exit-level failure (403/407/429/5xx) is
+        retried on another exit, up to ``egress.retries`` times. Other errors
+        (e.g. too many redirects) are raised at once, counted as a failure of the exit.
+        """
+        timeout = self.config.get('timeout', 30)
+        if self.egress is None:
+            return self.transport.request(method, url, timeout=timeout, **kwargs)
+        tried = []
+        for attempt in range(self.egress.retries + 1):
+            exit = self.egress.acquire(avoid=tried)
+            tried.append(exit)
+            started = time.monotonic()
+            # Any exception counts against the exit, and the exit is always released
+            failed = True
+            try:
+                response = self.transport.request(method, url, timeout=timeout, **exit.request_kwargs(kwargs))
+                failed = self.egress.is_failure(response.status_code)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.egress.retries:
+                    raise
+                continue
+            finally:
+                self.egress.release(exit, time.monotonic() - started, failed)
+            if not failed or attempt == self.egress.retries:
+                return response
+            self.logger.debug(f"{url} failed with {response.status_code} via {exit.name}; retrying on another exit")
+            response.close()
+    
+    def _archive_bytes(self, url: str, body: bytes, kind: str, status: int, encoding: Optional[str]):
+        try:
+            self.archive.store(url, body, kind=kind, status=status, encoding=encoding)
+        except Exception as e:
+            self.logger.warning(f"Could not archive {url}: {e}")
+    
+    def stream_select(self, url: str, selectors: List[str]) -> List[Any]:
+        """Stream a detail page until the first selector matches and return the matches"""
+        streaming = self.config.get('streaming', {})
+        elems, stats = stream_select(
+            self, url, selectors,
+            chunk_size=streaming.get('chunk_size', 16384),
+        )
+        self.detail_stats.add(stats)
+        self.logger.debug(
+            f"Streamed {url}: {stats.bytes_read} bytes read"
+            f"{f' of {stats.content_length}' if stats.content_length else ''}, "
+            f"{stats.parse_seconds * 1000:.1f} ms parsing, early exit: {stats.early_exit}"
+        )
+        return elems
+    
+    def parse_html(self, html_content, encoding: Optional[str] = None) -> BeautifulSoup:
+        """Parse HTML content (str, or bytes in ``encoding``) with BeautifulSoup"""
+        if isinstance(html_content, bytes) and encoding:
+            return BeautifulSoup(html_content, 'lxml', from_encoding=encoding)
         return BeautifulSoup(html_content, 'lxml')
     
+    def parse_response(self, response: requests.Response) -> BeautifulSoup:
+        """Parse a response from its raw bytes using the declared encoding.
+        
+        Avoids ``response.text``, which keeps a decoded copy of the page and,
+        when the server sends no charset, decodes text/* as ISO-8859-1 (garbling
+        UTF-8 pages) or runs charset detection over the whole body for other types.
+        """
+        return self.parse_html(response.content, encoding=declared_encoding(response) or 'utf-8')
+    
+    def select(self, elem, selector, field: Optional[str] = None) -> List[Any]:
+        """``elem.select`` through the selector profiler (alternatives tried most-likely first)"""
+        return self.selector_profile.select(elem, selector, field)
+    
+    def select_one(self, elem, selector, field: Optional[str] = None):
+        """``elem.select_one`` through the selector profiler"""
+        return self.selector_profile.select_one(elem, selector, field)
+    
+    def log_transfer_stats(self) -> Dict[str, Any]:
+        """Log compressed vs. uncompressed bytes fetched for this domain, the transport's connection
+        counts and per-exit health with an egress pool"""
+        summary = self.bandwidth.summary()
+        self.logger.info(f"Transfer stats for {self.domain}: {summary}")
+        self.logger.info(f"Transport {self.transport.stats()}")
+        if self.egress is not None:
+            for exit_stats in self.egress.stats():
+                self.logger.info(f"Egress {exit_stats}")
+        return summary
+    
+    def pipeline_stats(self) -> Dict[str, Any]:
+        """Current depth, bytes held and time producers spent blocked, per stage, plus the memory budget"""
+        return {**{name: stage.stats() for name, stage in self.stages.items()}, 'memory': memory_budget().stats()}
+    
+    def log_pipeline_stats(self) -> Dict[str, Any]:
+        stats = self.pipeline_stats()
+        self.logger.info(f"Pipeline stages for {self.domain}: {stats}")
+        return stats
+    
+    def paginate(self, build_url: Callable[[int], str],
+                 parse_page: Callable[[BeautifulSoup], List[Dict[str, Any]]],
+                 max_pages: int) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        """Yield (page, items) for listing pages, stopping at the detected last page"""
+        pages = Paginator(self, build_url, parse_page).pages(max_pages)
+        # With enrichment configured, items reach the sink from enrich() once complete
+        if self.item_sink is None or self.enricher is not None:
+            return pages
+        return self._tee_pages(pages)
+    
+    def _tee_pages(self, pages: Iterator[Tuple[int, List[Dict[str, Any]]]]) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        for page, items in pages:
+            self.item_sink(items)
+            yield page, items
+    
+    def page_url(self, page: int, **params) -> str:
+        """Build the listing URL for a page number"""
+        raise NotImplementedError(f"{self.__class__.__name__} does not support page tasks")
+    
+    def parse_page(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
+        """Parse the items of a single listing page"""
+        raise NotImplementedError(f"{self.__class__.__name__} does not support page tasks")
+    
+    def fetch_page(self, page: int, **params) -> PageResult:
+        """Fetch and parse one listing page, used by queue workers"""
+        paginator = Paginator(self, lambda p: self.page_url(p, **params), self.parse_page)
+        return paginator.fetch_page(page)
+    
+    def detail_urls(self, items: List[Dict[str, Any]]) -> List[str]:
+        """Detail pages to follow for freshly parsed listing items"""
+        if self.enricher is None:
+            return []
+        base_url = self.config.get('base_url')
+        return [
+            item['url'] for item in items
+            if str(item.get('url', '')).startswith('http') and item['url'] != base_url
+        ]
+    
+    def enrich(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Fetch detail pages for items and merge their fields, if enrichment is configured"""
+        if self.enricher is None:
+            return items
+        items = self.enricher.enrich(items)
+        if self.item_sink is not None:
+            self.item_sink(items)
+        return items
+    
+    def fetch_detail(self, url: str) -> Dict[str, Any]:
+        """Fetch a detail page and return the fields to merge into its item"""
+        response = self.make_request(url, kind="detail")
+        if not response:
+            return {}
+        return self.parse_detail(self.parse_response(response))
+    
+    def parse_detail(self, soup: BeautifulSoup) -> Dict[str, Any]:
+        """Extract the configured enrichment fields from a detail page"""
+        fields = self.config.get('enrichment', {}).get('fields')
+        if not fields:
+            raise NotImplementedError(f"{self.__class__.__name__} has no detail fields configured")
+        return extract_fields(soup, fields, self.selector_profile)
+    
+    def discover(self) -> List[Dict[str, Any]]:
+        """Scrape item pages listed in the site's sitemaps instead of walking listing pages.
+
+        Only URLs that are new or whose ``lastmod`` changed are fetched; items
+        of the other sitemap URLs are carried over from the copies stored with
+        them at their last fetch, so the result is still a full snapshot.
+        """
+        settings = DiscoveryConfig.from_config(self.config)
+        discovery = SitemapDiscovery(self, settings)
+        try:
+            known = discovery.refresh()
+            urls = discovery.changed_urls()
+            self.logger.info(
+                f"Discovery: {known} URLs in sitemaps ({discovery.sitemaps_fetched} sitemaps read, "
+                f"{discovery.sitemaps_skipped} unchanged), {len(urls)} to fetch"
+            )
+
+            items, fetched = [], {}
+            with ThreadPoolExecutor(max_workers=settings.concurrency) as executor:
+                futures = {executor.submit(self.fetch_item, url): url for url in urls}
+                for future in as_completed(futures):
+                    url = futures[future]
+                    try:
+                        item = future.result()
+                    except Exception as e:
+                        self.logger.error(f"Item fetch failed for {url}: {e}")
+                        continue
+                    if item:
+                        items.append(item)
+                        fetched[url] = item
+                        if self.item_sink is not None:
+                            self.item_sink([item])
+            discovery.mark_fetched(fetched)
+            items.extend(discovery.stored_items(exclude=list(fetched)))
+            return items
+        finally:
+            discovery.close()
+    
+    def fetch_item(self, url: str) -> Optional[Dict[str, Any]]:
+        """Fetch one discovered item page and parse it"""
+        response = self.make_request(url, kind="detail")
+        if response is None:
+            return None
+        return self.parse_item(self.parse_response(response), url)
+    
+    def parse_item(self, soup: BeautifulSoup, url: str) -> Dict[str, Any]:
+        """Build an item from its own page using the ``discovery.fields`` config"""
+        fields = self.config.get('discovery', {}).get('fields')
+        if not fields:
+            raise NotImplementedError(f"{self.__class__.__name__} has no discovery fields configured")
+        return {**extract_fields(soup, fields, self.selector_profile), 'url': url, 'scraped_timestamp': pd.Timestamp.now()}
+    
     @abstractmethod
     def scrape(self, *args, **kwargs) -> List[Dict[str, Any]]:
         """Main scraping method to be implemented by subclasses"""
         pass
     
+    def search_terms(self) -> List[str]:
+        """Search terms from the config (``search_terms`` list or ``search_query``)"""
+        terms = self.config.get('search_terms') or [self.config.get('search_query') or self.default_search_term]
+        return [term for term in terms if term]
+    
+    def scrape_queries(self, search_terms: List[str], max_pages: int = None,
+                       concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Run scrape() for several search terms concurrently and merge the results by URL.
+        
+        All queries share this scraper's session and rate limiter. Each item
+        gets a ``matched_queries`` field listing every query that returned it.
+        """
+        if not self.supports_search:
+            raise ValueError(f"{self.__class__.__name__} does not take search terms")
+        
+        search_terms = list(dict.fromkeys(search_terms))
+        concurrency = concurrency or self.config.get('query_concurrency', 3)
+        results: Dict[str, List[Dict[str, Any]]] = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(search_terms)))) as executor:
+            futures = {
+                executor.submit(self.scrape, max_pages=max_pages, search_term=term): term
+                for term in search_terms
+            }
+            for future in as_completed(futures):
+                term = futures[future]
+                try:
+                    results[term] = future.result()
+                except Exception as e:
+                    self.logger.error(f"Query '{term}' failed: {e}")
+                    results[term] = []
+                    self.coverage_gaps += 1
+        
+        merged: Dict[str, Dict[str, Any]] = {}
+        matches: Dict[str, List[str]] = {}
+        # Merge in the order the terms were given so output is deterministic
+        for term in search_terms:
+            for item in results[term]:
+                url = item.get('url')
+                key = url if url and url not in ("N/A", self.config.get('base_url')) else f"{term}#{id(item)}"
+                if key not in merged:
+                    merged[key] = item
+                    matches[key] = []
+                if term not in matches[key]:
+                    matches[key].append(term)
+        
+        for key, item in merged.items():
+            item['matched_queries'] = ", ".join(matches[key])
+        
+        total = sum(len(items) for items in results.values())
+        self.logger.info(
+            f"{len(search_terms)} queries returned {total} items, {len(merged)} unique after URL dedupe"
+        )
+        return list(merged.values())
+    
     def save_data(self, data: List[Dict[str, Any]], filename: str):
         """Save scraped data in multiple formats"""
         output_dir = Path(f"outputs/scrapped_data/{self.domain}")
         output_dir.mkdir(parents=True, exist_ok=True)
         
+        self.mark_near_duplicates(data)
         df = pd.DataFrame(data)
         
         # Save in multiple formats
@@ -96,7 +431,78 @@ class BaseScraper(ABC):
         
         self.logger.info(f"Data saved to {output_dir}/{filename} in multiple formats")
     
+    def mark_near_duplicates(self, data: List[Dict[str, Any]]) -> Optional[Dict[str, int]]:
+        """Write a ``cluster_id`` into each item, shared by near-duplicate listings"""
+        settings = self.config.get('near_duplicates')
+        if not settings or not data:
+            return None
+        summary = cluster_items(
+            data, settings['fields'],
+            threshold=settings.get('threshold', 0.8),
+            num_perm=settings.get('num_perm', 128),
+            shingle_size=settings.get('shingle_size', 4),
+        )
+        self.logger.info(
+            f"Near-duplicates: {summary['items']} items in {summary['clusters']} clusters "
+            f"({summary['duplicates']} duplicates)"
+        )
+        return summary
+    
+    def record_changes(self, data: List[Dict[str, Any]], full: bool = True) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+        """Compare this run with the previous one and write the delta feed.
+
+        The baseline is not moved here: call ``commit_changes`` once the delta
+        has been written downstream, so a failed write is detected again next run.
+        """
+        if self.changes is None:
+            return None
+        
+        delta = self.changes.diff(data, full=full)
+        
+        delta_dir = Path(f"outputs/deltas/{self.domain}")
+        delta_dir.mkdir(parents=True, exist_ok=True)
+        run_at = pd.Timestamp.now()
+        # Microseconds and pid: runs of a domain in the same second must not overwrite each other's delta
+        delta_path = delta_dir / f"delta_{run_at.strftime('%Y%m%d_%H%M%S_%f')}_{os.getpid()}.json"
+        with open(delta_path, 'w', encoding='utf-8') as f:
+            json.dump({'domain': self.domain, 'run_at': run_at, **delta}, f, indent=2, default=str)
+        
+        self.logger.info(
+            f"Delta: {len(delta['new'])} new, {len(delta['changed'])} changed, "
+            f"{len(delta['removed'])} removed; {self.changes.pages_skipped} unchanged pages skipped. "
+            f"Saved to {delta_path}"
+        )
+        return delta
+    
+    def commit_changes(self, data: List[Dict[str, Any]], full: bool = True):
+        """Make this run the change-detection baseline (only its own items for a partial run)"""
+        if self.changes is not None:
+            self.changes.commit(data, full=full)
+    
+    def record_history(self, data: List[Dict[str, Any]]):
+        """Append this run to the domain's partitioned history"""
+        if self.history is None or not data:
+            return
+        path = self.history.append(data)
+        self.logger.info(f"History snapshot of {len(data)} items saved to {path}")
+    
+    def index_items(self, data: List[Dict[str, Any]], full: bool = True):
+        """Bring the full-text search index up to date with this run.
+
+        Items missing from ``data`` are only removed when ``full`` says the run
+        covered the whole domain; partial runs add and update items only.
+        """
+        if self.search_index is None or not data:
+            return
+        stats = self.search_index.update(self.domain, data, prune=full)
+        self.logger.info(
+            f"Search index: {stats['added']} added, {stats['updated']} updated, "
+            f"{stats['removed']} removed, {stats['unchanged']} unchanged"
+        )
+    
     def __del__(self):
         """Cleanup session"""
+        if hasattr(self, 'transport'):
+            self.transport.close()
         if hasattr(self, 'session'):
             self.session.close()
\ No newline at end of file
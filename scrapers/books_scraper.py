@@ -2,8 +2,8 @@ from typing import List, Dict, Any
 from .base_scraper import BaseScraper
 from bs4 import BeautifulSoup
 import re
+from urllib.parse import urljoin
 from pathlib import Path
-import time
 import pandas as pd
 
 class BooksScraper(BaseScraper):
@@ -16,27 +16,27 @@ class BooksScraper(BaseScraper):
         
         pages_to_scrape = max_pages or self.config.get('pages', 5)
         
-        for page in range(1, pages_to_scrape + 1):
-            url = f"{self.config['base_url']}catalogue/page-{page}.html"
-            response = self.make_request(url)
-            
-            if not response:
-                continue
-            
-            soup = self.parse_html(response.text)
-            books = self._parse_books_page(soup)
+        for page, books in self.paginate(
+            lambda page: self.page_url(page),
+            self.parse_page,
+            pages_to_scrape
+        ):
             all_books.extend(books)
-            
             self.logger.info(f"Scraped page {page}: {len(books)} books")
-            time.sleep(self.config.get('delay', 1.0))
         
-        return all_books
+        return self.enrich(all_books)
+    
+    def page_url(self, page: int) -> str:
+        return f"{self.config['base_url']}catalogue/page-{page}.html"
+    
+    def parse_page(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
+        return self._parse_books_page(soup)
     
     def _parse_books_page(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
         """Parse a single page of books"""
         books = []
         selectors = self.config['selectors']
-        book_elements = soup.select(selectors['book'])
+        book_elements = self.select(soup, selectors['book'])
         
         for book_elem in book_elements:
             try:
@@ -50,34 +50,49 @@ class BooksScraper(BaseScraper):
                 }
                 books.append(book)
             except Exception as e:
-                self.logger.error(f"Error parsing book: {e}")
+                self.parse_errors.record(selectors['book'], e)
                 continue
         
         return books
     
     def _extract_text(self, elem, selector: str) -> str:
-        selected = elem.select_one(selector)
+        selected = self.select_one(elem, selector)
         return selected.text.strip() if selected else "N/A"
     
     def _extract_price(self, elem, selector: str) -> float:
-        price_text = self._extract_text(elem, selector)
+        return self._parse_price(self._extract_text(elem, selector))
+    
+    def _parse_price(self, price_text: str) -> float:
         try:
             return float(re.sub(r'[^\d.]', '', price_text))
         except:
             return 0.0
     
     def _extract_rating(self, elem, selector: str) -> str:
-        rating_elem = elem.select_one(selector)
+        rating_elem = self.select_one(elem, selector)
         if rating_elem:
-            rating_classes = rating_elem.get('class', [])
-            return rating_classes[1] if len(rating_classes) > 1 else 'No rating'
+            return self._parse_rating(rating_elem.get('class', []))
         return 'No rating'
     
+    def _parse_rating(self, rating_classes) -> str:
+        if isinstance(rating_classes, str):
+            # A class attribute read as text, e.g. "star-rating Three"
+            rating_classes = rating_classes.split()
+        return rating_classes[1] if len(rating_classes) > 1 else 'No rating'
+    
+    def parse_item(self, soup: BeautifulSoup, url: str) -> Dict[str, Any]:
+        """Book from its own page (sitemap discovery), with price and rating as on listing pages"""
+        book = super().parse_item(soup, url)
+        book['price'] = self._parse_price(book.get('price', 'N/A'))
+        book['rating'] = self._parse_rating(book.get('rating', 'N/A'))
+        return book
+    
     def _extract_url(self, elem, selector: str) -> str:
-        link_elem = elem.select_one(selector)
+        link_elem = self.select_one(elem, selector)
         if link_elem and link_elem.get('href'):
             relative_url = link_elem['href']
             if relative_url.startswith('http'):
                 return relative_url
-            return f"{self.config['base_url']}{relative_url}"
+            # Listing pages live under catalogue/, so hrefs are relative to it
+            return urljoin(f"{self.config['base_url']}catalogue/", relative_url)
         return "N/A"
\ No newline at end of file
@@ -0,0 +1,274 @@
+import gzip
+import json
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urljoin
+from urllib.robotparser import RobotFileParser
+
+from lxml import etree
+
+STATE_DIR = Path("outputs/state")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sitemaps (
+    url TEXT PRIMARY KEY,
+    lastmod TEXT,
+    fetched_at REAL NOT NULL,
+    parent TEXT
+);
+CREATE TABLE IF NOT EXISTS urls (
+    loc TEXT PRIMARY KEY,
+    sitemap TEXT NOT NULL,
+    lastmod TEXT,
+    fetched_lastmod TEXT,
+    fetched_at REAL,
+    item TEXT
+);
+CREATE INDEX IF NOT EXISTS urls_sitemap ON urls (sitemap);
+"""
+
+
+@dataclass
+class DiscoveryConfig:
+    """Sitemap discovery settings read from the ``discovery`` block of a domain config"""
+    enabled: bool = False
+    sitemaps: List[str] = field(default_factory=list)
+    url_pattern: Optional[str] = None
+    max_urls: Optional[int] = None
+    concurrency: int = 5
+    fields: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "DiscoveryConfig":
+        settings = config.get('discovery', {})
+        return cls(
+            enabled=bool(settings.get('enabled', False)),
+            sitemaps=list(settings.get('sitemaps', [])),
+            url_pattern=settings.get('url_pattern'),
+            max_urls=settings.get('max_urls'),
+            concurrency=max(1, int(settings.get('concurrency', config.get('max_workers', 5)))),
+            fields=settings.get('fields', {}),
+        )
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+
+def parse_sitemap(body: bytes) -> Tuple[str, List[Tuple[str, Optional[str]]]]:
+    """Kind (``sitemapindex`` or ``urlset``) and (loc, lastmod) entries of a sitemap body.
+
+    Gzipped bodies are detected by their magic bytes, since servers often send
+    ``.xml.gz`` files without a Content-Encoding header.
+    """
+    if body[:2] == b"\x1f\x8b":
+        body = gzip.decompress(body)
+    root = etree.fromstring(body, parser=etree.XMLParser(recover=True, huge_tree=True, resolve_entities=False))
+    if root is None:
+        return "urlset", []
+    entries = []
+    for node in root:
+        if not isinstance(node.tag, str):
+            continue
+        loc = lastmod = None
+        for child in node:
+            if not isinstance(child.tag, str):
+                continue
+            name = _local(child.tag)
+            if name == "loc":
+                loc = (child.text or "").strip()
+            elif name == "lastmod":
+                lastmod = (child.text or "").strip() or None
+        if loc:
+            entries.append((loc, lastmod))
+    return _local(root.tag), entries
+
+
+class SitemapDiscovery:
+    """Enumerate item URLs from robots.txt and sitemaps, remembering what was fetched.
+
+    Sitemap indexes are followed recursively; a child sitemap whose index
+    ``lastmod`` is unchanged since the last run is not downloaded again and
+    its cached URLs are reused. Sitemaps no longer reachable from the roots are
+    forgotten with their URLs after each walk. ``changed_urls`` returns only the URLs that are
+    new or whose ``lastmod`` moved since they were last fetched. The item
+    parsed from each URL is kept with it, so unchanged URLs can be carried
+    over without fetching them again.
+    """
+
+    def __init__(self, scraper, settings: Optional[DiscoveryConfig] = None, root: Optional[Path] = None):
+        self.scraper = scraper
+        self.settings = settings or DiscoveryConfig.from_config(scraper.config)
+        directory = Path(root or STATE_DIR) / scraper.domain
+        directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(directory / "sitemaps.db"), timeout=30, check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(urls)")]
+        if 'item' not in columns:
+            # Created before items were stored: those URLs are fetched again once
+            self.conn.execute("ALTER TABLE urls ADD COLUMN item TEXT")
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(sitemaps)")]
+        if 'parent' not in columns:
+            self.conn.execute("ALTER TABLE sitemaps ADD COLUMN parent TEXT")
+            # Stored sitemaps have no parent yet: read them all once so pruning knows what they list
+            self.conn.execute("UPDATE sitemaps SET lastmod = NULL")
+            self.conn.commit()
+        self.robots: Optional[RobotFileParser] = None
+        self.sitemaps_fetched = 0
+        self.sitemaps_skipped = 0
+        self._reached: set = set()
+        self._roots_read = True
+
+    def _fetch(self, url: str) -> Optional[bytes]:
+        response = self.scraper.make_request(url, kind="sitemap")
+        return response.content if response is not None else None
+
+    def sitemap_roots(self) -> List[str]:
+        """Configured sitemaps, else those listed in robots.txt, else ``/sitemap.xml``"""
+        base_url = self.scraper.config['base_url']
+        body = self._fetch(urljoin(base_url, "/robots.txt"))
+        if body is not None:
+            lines = body.decode('utf-8', errors='replace').splitlines()
+            self.robots = RobotFileParser()
+            self.robots.parse(lines)
+            listed = [
+                line.split(":", 1)[1].strip() for line in lines
+                if line.lower().startswith("sitemap:")
+            ]
+        else:
+            listed = []
+        return self.settings.sitemaps or listed or [urljoin(base_url, "/sitemap.xml")]
+
+    def refresh(self) -> int:
+        """Walk all sitemaps and update the URL table; returns the number of URLs known"""
+        self._reached = set()
+        self._roots_read = True
+        for root in self.sitemap_roots():
+            self._walk(root, lastmod=None, depth=0)
+        if self._roots_read:
+            self._prune()
+        else:
+            self.scraper.logger.warning("A root sitemap could not be read, keeping sitemaps not reached this run")
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM urls").fetchone()[0]
+
+    def _walk(self, url: str, lastmod: Optional[str], depth: int, parent: Optional[str] = None):
+        if depth > 5:
+            self.scraper.logger.warning(f"Sitemap nesting too deep at {url}")
+            return
+        with self._lock:
+            row = self.conn.execute("SELECT lastmod FROM sitemaps WHERE url = ?", (url,)).fetchone()
+        if row is not None and lastmod is not None and row[0] == lastmod:
+            self.sitemaps_skipped += 1
+            self._reach_subtree(url)
+            return
+
+        body = self._fetch(url)
+        try:
+            kind, entries = parse_sitemap(body) if body is not None else (None, [])
+        except (OSError, etree.XMLSyntaxError) as e:
+            self.scraper.logger.error(f"Unreadable sitemap {url}: {e}")
+            kind = None
+        if kind is None:
+            # Keep what is stored for it until it can be read again
+            self._reach_subtree(url)
+            if depth == 0:
+                self._roots_read = False
+            return
+        self.sitemaps_fetched += 1
+        self._reached.add(url)
+
+        if kind == "sitemapindex":
+            for child, child_lastmod in entries:
+                self._walk(child, child_lastmod, depth + 1, parent=url)
+        else:
+            self._store_urls(url, entries)
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO sitemaps (url, lastmod, fetched_at, parent) VALUES (?, ?, ?, ?)",
+                (url, lastmod, time.time(), parent),
+            )
+            self.conn.commit()
+
+    def _reach_subtree(self, url: str):
+        """Mark a sitemap that was not read this run, and the sitemaps stored below it, as still listed"""
+        sql = (
+            "WITH RECURSIVE tree(url) AS (SELECT ? UNION SELECT sitemaps.url FROM sitemaps "
+            "JOIN tree ON sitemaps.parent = tree.url) SELECT url FROM tree"
+        )
+        with self._lock:
+            self._reached.update(row[0] for row in self.conn.execute(sql, (url,)))
+
+    def _prune(self):
+        """Forget sitemaps no longer listed under the roots, with their URLs and items"""
+        reached = json.dumps(sorted(self._reached))
+        with self._lock:
+            dropped = self.conn.execute(
+                "DELETE FROM urls WHERE sitemap NOT IN (SELECT value FROM json_each(?))", (reached,)
+            ).rowcount
+            self.conn.execute("DELETE FROM sitemaps WHERE url NOT IN (SELECT value FROM json_each(?))", (reached,))
+            self.conn.commit()
+        if dropped:
+            self.scraper.logger.info(f"Dropped {dropped} URLs of sitemaps no longer listed")
+
+    def _store_urls(self, sitemap: str, entries: List[Tuple[str, Optional[str]]]):
+        pattern = re.compile(self.settings.url_pattern) if self.settings.url_pattern else None
+        rows = [
+            (loc, sitemap, lastmod) for loc, lastmod in entries
+            if (pattern is None or pattern.search(loc))
+            and (self.robots is None or self.robots.can_fetch(self.scraper.session.headers.get('User-Agent', '*'), loc))
+        ]
+        with self._lock:
+            # A re-read sitemap is authoritative for its URLs: drop the ones it no longer lists
+            self.conn.execute("DELETE FROM urls WHERE sitemap = ? AND loc NOT IN (SELECT value FROM json_each(?))",
+                              (sitemap, json.dumps([loc for loc, _, _ in rows])))
+            self.conn.executemany(
+                "INSERT INTO urls (loc, sitemap, lastmod) VALUES (?, ?, ?) "
+                "ON CONFLICT(loc) DO UPDATE SET sitemap = excluded.sitemap, lastmod = excluded.lastmod",
+                rows,
+            )
+            self.conn.commit()
+
+    def all_urls(self) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self.conn.execute("SELECT loc FROM urls ORDER BY loc")]
+
+    def changed_urls(self) -> List[str]:
+        """URLs never fetched, with no stored item, or whose ``lastmod`` differs from (or is missing since)
+        the last fetch"""
+        sql = (
+            "SELECT loc FROM urls WHERE fetched_at IS NULL OR item IS NULL OR lastmod IS NULL "
+            "OR fetched_lastmod IS NULL OR lastmod != fetched_lastmod ORDER BY loc"
+        )
+        with self._lock:
+            urls = [row[0] for row in self.conn.execute(sql)]
+        if self.settings.max_urls:
+            urls = urls[:self.settings.max_urls]
+        return urls
+
+    def mark_fetched(self, items: Dict[str, Dict[str, Any]]):
+        """Record the items fetched for these URLs"""
+        now = time.time()
+        with self._lock:
+            self.conn.executemany(
+                "UPDATE urls SET fetched_lastmod = lastmod, fetched_at = ?, item = ? WHERE loc = ?",
+                [(now, json.dumps(item, default=str), url) for url, item in items.items()],
+            )
+            self.conn.commit()
+
+    def stored_items(self, exclude: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Items last fetched for the URLs still listed in the sitemaps, except ``exclude``"""
+        skip = set(exclude or [])
+        with self._lock:
+            rows = self.conn.execute("SELECT loc, item FROM urls WHERE item IS NOT NULL ORDER BY loc").fetchall()
+        return [json.loads(item) for loc, item in rows if loc not in skip]
+
+    def close(self):
+        self.conn.close()
+
@@ -2,10 +2,12 @@ from typing import List, Dict, Any
 from .base_scraper import BaseScraper
 from bs4 import BeautifulSoup
 import re
-import time
 import pandas as pd
 
 class EcommerceScraper(BaseScraper):
+    supports_search = True
+    default_search_term = "laptop"
+    
     def __init__(self):
         super().__init__("ecommerce")
     
@@ -15,27 +17,27 @@ class EcommerceScraper(BaseScraper):
         
         pages_to_scrape = max_pages or self.config.get('pages', 3)
         
-        for page in range(1, pages_to_scrape + 1):
-            url = f"{self.config['base_url']}s?k={search_term}&page={page}"
-            response = self.make_request(url)
-            
-            if not response:
-                continue
-            
-            soup = self.parse_html(response.text)
-            products = self._parse_products_page(soup)
+        for page, products in self.paginate(
+            lambda page: self.page_url(page, search_term=search_term),
+            self.parse_page,
+            pages_to_scrape
+        ):
             all_products.extend(products)
-            
             self.logger.info(f"Scraped page {page}: {len(products)} products")
-            time.sleep(self.config.get('delay', 1.0))
         
-        return all_products
+        return self.enrich(all_products)
+    
+    def page_url(self, page: int, search_term: str = "laptop") -> str:
+        return f"{self.config['base_url']}s?k={search_term}&page={page}"
+    
+    def parse_page(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
+        return self._parse_products_page(soup)
     
     def _parse_products_page(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
         """Parse a single page of products"""
         products = []
         selectors = self.config['selectors']
-        product_elements = soup.select(selectors['product'])
+        product_elements = self.select(soup, selectors['product'])
         
         for product_elem in product_elements:
             try:
@@ -49,17 +51,17 @@ class EcommerceScraper(BaseScraper):
                 }
                 products.append(product)
             except Exception as e:
-                self.logger.error(f"Error parsing product: {e}")
+                self.parse_errors.record(selectors['product'], e)
                 continue
         
         return products
     
     def _extract_text(self, elem, selector: str) -> str:
-        selected = elem.select_one(selector)
+        selected = self.select_one(elem, selector)
         return selected.text.strip() if selected else "N/A"
     
     def _extract_price(self, elem, selector: str) -> str:
-        price_elem = elem.select_one(selector)
+        price_elem = self.select_one(elem, selector)
         if price_elem:
             price_text = price_elem.text.strip()
             # Extract price information
@@ -68,7 +70,7 @@ class EcommerceScraper(BaseScraper):
         return "N/A"
     
     def _extract_rating(self, elem, selector: str) -> str:
-        rating_elem = elem.select_one(selector)
+        rating_elem = self.select_one(elem, selector)
         if rating_elem:
             rating_text = rating_elem.text.strip()
             # Extract rating information
@@ -1,14 +1,20 @@
 # scrapers/education_scraper.py
 from typing import List, Dict, Any, Optional
 from .base_scraper import BaseScraper
+from .streaming import FetchStats
 from bs4 import BeautifulSoup
 import re
-import time
 import pandas as pd
 from urllib.parse import urljoin
-import concurrent.futures
+import time
+
+# Tried after the configured instructor selector (reordered by hit rate, see SelectorProfiler)
+INSTRUCTOR_FALLBACKS = ["a[href*='/instructor/'] span", "span[class*='instructor']"]
 
 class EducationScraper(BaseScraper):
+    supports_search = True
+    default_search_term = "data science"
+
     def __init__(self):
         super().__init__("education")
         
@@ -16,20 +22,15 @@ class EducationScraper(BaseScraper):
         """Scrape education data from multiple pages (search results + instructor from detail page)."""
         all_courses: List[Dict[str, Any]] = []
         pages_to_scrape = max_pages or self.config.get("pages", 1)
-        max_workers = self.config.get("max_workers", 5)
         
         # Track seen URLs across ALL pages
         seen_urls = set()
 
-        for page in range(1, pages_to_scrape + 1):
-            # build search URL safely
-            url = f"{self.config['base_url'].rstrip('/')}/search?query={search_term}&page={page}"
-            response = self.make_request(url)
-            if not response:
-                continue
-
-            soup = self.parse_html(response.text)
-            courses_on_page = self._parse_courses_page(soup)
+        for page, courses_on_page in self.paginate(
+            lambda page: self.page_url(page, search_term=search_term),
+            self.parse_page,
+            pages_to_scrape
+        ):
             self.logger.info(f"Found {len(courses_on_page)} raw course candidates on page {page}")
 
             # Deduplicate against all previously seen URLs
@@ -44,31 +45,13 @@ class EducationScraper(BaseScraper):
                 seen_urls.add(course_url)
                 filtered.append(course)
 
-            # Fetch instructors in parallel
-            if filtered:
-                with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-                    futures = {
-                        executor.submit(
-                            self._fetch_instructor, 
-                            course["url"], 
-                            self.config["selectors"].get("instructor")
-                        ): course for course in filtered
-                    }
-                    
-                    for future in concurrent.futures.as_completed(futures):
-                        course = futures[future]
-                        try:
-                            instructor = future.result()
-                        except Exception as e:
-                            self.logger.exception(f"Failed to fetch instructor for {course.get('url')}: {e}")
-                            instructor = "N/A"
-                        course["instructor"] = instructor
-                        course["scraped_timestamp"] = pd.Timestamp.now()
+            # Fetch instructors from the detail pages
+            self.enrich(filtered)
 
             all_courses.extend(filtered)
             self.logger.info(f"Scraped page {page}: {len(filtered)} courses (after dedupe)")
-            time.sleep(self.config.get("delay", 1.0))
 
+        self.logger.info(f"Instructor detail pages: {self.detail_stats.summary()}")
         return all_courses
 
     # def scrape(self, max_pages: int = None, search_term: str = "data science") -> List[Dict[str, Any]]:
@@ -133,6 +116,19 @@ class EducationScraper(BaseScraper):
 
     #     return all_courses
 
+    def page_url(self, page: int, search_term: str = "data science") -> str:
+        return f"{self.config['base_url'].rstrip('/')}/search?query={search_term}&page={page}"
+
+    def parse_page(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
+        return self._parse_courses_page(soup)
+
+    def fetch_detail(self, url: str) -> Dict[str, Any]:
+        instructor = self._fetch_instructor(url, self.config["selectors"].get("instructor"))
+        return {"instructor": instructor} if instructor != "N/A" else {}
+
+    def parse_detail(self, soup: BeautifulSoup) -> Dict[str, Any]:
+        return {"instructor": self._extract_instructor(soup, self.config["selectors"].get("instructor"))}
+
     def _parse_courses_page(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
         """Parse search result page and return list of course dicts (instructor left for later)."""
         courses: List[Dict[str, Any]] = []
@@ -146,13 +142,13 @@ class EducationScraper(BaseScraper):
         skills_selector = sel.get("skills", "p.css-vac8rf")
         duration_selector = sel.get("duration", "div.cds-CommonCard-metadata p.css-vac8rf")
 
-        cards = soup.select(card_selector)
+        cards = self.select(soup, card_selector, field="course_card")
         self.logger.debug(f"_parse_courses_page: found {len(cards)} cards with selector '{card_selector}'")
 
         for card in cards:
             try:
                 # Find the link element inside the card (this filters out nav/footer links)
-                link_elem = card.select_one(link_selector)
+                link_elem = self.select_one(card, link_selector, field="link")
                 if not link_elem:
                     # There are many non-course elements — skip
                     continue
@@ -194,7 +190,7 @@ class EducationScraper(BaseScraper):
                 courses.append(course)
 
             except Exception as e:
-                self.logger.exception(f"Error parsing course card: {e}")
+                self.parse_errors.record(card_selector, e)
                 continue
 
         return courses
@@ -202,7 +198,7 @@ class EducationScraper(BaseScraper):
     def _safe_text(self, elem, selector: str) -> str:
         if not elem or not selector:
             return "N/A"
-        sel = elem.select_one(selector)
+        sel = self.select_one(elem, selector)
         if not sel:
             return "N/A"
         return sel.get_text(strip=True)
@@ -210,7 +206,7 @@ class EducationScraper(BaseScraper):
     def _extract_rating(self, elem, selector: str) -> str:
         if not selector:
             return "N/A"
-        sel = elem.select_one(selector)
+        sel = self.select_one(elem, selector, field="rating")
         if not sel:
             return "N/A"
         txt = sel.get_text(strip=True)
@@ -219,7 +215,7 @@ class EducationScraper(BaseScraper):
 
     def _extract_reviews(self, elem, selector: str) -> str:
         # Prefer explicit reviews text (e.g. "42K reviews")
-        sel = elem.select_one(selector) if selector else None
+        sel = self.select_one(elem, selector, field="reviews") if selector else None
         if sel:
             txt = sel.get_text(strip=True)
             # return only the reviews-looking string
@@ -235,7 +231,7 @@ class EducationScraper(BaseScraper):
     def _extract_skills(self, elem, selector: str) -> str:
         if not selector:
             return "N/A"
-        sel = elem.select_one(selector)
+        sel = self.select_one(elem, selector, field="skills")
         if not sel:
             return "N/A"
         txt = sel.get_text(separator=", ", strip=True)
@@ -247,23 +243,38 @@ class EducationScraper(BaseScraper):
         """Fetch instructor(s) from course detail page. Returns 'N/A' on failure."""
         if not course_url:
             return "N/A"
+        if not selector:
+            selector = "p.css-4s48ix span"
         try:
-            response = self.make_request(course_url)
+            if self.config.get("stream_detail", True):
+                # Stop downloading as soon as an instructor element has arrived
+                return self._instructor_names(self.stream_select(course_url, [selector] + INSTRUCTOR_FALLBACKS))
+
+            response = self.make_request(course_url, kind="detail")
             if not response:
                 return "N/A"
-            soup = self.parse_html(response.text)
-            if not selector:
-                selector = "p.css-4s48ix span"
-            # sometimes instructors are in multiple elements
-            elems = soup.select(selector)
-            if not elems:
-                # fallback: try other likely patterns
-                alt = soup.select("a[href*='/instructor/'] span") or soup.select("span[class*='instructor']")
-                elems = alt
-            names = [e.get_text(strip=True) for e in elems if e.get_text(strip=True)]
-            # dedupe and join
-            names = list(dict.fromkeys(names))
-            return ", ".join(names) if names else "N/A"
+            started = time.perf_counter()
+            soup = self.parse_response(response)
+            instructor = self._extract_instructor(soup, selector)
+            self.detail_stats.add(FetchStats(
+                course_url, bytes_read=len(response.content), bytes_decoded=len(response.content),
+                parse_seconds=time.perf_counter() - started, parse_attempts=1
+            ))
+            return instructor
         except Exception as e:
-            self.logger.exception(f"_fetch_instructor error for {course_url}: {e}")
+            self.parse_errors.record(selector, e, context="instructor detail page")
             return "N/A"
+
+    def _extract_instructor(self, soup: BeautifulSoup, selector: Optional[str]) -> str:
+        if not selector:
+            selector = "p.css-4s48ix span"
+        # sometimes instructors are in multiple elements; the profiler tries the
+        # configured alternatives and the fallbacks most-likely first
+        elems = self.select(soup, [selector] + INSTRUCTOR_FALLBACKS, field="instructor")
+        return self._instructor_names(elems)
+
+    def _instructor_names(self, elems) -> str:
+        names = [e.get_text(strip=True) for e in elems if e.get_text(strip=True)]
+        # dedupe and join
+        names = list(dict.fromkeys(names))
+        return ", ".join(names) if names else "N/A"
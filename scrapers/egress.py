@@ -0,0 +1,232 @@
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+from loguru import logger
+
+from .rate_limit import RateLimiter
+
+# Browser identities rotated across exits when the config lists none. Each
+# exit keeps one profile, so a proxy IP always presents the same browser.
+DEFAULT_PROFILES = [
+    {
+        'name': 'chrome-windows',
+        'user_agent': "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+        'headers': {'Accept-Language': "en-US,en;q=0.9"},
+    },
+    {
+        'name': 'firefox-linux',
+        'user_agent': "Mozilla/5.0 (X11; Linux x86_64; rv:125.0) Gecko/20100101 Firefox/125.0",
+        'headers': {'Accept-Language': "en-US,en;q=0.5"},
+    },
+    {
+        'name': 'safari-macos',
+        'user_agent': "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_4) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.4 Safari/605.1.15",
+        'headers': {'Accept-Language': "en-US,en;q=0.9"},
+    },
+]
+
+# Statuses that say more about the exit (blocked, throttled, proxy trouble) than about the URL
+EXIT_FAILURE_STATUSES = {403, 407, 429}
+
+# Weight of the latest request in an exit's latency and error averages
+HEALTH_WEIGHT = 0.2
+
+
+@dataclass
+class Exit:
+    """One way out: a proxy (or a direct connection) with a user-agent profile and its own rate limit"""
+    name: str
+    proxy: Optional[str]
+    profile: Dict[str, Any]
+    limiter: Optional[RateLimiter] = None
+    requests: int = 0
+    failures: int = 0
+    in_flight: int = 0
+    latency: Optional[float] = None
+    error_rate: float = 0.0
+    consecutive_failures: int = 0
+    consecutive_successes: int = 0
+    ejections: int = 0
+    ejected_until: float = 0.0
+    probation: bool = False
+    headers: Dict[str, str] = field(init=False)
+
+    def __post_init__(self):
+        self.headers = {'User-Agent': self.profile['user_agent'], **self.profile.get('headers', {})}
+
+    def request_kwargs(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """``session.request`` keyword arguments routed through this exit"""
+        kwargs = dict(kwargs)
+        kwargs['headers'] = {**self.headers, **(kwargs.get('headers') or {})}
+        if self.proxy:
+            kwargs['proxies'] = {'http': self.proxy, 'https': self.proxy}
+        return kwargs
+
+    def score(self, default_latency: float) -> float:
+        """Higher is healthier: success rate per second of latency, shared among requests in flight"""
+        return (1 - self.error_rate) / (self.latency or default_latency) / (1 + self.in_flight)
+
+
+def _exit_name(proxy: Optional[str]) -> str:
+    # Host and port only, so credentials in the proxy URL never reach the logs
+    if not proxy:
+        return "direct"
+    parsed = urlparse(proxy)
+    return f"{parsed.hostname}:{parsed.port}" if parsed.port else str(parsed.hostname)
+
+
+class EgressPool:
+    """Spreads a scraper's requests over several exits, each with its own rate limit.
+
+    Every request goes to the healthiest exit that may send right away;
+    health is an average of recent latency and errors. An exit is ejected
+    after ``eject_after`` consecutive failures (or when its recent error rate
+    reaches ``max_error_rate``) for ``eject_seconds``, doubling on each
+    repeat up to ``max_eject_seconds``. Once the time is up it is reinstated
+    on probation with a clean error rate: a failure ejects it again, and
+    ``eject_after`` successes in a row clear its record.
+    """
+
+    def __init__(self, exits: List[Exit], eject_after: int = 3, max_error_rate: float = 0.5,
+                 eject_seconds: float = 30.0, max_eject_seconds: float = 600.0, retries: int = 2):
+        if not exits:
+            raise ValueError("An egress pool needs at least one exit")
+        self.exits = exits
+        self.eject_after = max(1, eject_after)
+        self.max_error_rate = max_error_rate
+        self.eject_seconds = eject_seconds
+        self.max_eject_seconds = max_eject_seconds
+        self.retries = max(0, retries)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> Optional["EgressPool"]:
+        """Build the pool from the ``egress`` block of a domain config (None when absent or disabled).
+
+        Exits are the block's ``exits`` (a proxy URL, null for a direct
+        connection, or an object with ``proxy``, ``profile``,
+        ``requests_per_second`` and ``burst``), else the comma-separated
+        ``EGRESS_PROXIES`` environment variable, else one direct exit.
+        """
+        settings = config.get('egress')
+        if not settings or not settings.get('enabled', True):
+            return None
+        profiles = [
+            {'name': profile, 'user_agent': profile} if isinstance(profile, str) else profile
+            for profile in settings.get('user_agents') or DEFAULT_PROFILES
+        ]
+        entries = settings.get('exits')
+        if not entries:
+            entries = [p.strip() for p in os.getenv('EGRESS_PROXIES', '').split(',') if p.strip()] or [None]
+
+        exits = []
+        for i, entry in enumerate(entries):
+            entry = entry if isinstance(entry, dict) else {'proxy': entry}
+            proxy = entry.get('proxy')
+            profile = next((p for p in profiles if p['name'] == entry.get('profile')), profiles[i % len(profiles)])
+            rate = entry.get('requests_per_second', settings.get('requests_per_second'))
+            burst = entry.get('burst', settings.get('burst', 1))
+            exits.append(Exit(
+                name=entry.get('name') or _exit_name(proxy),
+                proxy=proxy,
+                profile=profile,
+                limiter=RateLimiter(float(rate), int(burst)) if rate else None,
+            ))
+        return cls(
+            exits,
+            eject_after=int(settings.get('eject_after', 3)),
+            max_error_rate=float(settings.get('max_error_rate', 0.5)),
+            eject_seconds=float(settings.get('eject_seconds', 30.0)),
+            max_eject_seconds=float(settings.get('max_eject_seconds', 600.0)),
+            retries=int(settings.get('retries', 2)),
+        )
+
+    @staticmethod
+    def is_failure(status: int) -> bool:
+        return status in EXIT_FAILURE_STATUSES or status >= 500
+
+    def _default_latency(self) -> float:
+        known = [e.latency for e in self.exits if e.latency]
+        return sum(known) / len(known) if known else 1.0
+
+    def acquire(self, avoid: Optional[List[Exit]] = None) -> Exit:
+        """Block until an exit may send and return it, healthiest first; exits in ``avoid`` only as a last resort"""
+        avoid = avoid or []
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                for exit in self.exits:
+                    if exit.ejected_until and exit.ejected_until <= now:
+                        exit.ejected_until = 0.0
+                        exit.consecutive_failures = exit.consecutive_successes = 0
+                        exit.error_rate = 0.0
+                        logger.info(f"Egress exit {exit.name} reinstated on probation")
+                live = [e for e in self.exits if not e.ejected_until]
+                if live:
+                    candidates = [e for e in live if e not in avoid] or live
+                    default_latency = self._default_latency()
+                    candidates.sort(key=lambda e: e.score(default_latency), reverse=True)
+                    waits = []
+                    for exit in candidates:
+                        wait = exit.limiter.try_acquire() if exit.limiter is not None else 0.0
+                        if not wait:
+                            exit.in_flight += 1
+                            return exit
+                        waits.append(wait)
+                    wait = min(waits)
+                else:
+                    # Every exit is ejected: wait for the first to come back
+                    wait = min(e.ejected_until for e in self.exits) - now
+            time.sleep(max(wait, 0.001))
+
+    def release(self, exit: Exit, seconds: float, failed: bool):
+        """Record the outcome of a request sent through ``exit``"""
+        with self._lock:
+            exit.in_flight -= 1
+            exit.requests += 1
+            exit.error_rate += (failed - exit.error_rate) * HEALTH_WEIGHT
+            if not failed:
+                exit.latency = seconds if exit.latency is None else exit.latency + (seconds - exit.latency) * HEALTH_WEIGHT
+                exit.consecutive_failures = 0
+                exit.consecutive_successes += 1
+                if exit.probation and exit.consecutive_successes >= self.eject_after:
+                    exit.probation = False
+                    exit.ejections = 0
+                return
+            exit.failures += 1
+            exit.consecutive_failures += 1
+            exit.consecutive_successes = 0
+            if exit.ejected_until or not (exit.probation or exit.consecutive_failures >= self.eject_after
+                                          or exit.error_rate >= self.max_error_rate):
+                return
+            cooldown = min(self.max_eject_seconds, self.eject_seconds * 2 ** exit.ejections)
+            exit.ejections += 1
+            exit.ejected_until = time.monotonic() + cooldown
+            exit.probation = True
+        logger.warning(
+            f"Egress exit {exit.name} ejected for {cooldown:.0f}s "
+            f"({exit.consecutive_failures} consecutive failures, error rate {exit.error_rate:.2f})"
+        )
+
+    def stats(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            now = time.monotonic()
+            default_latency = self._default_latency()
+            return [
+                {
+                    'exit': e.name,
+                    'profile': e.profile['name'],
+                    'requests': e.requests,
+                    'failures': e.failures,
+                    'error_rate': round(e.error_rate, 3),
+                    'latency_ms': round(e.latency * 1000, 1) if e.latency is not None else None,
+                    'score': round(e.score(default_latency), 3),
+                    'ejections': e.ejections,
+                    'state': ("ejected" if e.ejected_until > now else "probation" if e.probation else "active"),
+                }
+                for e in self.exits
+            ]
@@ -0,0 +1,189 @@
+import hashlib
+import json
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+from bs4 import BeautifulSoup
+
+from utils.backpressure import Stage
+from utils.detail_cache import DetailCache
+from .selector_profile import SelectorProfiler
+
+
+@dataclass
+class EnrichmentConfig:
+    """Detail-page enrichment settings read from the ``enrichment`` block of a domain config"""
+    enabled: bool = False
+    concurrency: int = 5
+    per_host: int = 2
+    cache_ttl_hours: float = 24.0
+    queue_size: int = 20
+    fields: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "EnrichmentConfig":
+        settings = config.get('enrichment', {})
+        concurrency = max(1, int(settings.get('concurrency', config.get('max_workers', 5))))
+        return cls(
+            enabled=bool(settings.get('enabled', False)),
+            concurrency=concurrency,
+            per_host=max(1, int(settings.get('per_host', 2))),
+            cache_ttl_hours=float(settings.get('cache_ttl_hours', 24.0)),
+            # Detail fetches queued or running at once; 4x concurrency keeps every worker busy
+            queue_size=max(concurrency, int(settings.get('queue_size', 4 * concurrency))),
+            fields=settings.get('fields', {}),
+        )
+
+
+def _field_value(elem, spec: Dict[str, Any]) -> Optional[str]:
+    value = elem.get(spec['attr']) if spec.get('attr') else elem.get_text(" ", strip=True)
+    if isinstance(value, list):
+        # Multi-valued attributes such as class
+        value = " ".join(value)
+    return value
+
+
+def extract_fields(soup: BeautifulSoup, fields: Dict[str, Any],
+                   profile: Optional[SelectorProfiler] = None) -> Dict[str, Any]:
+    """Extract configured fields from a detail page.
+
+    Each field is either a CSS selector or a dict with ``selector`` and
+    optional ``fallbacks`` (tried in order, or most-likely first when a
+    ``profile`` is given), ``attr`` (read an attribute instead of the text)
+    and ``regex`` (keep the first group, or the whole match). Missing
+    fields are "N/A".
+    """
+    values = {}
+    for name, spec in fields.items():
+        if isinstance(spec, str):
+            spec = {'selector': spec}
+        selectors = [spec['selector']] + spec.get('fallbacks', [])
+        if profile is not None:
+            elem = profile.select_one(soup, selectors, field=f"detail.{name}",
+                                      keep=lambda e: _field_value(e, spec))
+            value = _field_value(elem, spec) if elem is not None else None
+        else:
+            value = None
+            for selector in selectors:
+                elem = soup.select_one(selector)
+                if elem is None:
+                    continue
+                value = _field_value(elem, spec)
+                if value:
+                    break
+        if value and spec.get('regex'):
+            match = re.search(spec['regex'], value)
+            value = (match.group(1) if match.groups() else match.group(0)) if match else None
+        values[name] = value or "N/A"
+    return values
+
+
+class DetailEnricher:
+    """Fetch detail pages for listing items and merge the extracted fields back.
+
+    URLs are deduplicated within a call and across concurrent calls (for
+    example several search queries returning the same item), results are
+    cached on disk for ``cache_ttl_hours``, at most ``concurrency`` pages are
+    fetched at once and at most ``per_host`` of those go to the same host.
+    Submitting blocks once ``queue_size`` fetches are queued or running.
+    """
+
+    def __init__(self, scraper, settings: Optional[EnrichmentConfig] = None):
+        self.scraper = scraper
+        self.settings = settings or EnrichmentConfig.from_config(scraper.config)
+        ttl = self.settings.cache_ttl_hours * 3600
+        # Cached fields are only reused while the field configuration is unchanged
+        spec = hashlib.sha1(json.dumps(self.settings.fields, sort_keys=True, default=str).encode()).hexdigest()
+        self.cache = DetailCache(scraper.domain, ttl, spec=spec) if ttl > 0 else None
+        # Re-entrant: a done-callback may run inline while the lock is held
+        self._lock = threading.RLock()
+        self._inflight: Dict[str, Future] = {}
+        self._host_slots: Dict[str, threading.Semaphore] = {}
+        self.stage = Stage('details', self.settings.queue_size)
+        self.fetched = 0
+        self.cache_hits = 0
+
+    def _host_slot(self, url: str) -> threading.Semaphore:
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.Semaphore(self.settings.per_host)
+            return self._host_slots[host]
+
+    def _fetch(self, url: str) -> Dict[str, Any]:
+        with self._host_slot(url):
+            fields = self.scraper.fetch_detail(url)
+        with self._lock:
+            self.fetched += 1
+        # A page where no field matched (layout change, error page) is not cached, so it is retried
+        if self.cache is not None and any(value not in (None, "", "N/A") for value in fields.values()):
+            self.cache.put(url, fields)
+        return fields
+
+    def enrich(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Merge detail fields into ``items`` in place and return them"""
+        urls = list(dict.fromkeys(self.scraper.detail_urls(items)))
+        if not urls:
+            return items
+
+        results: Dict[str, Dict[str, Any]] = {}
+        futures: Dict[str, Future] = {}
+        with ThreadPoolExecutor(max_workers=self.settings.concurrency) as executor:
+            for url in urls:
+                cached = self.cache.get(url) if self.cache is not None else None
+                if cached is not None:
+                    with self._lock:
+                        self.cache_hits += 1
+                    results[url] = cached
+                    continue
+                with self._lock:
+                    future = self._inflight.get(url)
+                if future is None:
+                    future = self._submit(executor, url)
+                futures[url] = future
+
+            for url, future in futures.items():
+                try:
+                    results[url] = future.result()
+                except Exception as e:
+                    self.scraper.logger.error(f"Detail fetch failed for {url}: {e}")
+                    results[url] = {}
+
+        for item in items:
+            fields = results.get(item.get('url'))
+            if fields:
+                item.update(fields)
+
+        self.scraper.logger.info(
+            f"Enriched {len(urls)} detail URLs ({len(futures)} fetched, "
+            f"{len(urls) - len(futures)} from cache)"
+        )
+        return items
+
+    def _submit(self, executor: ThreadPoolExecutor, url: str) -> Future:
+        # Wait for room outside the lock so other queries can still join fetches in flight
+        self.stage.wait_for_memory()
+        self.stage.enter()
+        with self._lock:
+            future = self._inflight.get(url)
+            if future is not None:
+                # Another query submitted it while this one waited
+                self.stage.leave()
+                return future
+            try:
+                future = executor.submit(self._fetch, url)
+            except Exception:
+                self.stage.leave()
+                raise
+            self._inflight[url] = future
+            future.add_done_callback(lambda _, url=url: self._forget(url))
+            return future
+
+    def _forget(self, url: str):
+        with self._lock:
+            self._inflight.pop(url, None)
+        self.stage.leave()
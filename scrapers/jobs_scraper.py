@@ -2,7 +2,6 @@ from typing import List, Dict, Any
 from .base_scraper import BaseScraper
 from bs4 import BeautifulSoup
 import re
-import time
 import pandas as pd
 
 class JobsScraper(BaseScraper):
@@ -15,27 +14,27 @@ class JobsScraper(BaseScraper):
         
         pages_to_scrape = max_pages or self.config.get('pages', 3)
         
-        for page in range(1, pages_to_scrape + 1):
-            url = f"{self.config['base_url']}remote-dev-jobs/{page}"
-            response = self.make_request(url)
-            
-            if not response:
-                continue
-            
-            soup = self.parse_html(response.text)
-            jobs = self._parse_jobs_page(soup)
+        for page, jobs in self.paginate(
+            lambda page: self.page_url(page),
+            self.parse_page,
+            pages_to_scrape
+        ):
             all_jobs.extend(jobs)
-            
             self.logger.info(f"Scraped page {page}: {len(jobs)} jobs")
-            time.sleep(self.config.get('delay', 1.0))
         
-        return all_jobs
+        return self.enrich(all_jobs)
+    
+    def page_url(self, page: int) -> str:
+        return f"{self.config['base_url']}remote-dev-jobs/{page}"
+    
+    def parse_page(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
+        return self._parse_jobs_page(soup)
     
     def _parse_jobs_page(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
         """Parse a single page of jobs"""
         jobs = []
         selectors = self.config['selectors']
-        job_elements = soup.select(selectors['job'])
+        job_elements = self.select(soup, selectors['job'])
         
         for job_elem in job_elements:
             try:
@@ -50,21 +49,21 @@ class JobsScraper(BaseScraper):
                 }
                 jobs.append(job)
             except Exception as e:
-                self.logger.error(f"Error parsing job: {e}")
+                self.parse_errors.record(selectors['job'], e)
                 continue
         
         return jobs
     
     def _extract_text(self, elem, selector: str) -> str:
-        selected = elem.select_one(selector)
+        selected = self.select_one(elem, selector)
         return selected.text.strip() if selected else "N/A"
     
     def _extract_tags(self, elem, selector: str) -> str:
-        tags = elem.select(selector)
+        tags = self.select(elem, selector)
         return ", ".join([tag.text.strip() for tag in tags]) if tags else "N/A"
     
     def _extract_salary(self, elem, selector: str) -> str:
-        salary_elem = elem.select_one(selector)
+        salary_elem = self.select_one(elem, selector)
         if salary_elem:
             salary_text = salary_elem.text.strip()
             # Look for salary patterns
@@ -0,0 +1,179 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+from bs4 import BeautifulSoup
+
+from utils.change_tracker import fingerprint_bytes
+
+
+@dataclass
+class PaginationConfig:
+    """Pagination settings read from the ``pagination`` block of a domain config"""
+    next_selector: Optional[str] = None
+    max_empty_pages: int = 1
+    concurrency: int = 1
+    window: int = 3
+    retries: int = 1
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "PaginationConfig":
+        settings = config.get('pagination', {})
+        return cls(
+            next_selector=settings.get('next_selector'),
+            max_empty_pages=max(1, int(settings.get('max_empty_pages', 1))),
+            concurrency=max(1, int(settings.get('concurrency', 1))),
+            window=max(1, int(settings.get('window', 3))),
+            retries=max(0, int(settings.get('retries', 1))),
+        )
+
+
+@dataclass
+class PageResult:
+    page: int
+    items: List[Dict[str, Any]] = field(default_factory=list)
+    has_next: bool = True
+    fetched: bool = False
+
+
+class Paginator:
+    """Walk numbered listing pages and stop at the detected last page.
+
+    The end of the listing is detected either from a missing next-page link
+    (when ``next_selector`` is configured) or from ``max_empty_pages``
+    consecutive pages without cards. A failed fetch (error status, timeout)
+    is retried ``retries`` times and then skipped; it never ends the listing.
+    In concurrent mode up to ``window`` pages are fetched ahead; once the end
+    is known, queued pages are cancelled and in-flight ones are discarded
+    without being parsed.
+    """
+
+    def __init__(self, scraper, build_url: Callable[[int], str],
+                 parse_page: Callable[[BeautifulSoup], List[Dict[str, Any]]],
+                 settings: Optional[PaginationConfig] = None):
+        self.scraper = scraper
+        self.build_url = build_url
+        self.parse_page = parse_page
+        self.settings = settings or PaginationConfig.from_config(scraper.config)
+        self.delay = scraper.config.get('delay', 1.0)
+        # Pages fetched ahead but not yet consumed, and the raw HTML being parsed
+        self.stage = scraper.stages['pages']
+        self._stop = threading.Event()
+
+    def pages(self, max_pages: int) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        """Yield ``(page, items)`` in page order until the last page or ``max_pages``"""
+        if self.settings.concurrency > 1:
+            return self._concurrent(max_pages)
+        return self._sequential(max_pages)
+
+    def fetch_page(self, page: int) -> PageResult:
+        """Fetch and parse a single listing page"""
+        if self._stop.is_set():
+            return PageResult(page)
+
+        self.stage.wait_for_memory()
+        url = self.build_url(page)
+        response = self.scraper.make_request(url)
+        for _ in range(self.settings.retries):
+            if response or self._stop.wait(self.delay):
+                break
+            response = self.scraper.make_request(url)
+        if not response or self._stop.is_set():
+            return PageResult(page)
+        with self.stage.holding(len(response.content)):
+            return self._parse(page, url, response)
+
+    def _parse(self, page: int, url: str, response) -> PageResult:
+        tracker = self.scraper.changes
+        if tracker is not None:
+            fingerprint = fingerprint_bytes(response.content)
+            cached = tracker.cached_page(url, fingerprint)
+            if cached is not None:
+                items, has_next = cached
+                now = pd.Timestamp.now()
+                self.scraper.logger.debug(f"Page {page} unchanged since last run, reusing {len(items)} items")
+                return PageResult(page, [{**item, 'scraped_timestamp': now} for item in items],
+                                  has_next, fetched=True)
+
+        soup = self.scraper.parse_response(response)
+        items = self.parse_page(soup)
+        has_next = True
+        if self.settings.next_selector:
+            has_next = soup.select_one(self.settings.next_selector) is not None
+        if tracker is not None:
+            tracker.remember_page(url, fingerprint, items, has_next)
+        return PageResult(page, items, has_next, fetched=True)
+
+    def _is_end(self, result: PageResult, empty_streak: int) -> bool:
+        if result.items:
+            return not result.has_next
+        return empty_streak >= self.settings.max_empty_pages
+
+    def _sequential(self, max_pages: int) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        empty_streak = 0
+        for page in range(1, max_pages + 1):
+            if page > 1:
+                self._stop.wait(self.delay)
+
+            self.stage.enter()
+            try:
+                result = self.fetch_page(page)
+            finally:
+                self.stage.leave()
+            if not result.fetched:
+                self.scraper.logger.warning(f"Skipping page {page}: fetch failed")
+                self.scraper.coverage_gaps += 1
+                continue
+            empty_streak = 0 if result.items else empty_streak + 1
+            if result.items:
+                yield page, result.items
+
+            if self._is_end(result, empty_streak):
+                self.scraper.logger.info(f"Reached last page at page {page}")
+                return
+
+    def _fetch_with_delay(self, page: int) -> PageResult:
+        # Workers pace themselves; the wait returns early once the end is known
+        if self._stop.wait(self.delay if page > 1 else 0):
+            return PageResult(page)
+        return self.fetch_page(page)
+
+    def _concurrent(self, max_pages: int) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        empty_streak = 0
+        next_page = 1
+        in_flight: Dict[int, Future] = {}
+
+        with ThreadPoolExecutor(max_workers=self.settings.concurrency) as executor:
+            try:
+                for page in range(1, max_pages + 1):
+                    while next_page <= max_pages and next_page < page + self.settings.window:
+                        self.stage.enter()
+                        in_flight[next_page] = executor.submit(self._fetch_with_delay, next_page)
+                        next_page += 1
+
+                    try:
+                        result = in_flight.pop(page).result()
+                    finally:
+                        self.stage.leave()
+                    if not result.fetched:
+                        self.scraper.logger.warning(f"Skipping page {page}: fetch failed")
+                        self.scraper.coverage_gaps += 1
+                        continue
+                    empty_streak = 0 if result.items else empty_streak + 1
+                    if result.items:
+                        yield page, result.items
+
+                    if self._is_end(result, empty_streak):
+                        self.scraper.logger.info(
+                            f"Reached last page at page {page}, "
+                            f"cancelling {len(in_flight)} speculative fetches"
+                        )
+                        return
+            finally:
+                self._stop.set()
+                for future in in_flight.values():
+                    future.cancel()
+                if in_flight:
+                    self.stage.leave(count=len(in_flight))
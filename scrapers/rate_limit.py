@@ -0,0 +1,42 @@
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+class RateLimiter:
+    """Thread-safe token bucket shared by every request a scraper makes"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> Optional["RateLimiter"]:
+        settings = config.get('rate_limit')
+        if not settings or not settings.get('requests_per_second'):
+            return None
+        return cls(float(settings['requests_per_second']), int(settings.get('burst', 1)))
+
+    def try_acquire(self) -> float:
+        """Take a token if one is available and return 0, otherwise return the seconds until one is"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self) -> float:
+        """Block until a request may be sent; returns the seconds waited"""
+        waited = 0.0
+        while True:
+            shortfall = self.try_acquire()
+            if not shortfall:
+                return waited
+            time.sleep(shortfall)
+            waited += shortfall
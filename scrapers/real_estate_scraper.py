@@ -2,7 +2,6 @@ from typing import List, Dict, Any
 from .base_scraper import BaseScraper
 from bs4 import BeautifulSoup
 import re
-import time
 import pandas as pd
 
 class RealEstateScraper(BaseScraper):
@@ -15,27 +14,27 @@ class RealEstateScraper(BaseScraper):
         
         pages_to_scrape = max_pages or self.config.get('pages', 3)
         
-        for page in range(1, pages_to_scrape + 1):
-            url = f"{self.config['base_url']}homes/{page}_p/"
-            response = self.make_request(url)
-            
-            if not response:
-                continue
-            
-            soup = self.parse_html(response.text)
-            properties = self._parse_properties_page(soup)
+        for page, properties in self.paginate(
+            lambda page: self.page_url(page),
+            self.parse_page,
+            pages_to_scrape
+        ):
             all_properties.extend(properties)
-            
             self.logger.info(f"Scraped page {page}: {len(properties)} properties")
-            time.sleep(self.config.get('delay', 1.0))
         
-        return all_properties
+        return self.enrich(all_properties)
+    
+    def page_url(self, page: int) -> str:
+        return f"{self.config['base_url']}homes/{page}_p/"
+    
+    def parse_page(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
+        return self._parse_properties_page(soup)
     
     def _parse_properties_page(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
         """Parse a single page of properties"""
         properties = []
         selectors = self.config['selectors']
-        property_elements = soup.select(selectors['property'])
+        property_elements = self.select(soup, selectors['property'])
         
         for prop_elem in property_elements:
             try:
@@ -49,17 +48,17 @@ class RealEstateScraper(BaseScraper):
                 }
                 properties.append(property_data)
             except Exception as e:
-                self.logger.error(f"Error parsing property: {e}")
+                self.parse_errors.record(selectors['property'], e)
                 continue
         
         return properties
     
     def _extract_text(self, elem, selector: str) -> str:
-        selected = elem.select_one(selector)
+        selected = self.select_one(elem, selector)
         return selected.text.strip() if selected else "N/A"
     
     def _extract_price(self, elem, selector: str) -> str:
-        price_elem = elem.select_one(selector)
+        price_elem = self.select_one(elem, selector)
         if price_elem:
             price_text = price_elem.text.strip()
             # Extract price information
@@ -68,7 +67,7 @@ class RealEstateScraper(BaseScraper):
         return "N/A"
     
     def _extract_details(self, elem, selector: str) -> str:
-        details_elem = elem.select_one(selector)
+        details_elem = self.select_one(elem, selector)
         if details_elem:
             details = details_elem.select('li')
             return ", ".join([detail.text.strip() for detail in details]) if details else "N/A"
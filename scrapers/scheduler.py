@@ -0,0 +1,206 @@
+import heapq
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from loguru import logger
+
+
+@dataclass
+class DomainSchedule:
+    site: str
+    interval: float
+    priority: int = 0
+    runs: int = 0
+    failures: int = 0
+    next_run: Optional[float] = None
+    last_started: Optional[float] = None
+    last_duration: Optional[float] = None
+    last_items: Optional[int] = None
+    last_error: Optional[str] = None
+    running: bool = False
+    config_mtime: float = 0.0
+
+
+class CrawlScheduler:
+    """Recrawl domains on jittered intervals from a priority queue.
+
+    Scraper instances are created once per domain and reused for every run,
+    so their sessions and connection pools stay warm. A domain's config file
+    is checked before each run and reloaded when it has changed. Each
+    domain's ``schedule`` config block may set ``interval_minutes`` and
+    ``priority`` (lower runs first when several domains are due).
+    """
+
+    def __init__(self, sites: List[str], scraper_factory: Callable[[str], Any],
+                 run_job: Callable[[Any, str], list], default_interval: float = 3600,
+                 jitter: float = 0.1, concurrency: int = 1):
+        self.scraper_factory = scraper_factory
+        self.run_job = run_job
+        self.jitter = jitter
+        self.concurrency = concurrency
+        self.scrapers: Dict[str, Any] = {}
+        self.schedules: Dict[str, DomainSchedule] = {}
+        self._heap: List[tuple] = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self.started_at = time.time()
+
+        for site in sites:
+            scraper = scraper_factory(site)
+            self.scrapers[site] = scraper
+            schedule = self._schedule_from_config(site, scraper.config, default_interval)
+            schedule.config_mtime = self._config_path(site).stat().st_mtime
+            self.schedules[site] = schedule
+            # Spread the first runs a little so domains don't all start at once
+            self._push(site, time.time() + random.uniform(0, self.jitter * 60))
+
+    @staticmethod
+    def _config_path(site: str) -> Path:
+        return Path(f"data/{site}/{site}_url.json")
+
+    @staticmethod
+    def _schedule_from_config(site: str, config: Dict[str, Any], default_interval: float) -> DomainSchedule:
+        settings = config.get('schedule', {})
+        interval = settings.get('interval_minutes')
+        return DomainSchedule(
+            site=site,
+            interval=interval * 60 if interval else default_interval,
+            priority=int(settings.get('priority', 0)),
+        )
+
+    def _push(self, site: str, when: float):
+        schedule = self.schedules[site]
+        schedule.next_run = when
+        with self._lock:
+            heapq.heappush(self._heap, (when, schedule.priority, site))
+        self._wakeup.set()
+
+    def _jittered(self, interval: float) -> float:
+        return interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def _reload_if_changed(self, site: str):
+        schedule = self.schedules[site]
+        mtime = self._config_path(site).stat().st_mtime
+        if mtime == schedule.config_mtime:
+            return
+        scraper = self.scrapers[site]
+        scraper.reload_config()
+        fresh = self._schedule_from_config(site, scraper.config, schedule.interval)
+        schedule.interval, schedule.priority = fresh.interval, fresh.priority
+        schedule.config_mtime = mtime
+        logger.info(f"Reloaded config for {site} (interval {schedule.interval:.0f}s)")
+
+    def _run(self, site: str):
+        schedule = self.schedules[site]
+        schedule.running = True
+        schedule.last_started = time.time()
+        try:
+            self._reload_if_changed(site)
+            data = self.run_job(self.scrapers[site], site)
+            schedule.last_items = len(data or [])
+            schedule.last_error = None
+        except Exception as e:
+            schedule.failures += 1
+            schedule.last_error = str(e)
+            logger.error(f"Scheduled run for {site} failed: {e}")
+        finally:
+            schedule.runs += 1
+            schedule.last_duration = time.time() - schedule.last_started
+            schedule.running = False
+            self._push(site, time.time() + self._jittered(schedule.interval))
+
+    def serve_forever(self):
+        """Run due domains until ``stop`` is called"""
+        logger.info(f"Scheduler started for {list(self.schedules)}")
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            while not self._stopping.is_set():
+                now = time.time()
+                with self._lock:
+                    running = sum(1 for s in self.schedules.values() if s.running)
+                    site = self._pop_due(now) if running < self.concurrency else None
+                    due = self._heap[0][0] if self._heap else None
+
+                if site is not None:
+                    self.schedules[site].running = True
+                    executor.submit(self._run, site)
+                    continue
+
+                # Finished runs re-queue their domain and set the wakeup event
+                self._wakeup.clear()
+                if due is None or running >= self.concurrency:
+                    timeout = 30.0
+                else:
+                    timeout = max(0.05, min(due - now, 30.0))
+                self._wakeup.wait(timeout)
+
+    def _pop_due(self, now: float) -> Optional[str]:
+        """Remove and return the highest-priority domain that is due, if any"""
+        due = [entry for entry in self._heap if entry[0] <= now]
+        if not due:
+            return None
+        chosen = min(due, key=lambda entry: (entry[1], entry[0]))
+        self._heap.remove(chosen)
+        heapq.heapify(self._heap)
+        return chosen[2]
+
+    def stop(self):
+        self._stopping.set()
+        self._wakeup.set()
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            depth = len(self._heap)
+            due = sum(1 for when, _, _ in self._heap if when <= now)
+        return {
+            'uptime_seconds': round(now - self.started_at),
+            'queue_depth': depth,
+            'due_now': due,
+            'running': [s.site for s in self.schedules.values() if s.running],
+            'domains': {
+                site: {
+                    'interval_seconds': s.interval,
+                    'priority': s.priority,
+                    'runs': s.runs,
+                    'failures': s.failures,
+                    'next_run_in': round(s.next_run - now) if s.next_run and not s.running else None,
+                    'last_started': s.last_started,
+                    'last_duration': s.last_duration,
+                    'last_items': s.last_items,
+                    'last_error': s.last_error,
+                }
+                for site, s in self.schedules.items()
+            },
+        }
+
+
+def start_stats_server(scheduler: CrawlScheduler, host: str = "127.0.0.1", port: int = 8765) -> ThreadingHTTPServer:
+    """Serve scheduler stats as JSON on ``/stats`` from a background thread"""
+
+    class StatsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip('/') not in ('', '/stats'):
+                self.send_error(404)
+                return
+            body = json.dumps(scheduler.stats(), default=str).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.debug(f"stats server: {format % args}")
+
+    server = ThreadingHTTPServer((host, port), StatsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    logger.info(f"Scheduler stats available at http://{host}:{port}/stats")
+    return server
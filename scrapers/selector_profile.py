@@ -0,0 +1,177 @@
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+STATE_DIR = Path("outputs/state")
+
+# Weight of the latest attempt in the recent hit rate and cost used for
+# ordering, so a selector that stops matching after a site change drops in
+# rank within a page or two instead of after its whole history
+RECENT_WEIGHT = 0.05
+
+
+@dataclass
+class SelectorStats:
+    attempts: int = 0
+    hits: int = 0
+    seconds: float = 0.0
+    # Exponentially weighted over recent attempts; 0.5 until the selector is first tried
+    recent_hit_rate: float = 0.5
+    recent_seconds: float = 0.0
+
+    def add(self, hit: bool, seconds: float):
+        if self.attempts:
+            self.recent_hit_rate += (hit - self.recent_hit_rate) * RECENT_WEIGHT
+            self.recent_seconds += (seconds - self.recent_seconds) * RECENT_WEIGHT
+        else:
+            self.recent_hit_rate, self.recent_seconds = float(hit), seconds
+        self.attempts += 1
+        self.hits += hit
+        self.seconds += seconds
+
+    @property
+    def avg_seconds(self) -> float:
+        return self.seconds / self.attempts if self.attempts else 0.0
+
+
+Selectors = Union[str, Iterable[str]]
+
+
+class SelectorProfiler:
+    """Hit rate and time spent per field and selector for one domain, persisted between runs.
+
+    A field may be given a list of fallback selectors. With ``adaptive`` on
+    they are tried highest hit rate per second of matching first (the order
+    that minimises the expected time to the first match), otherwise in the
+    order given; the first one that matches wins. Each selector is run as
+    written, so a comma-separated group returns the matches of all its parts,
+    as ``soup.select`` does.
+    """
+
+    def __init__(self, domain: str, fields: Optional[Dict[str, str]] = None,
+                 adaptive: bool = True, root: Optional[Path] = None):
+        self.domain = domain
+        self.adaptive = adaptive
+        self.path = Path(root or STATE_DIR) / domain / "selectors.json"
+        # Field name of each configured selector, for calls that only pass the selector
+        self.fields = {}
+        for name, selector in (fields or {}).items():
+            if isinstance(selector, str):
+                self.fields.setdefault(selector, name)
+        self.stats: Dict[str, Dict[str, SelectorStats]] = {}
+        self._alternatives: Dict[Any, List[str]] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            saved = json.loads(self.path.read_text(encoding="utf-8"))
+            self.stats = {
+                field: {selector: SelectorStats(**entry) for selector, entry in selectors.items()}
+                for field, selectors in saved.items()
+            }
+        except (OSError, ValueError, TypeError):
+            self.stats = {}
+
+    def save(self):
+        """Write the stats atomically (the last process to save wins)"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            data = {field: {selector: asdict(entry) for selector, entry in selectors.items()}
+                    for field, selectors in self.stats.items()}
+        tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        tmp.replace(self.path)
+
+    def reset(self):
+        with self._lock:
+            self.stats.clear()
+        if self.path.exists():
+            self.path.unlink()
+
+    def alternatives(self, selectors: Selectors) -> List[str]:
+        """The fallbacks of a list, or a single selector (a comma group stays one selector)"""
+        key = selectors if isinstance(selectors, str) else tuple(selectors)
+        found = self._alternatives.get(key)
+        if found is None:
+            found = [selectors] if isinstance(selectors, str) else list(dict.fromkeys(selectors))
+            self._alternatives[key] = found
+        return found
+
+    def order(self, field: str, alternatives: List[str]) -> List[str]:
+        """Alternatives by descending recent hit rate per second spent; ties keep the configured order"""
+        if not self.adaptive or len(alternatives) < 2:
+            return alternatives
+        with self._lock:
+            known = self.stats.get(field, {})
+            entries = [known.get(alt, SelectorStats()) for alt in alternatives]
+        timed = [e.recent_seconds for e in entries if e.attempts]
+        default_cost = sum(timed) / len(timed) if timed else 1.0
+        scores = [e.recent_hit_rate / (e.recent_seconds or default_cost) for e in entries]
+        ranked = sorted(range(len(alternatives)), key=lambda i: -scores[i])
+        return [alternatives[i] for i in ranked]
+
+    def record(self, field: str, selector: str, hit: bool, seconds: float):
+        with self._lock:
+            self.stats.setdefault(field, {}).setdefault(selector, SelectorStats()).add(hit, seconds)
+
+    def _field(self, selectors: Selectors, field: Optional[str]) -> str:
+        if field:
+            return field
+        first = selectors if isinstance(selectors, str) else next(iter(selectors), "")
+        return self.fields.get(first, first)
+
+    def select(self, elem, selectors: Selectors, field: Optional[str] = None,
+               keep: Optional[Callable[[Any], Any]] = None) -> List[Any]:
+        """Matches of the first alternative that matches (``keep`` filters the matches)"""
+        field = self._field(selectors, field)
+        for selector in self.order(field, self.alternatives(selectors)):
+            started = time.perf_counter()
+            matched = elem.select(selector)
+            if keep is not None:
+                matched = [e for e in matched if keep(e)]
+            self.record(field, selector, bool(matched), time.perf_counter() - started)
+            if matched:
+                return matched
+        return []
+
+    def select_one(self, elem, selectors: Selectors, field: Optional[str] = None,
+                   keep: Optional[Callable[[Any], Any]] = None):
+        """First match of the first alternative whose first match passes ``keep``, or None"""
+        field = self._field(selectors, field)
+        for selector in self.order(field, self.alternatives(selectors)):
+            started = time.perf_counter()
+            found = elem.select_one(selector)
+            if found is not None and keep is not None and not keep(found):
+                found = None
+            self.record(field, selector, found is not None, time.perf_counter() - started)
+            if found is not None:
+                return found
+        return None
+
+    def report(self) -> List[Dict[str, Any]]:
+        """One row per field and selector, in the order the selectors are tried"""
+        with self._lock:
+            fields = {field: dict(selectors) for field, selectors in self.stats.items()}
+        rows = []
+        for field in sorted(fields):
+            selectors = fields[field]
+            for rank, selector in enumerate(self.order(field, list(selectors)), start=1):
+                entry = selectors[selector]
+                rows.append({
+                    'field': field,
+                    'rank': rank,
+                    'selector': selector,
+                    'attempts': entry.attempts,
+                    'hit_rate': round(entry.hits / entry.attempts, 3) if entry.attempts else None,
+                    'recent_hit_rate': round(entry.recent_hit_rate, 3),
+                    'avg_us': round(entry.avg_seconds * 1e6, 1),
+                    'total_ms': round(entry.seconds * 1000, 2),
+                })
+        return rows
@@ -0,0 +1,192 @@
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+from lxml import etree
+
+from .transfer import declared_encoding, wire_bytes
+
+
+@dataclass
+class FetchStats:
+    url: str
+    bytes_read: int = 0
+    bytes_decoded: int = 0
+    content_length: Optional[int] = None
+    parse_seconds: float = 0.0
+    parse_attempts: int = 0
+    early_exit: bool = False
+
+
+class DetailStats:
+    """Thread-safe totals of bytes and parse time spent on detail pages"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.pages = 0
+        self.bytes_read = 0
+        self.bytes_decoded = 0
+        self.bytes_skipped = 0
+        self.parse_seconds = 0.0
+        self.early_exits = 0
+
+    def add(self, stats: FetchStats):
+        with self._lock:
+            self.pages += 1
+            self.bytes_read += stats.bytes_read
+            self.bytes_decoded += stats.bytes_decoded
+            self.parse_seconds += stats.parse_seconds
+            if stats.early_exit:
+                self.early_exits += 1
+                if stats.content_length:
+                    self.bytes_skipped += max(0, stats.content_length - stats.bytes_read)
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            pages = self.pages or 1
+            return {
+                'pages': self.pages,
+                'avg_bytes_read': round(self.bytes_read / pages),
+                'avg_bytes_decoded': round(self.bytes_decoded / pages),
+                'bytes_skipped': self.bytes_skipped,
+                'avg_parse_ms': round(self.parse_seconds / pages * 1000, 2),
+                'early_exit_rate': round(self.early_exits / pages, 3),
+            }
+
+
+def selector_markers(selectors: List[str]) -> List[bytes]:
+    """Byte substrings that must appear in the page before any of the selectors can match"""
+    markers = []
+    for selector in selectors:
+        for part in selector.split(','):
+            tokens = re.findall(r"\.([\w-]+)", part) + re.findall(r"=\s*['\"]([^'\"]+)['\"]", part)
+            if tokens:
+                # The last compound in a selector is the most specific
+                markers.append(tokens[-1].encode('utf-8'))
+    return list(dict.fromkeys(markers))
+
+
+class IncrementalSoup:
+    """A BeautifulSoup tree built chunk by chunk as a body arrives.
+
+    Chunks go to lxml's HTML push parser, which drives bs4's tree builder,
+    so every byte is parsed once however often the partial tree is searched.
+    When an element with an attribute value containing one of ``markers``
+    opens, its parent is watched; once that parent closes the subtree around
+    the element is complete and the parent is queued in ``closed``.
+    """
+
+    def __init__(self, encoding: str, markers: List[str]):
+        self.soup = BeautifulSoup("", "lxml")
+        self.builder = self.soup.builder
+        self.builder.initialize_soup(self.soup)
+        self.markers = markers
+        self.closed: List[Any] = []
+        self._watching: Dict[int, Any] = {}
+        self._parser = etree.HTMLParser(target=self, recover=True, encoding=encoding)
+
+    def feed(self, chunk: bytes):
+        self._parser.feed(chunk)
+
+    def finish(self):
+        """Parse whatever the push parser still buffers once the body has been read"""
+        try:
+            self._parser.close()
+        except etree.LxmlError:
+            pass
+        self.soup.endData()
+
+    # lxml parser target interface, forwarded to the bs4 tree builder
+
+    def start(self, name, attrs, nsmap={}):
+        self.builder.start(name, attrs, nsmap)
+        if any(marker in value for value in attrs.values() for marker in self.markers):
+            parent = self.soup.currentTag.parent
+            if parent is not None:
+                self._watching[id(parent)] = parent
+
+    def end(self, name):
+        closing = self.soup.currentTag
+        self.builder.end(name)
+        if self._watching.pop(id(closing), None) is not None:
+            self.closed.append(closing)
+
+    def data(self, content):
+        self.builder.data(content)
+
+    def comment(self, content):
+        self.builder.comment(content)
+
+    def doctype(self, name, pubid, system):
+        self.builder.doctype(name, pubid, system)
+
+    def pi(self, target, data=None):
+        self.builder.pi(target, data)
+
+    def close(self):
+        return self.builder.close()
+
+
+def stream_select(scraper, url: str, selectors: List[str],
+                  chunk_size: int = 16384) -> Tuple[List[Any], FetchStats]:
+    """Stream a page and stop once its first selector has matched.
+
+    The body is parsed as it arrives (see ``IncrementalSoup``). ``selectors[0]``
+    is tried whenever the parent of an element carrying one of its markers
+    closes, so every match inside that parent is complete. Once it matches
+    the connection is closed without reading the rest of the page and all
+    ``selectors`` (the first plus its fallbacks) are run over the tree
+    parsed so far. Fallbacks never end the download: a page where only they
+    match is read to the end. Returns the matched elements (empty if nothing
+    matched) and fetch stats.
+    """
+    stats = FetchStats(url)
+    response = scraper.make_request(url, kind="detail", stream=True)
+    if not response:
+        return [], stats
+
+    markers = [m.decode('utf-8') for m in selector_markers(selectors[:1])]
+    length = response.headers.get('Content-Length')
+    stats.content_length = int(length) if length and length.isdigit() else None
+
+    keep = lambda e: e.get_text(strip=True)  # noqa: E731
+    buffer = bytearray()
+    encoding = None
+    tree: Optional[IncrementalSoup] = None
+    matched: List[Any] = []
+    try:
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            if not chunk:
+                continue
+            buffer.extend(chunk)
+            started = time.perf_counter()
+            if tree is None:
+                encoding = declared_encoding(response, head=bytes(buffer[:4096])) or 'utf-8'
+                tree = IncrementalSoup(encoding, markers)
+            tree.feed(chunk)
+            if tree.closed:
+                tree.closed.clear()
+                stats.parse_attempts += 1
+                stats.early_exit = any(keep(e) for e in tree.soup.select(selectors[0]))
+            stats.parse_seconds += time.perf_counter() - started
+            if stats.early_exit:
+                break
+        if tree is not None:
+            started = time.perf_counter()
+            if not stats.early_exit:
+                tree.finish()
+            matched = scraper.selector_profile.select(tree.soup, selectors, keep=keep)
+            stats.parse_seconds += time.perf_counter() - started
+    finally:
+        stats.bytes_decoded = len(buffer)
+        stats.bytes_read = wire_bytes(response, len(buffer))
+        response.close()
+    scraper.bandwidth.add(stats.bytes_read, stats.bytes_decoded, response.headers.get('Content-Encoding'))
+
+    if scraper.archive is not None and buffer:
+        # Partial bodies are still archived so the matched fields can be reparsed
+        scraper._archive_bytes(url, bytes(buffer), "detail", response.status_code, encoding)
+    return matched, stats
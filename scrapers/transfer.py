@@ -0,0 +1,75 @@
+import re
+import threading
+from typing import Any, Dict, Optional
+
+try:
+    import brotli  # noqa: F401  (urllib3 decodes br responses when it is installed)
+    BROTLI_AVAILABLE = True
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        BROTLI_AVAILABLE = True
+    except ImportError:
+        BROTLI_AVAILABLE = False
+
+ACCEPT_ENCODING = "gzip, deflate, br" if BROTLI_AVAILABLE else "gzip, deflate"
+
+_CHARSET_HEADER = re.compile(r"charset=[\"']?([\w.:-]+)", re.IGNORECASE)
+_CHARSET_META = re.compile(rb"<meta[^>]+charset=[\"']?([\w.:-]+)", re.IGNORECASE)
+
+
+def declared_encoding(response, head: Optional[bytes] = None) -> Optional[str]:
+    """Encoding declared by the Content-Type header or a <meta charset> tag.
+
+    Unlike ``response.text`` this never falls back to running charset
+    detection over the whole body; it only looks at the header and the first
+    few KB of the document (``head``, defaulting to the start of the body).
+    Returns None when nothing is declared.
+    """
+    match = _CHARSET_HEADER.search(response.headers.get('Content-Type', ''))
+    if match:
+        return match.group(1).lower()
+    if head is None:
+        head = response.content
+    match = _CHARSET_META.search(head[:4096])
+    if match:
+        return match.group(1).decode('ascii').lower()
+    return None
+
+
+def wire_bytes(response, fallback: int) -> int:
+    """Bytes received on the wire, i.e. before gzip/brotli decoding"""
+    tell = getattr(response.raw, 'tell', None)
+    try:
+        return int(tell()) or fallback if tell else fallback
+    except Exception:
+        return fallback
+
+
+class BandwidthStats:
+    """Thread-safe compressed vs. uncompressed byte counts for one domain"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.responses = 0
+        self.compressed = 0
+        self.uncompressed = 0
+        self.by_encoding: Dict[str, int] = {}
+
+    def add(self, compressed: int, uncompressed: int, content_encoding: Optional[str] = None):
+        with self._lock:
+            self.responses += 1
+            self.compressed += compressed
+            self.uncompressed += uncompressed
+            key = content_encoding or 'identity'
+            self.by_encoding[key] = self.by_encoding.get(key, 0) + 1
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'responses': self.responses,
+                'compressed_bytes': self.compressed,
+                'uncompressed_bytes': self.uncompressed,
+                'compression_ratio': round(self.uncompressed / self.compressed, 2) if self.compressed else None,
+                'content_encodings': dict(self.by_encoding),
+            }
@@ -0,0 +1,247 @@
+import asyncio
+import os
+import ssl
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from loguru import logger
+
+try:
+    import httpx
+    import h2  # noqa: F401  (httpx only negotiates HTTP/2 when h2 is installed)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Trace events around the TCP connect and TLS handshake of a new connection
+_CONNECT_EVENTS = ('connection.connect_tcp', 'connection.start_tls')
+
+
+class RequestsTransport:
+    """HTTP/1.1 through the scraper's ``requests`` session: one connection per concurrent request to a host"""
+    name = "http1.1"
+
+    def __init__(self, session: requests.Session):
+        self.session = session
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        return self.session.request(method, url, **kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        return {'transport': self.name}
+
+    def close(self):
+        pass
+
+
+class _RawCounter:
+    """Stands in for ``response.raw`` so ``wire_bytes`` sees the bytes received before decoding"""
+
+    def __init__(self, response: "httpx.Response"):
+        self._response = response
+
+    def tell(self) -> int:
+        return self._response.num_bytes_downloaded
+
+
+def _requests_error(e: Exception) -> requests.RequestException:
+    if isinstance(e, httpx.TimeoutException):
+        return requests.Timeout(e)
+    if isinstance(e, httpx.TransportError):
+        return requests.ConnectionError(e)
+    return requests.RequestException(e)
+
+
+class HTTP2Response(requests.Response):
+    """An httpx response behind the ``requests.Response`` interface the scrapers use.
+
+    Streamed bodies are read chunk by chunk on the transport's event loop.
+    """
+
+    def __init__(self, transport: "HTTP2Transport", response: "httpx.Response", body: Optional[bytes]):
+        super().__init__()
+        self._transport = transport
+        self._httpx = response
+        self.status_code = response.status_code
+        self.headers = CaseInsensitiveDict(response.headers.multi_items())
+        self.url = str(response.url)
+        self.reason = response.reason_phrase
+        self.encoding = get_encoding_from_headers(self.headers)
+        self.http_version = response.http_version
+        self.raw = _RawCounter(response)
+        if body is not None:
+            self._content = body
+            self._content_consumed = True
+            self.elapsed = response.elapsed
+
+    def iter_content(self, chunk_size: Optional[int] = 1, decode_unicode: bool = False):
+        if self._content_consumed:
+            yield from super().iter_content(chunk_size, decode_unicode)
+            return
+        chunks = self._httpx.aiter_bytes(chunk_size)
+        try:
+            while True:
+                try:
+                    yield self._transport.run(chunks.__anext__())
+                except StopAsyncIteration:
+                    break
+        finally:
+            self._content_consumed = True
+
+    def close(self):
+        if not self._httpx.is_closed:
+            self._transport.run(self._httpx.aclose())
+
+
+class HTTP2Transport:
+    """Multiplexes concurrent requests to a host over one HTTP/2 connection.
+
+    Requests from any thread are handed to one ``httpx`` async client per
+    proxy (one for direct requests), running on a background event loop, so
+    streams on a shared connection are opened in order. Clients are created
+    on first use with the session's headers, cookie jar and certificate
+    checks. ``max_connections`` caps the connections open at once across
+    hosts and ``max_keepalive`` the idle ones kept for reuse; HTTP/1.1-only
+    servers get pooled HTTP/1.1 connections instead. Connections opened and
+    time spent in TCP connect + TLS handshake are counted for ``stats``.
+    """
+    name = "http2"
+
+    def __init__(self, session: requests.Session, max_connections: int = 10, max_keepalive: int = 10,
+                 keepalive_expiry: float = 30.0):
+        self.session = session
+        self.limits = httpx.Limits(
+            max_connections=max_connections, max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.connections = 0
+        self.connect_seconds = 0.0
+        self.requests = 0
+        self.by_version: Dict[str, int] = {}
+        self._clients: Dict[Optional[str], "httpx.AsyncClient"] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def run(self, coro):
+        """Run a coroutine on the transport's event loop and wait for its result"""
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, daemon=True, name="http2-transport")
+                self._thread.start()
+        try:
+            return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+        except httpx.HTTPError as e:
+            raise _requests_error(e) from e
+
+    def _client(self, proxy: Optional[str]) -> "httpx.AsyncClient":
+        client = self._clients.get(proxy)
+        if client is None:
+            verify = self.session.verify
+            if isinstance(verify, str):
+                # A CA bundle path, as accepted by requests
+                verify = ssl.create_default_context(cafile=verify)
+            client = httpx.AsyncClient(
+                http2=True, limits=self.limits, proxy=proxy, verify=verify,
+                cookies=self.session.cookies, trust_env=self.session.trust_env,
+            )
+            self._clients[proxy] = client
+        return client
+
+    async def _trace(self, event: str, info: Dict[str, Any], started: Dict[str, float]):
+        step, _, stage = event.rpartition('.')
+        if step not in _CONNECT_EVENTS:
+            return
+        if stage == 'started':
+            started[step] = time.perf_counter()
+        elif stage == 'complete' and step in started:
+            with self._lock:
+                self.connect_seconds += time.perf_counter() - started.pop(step)
+                self.connections += step == 'connection.connect_tcp'
+
+    async def _send(self, proxy: Optional[str], method: str, url: str, headers: Dict[str, str],
+                    stream: bool, allow_redirects: bool, **kwargs) -> HTTP2Response:
+        client = self._client(proxy)
+        started: Dict[str, float] = {}
+
+        async def trace(event: str, info: Dict[str, Any]):
+            await self._trace(event, info, started)
+
+        request = client.build_request(method, url, headers=headers, extensions={'trace': trace}, **kwargs)
+        response = await client.send(request, stream=True, follow_redirects=allow_redirects)
+        body = None
+        if not stream:
+            try:
+                body = await response.aread()
+            finally:
+                await response.aclose()
+        return HTTP2Response(self, response, body)
+
+    def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None,
+                proxies: Optional[Dict[str, str]] = None, stream: bool = False,
+                allow_redirects: bool = True, **kwargs) -> requests.Response:
+        """Same arguments as ``session.request`` (``params``, ``data``, ``json`` and ``timeout`` are passed through)"""
+        proxy = (proxies or {}).get('https' if url.startswith('https') else 'http')
+        response = self.run(self._send(
+            proxy, method, url, {**self.session.headers, **(headers or {})}, stream, allow_redirects, **kwargs
+        ))
+        with self._lock:
+            self.requests += 1
+            self.by_version[response.http_version] = self.by_version.get(response.http_version, 0) + 1
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'transport': self.name,
+                'requests': self.requests,
+                'connections': self.connections,
+                'connect_ms': round(self.connect_seconds * 1000, 1),
+                'http_versions': dict(self.by_version),
+            }
+
+    def close(self):
+        with self._lock:
+            loop, thread, self._loop = self._loop, self._thread, None
+        if loop is None:
+            return
+
+        async def close_clients():
+            for client in self._clients.values():
+                await client.aclose()
+            self._clients.clear()
+
+        asyncio.run_coroutine_threadsafe(close_clients(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        loop.close()
+
+
+def transport_settings(config: Dict[str, Any]) -> Dict[str, Any]:
+    """The ``transport`` key of a domain config ("http2" or an object with ``type`` and pool limits),
+    else ``SCRAPER_TRANSPORT``, as an object"""
+    settings = config.get('transport') or os.getenv('SCRAPER_TRANSPORT') or 'http1.1'
+    if isinstance(settings, str):
+        settings = {'type': settings}
+    return dict(settings)
+
+
+def make_transport(session: requests.Session, config: Dict[str, Any]):
+    """Transport for the ``transport_settings`` of a domain config; HTTP/1.1 through the session by default."""
+    settings = transport_settings(config)
+    if settings.get('type', 'http1.1') != 'http2':
+        return RequestsTransport(session)
+    if not HTTP2_AVAILABLE:
+        logger.warning("HTTP/2 transport needs httpx[http2]; falling back to HTTP/1.1 through requests")
+        return RequestsTransport(session)
+    return HTTP2Transport(
+        session,
+        max_connections=int(settings.get('max_connections', 10)),
+        max_keepalive=int(settings.get('max_keepalive', settings.get('max_connections', 10))),
+        keepalive_expiry=float(settings.get('keepalive_expiry', 30.0)),
+    )
@@ -0,0 +1,99 @@
+import time
+from typing import Any, Dict, List, Optional
+
+from utils.work_queue import BaseWorkQueue, default_worker_id
+
+
+def seed_pages(queue: BaseWorkQueue, domain: str, pages: int,
+               params: Optional[Dict[str, Any]] = None) -> int:
+    """Enqueue listing page tasks 1..pages for a domain"""
+    params = params or {}
+    return queue.enqueue(domain, 'page', [
+        {'page': page, 'params': params} for page in range(1, pages + 1)
+    ])
+
+
+class CrawlWorker:
+    """Pull page and detail tasks for one domain from a shared work queue.
+
+    Any number of workers, in one or many processes, can share the same queue.
+    Page tasks write their items to the queue's sink and enqueue detail tasks
+    for the scraper's detail URLs; detail tasks merge their fields into the
+    item with the same URL.
+    """
+
+    def __init__(self, scraper, queue: BaseWorkQueue, worker_id: Optional[str] = None,
+                 lease_seconds: float = 120, batch_size: int = 4, poll_interval: float = 2.0):
+        self.scraper = scraper
+        self.queue = queue
+        self.domain = scraper.domain
+        self.worker_id = worker_id or default_worker_id()
+        self.lease_seconds = lease_seconds
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.delay = scraper.config.get('delay', 1.0)
+        self.logger = scraper.logger.bind(worker=self.worker_id)
+        self.stats = {'done': 0, 'failed': 0, 'lost': 0, 'items': 0}
+
+    def run(self, drain: bool = True, max_tasks: Optional[int] = None) -> Dict[str, int]:
+        """Process tasks until the queue is drained (or forever when ``drain`` is False)"""
+        processed = 0
+        while max_tasks is None or processed < max_tasks:
+            tasks = self.queue.lease(self.domain, self.worker_id, self.lease_seconds, self.batch_size)
+            if not tasks:
+                if drain and not self.queue.has_open_tasks(self.domain):
+                    break
+                # Other workers still hold leases; wait for them to finish or expire
+                time.sleep(self.poll_interval)
+                continue
+
+            for task in tasks:
+                self._process(task)
+                processed += 1
+                time.sleep(self.delay)
+            # One parse error summary per batch, so a long-running worker's counts don't grow forever
+            self.scraper.parse_errors.log_summary()
+
+        self.logger.info(f"Worker finished: {self.stats}")
+        return self.stats
+
+    def _process(self, task: Dict[str, Any]):
+        try:
+            if task['kind'] == 'page':
+                items, follow_ups = self._run_page_task(task['payload'])
+            elif task['kind'] == 'detail':
+                items, follow_ups = self._run_detail_task(task['payload']), []
+            else:
+                raise ValueError(f"Unknown task kind: {task['kind']}")
+        except Exception as e:
+            self.logger.error(f"Task {task['id']} ({task['kind']}) failed: {e}")
+            self.queue.nack(task['id'], self.worker_id, str(e))
+            self.stats['failed'] += 1
+            return
+
+        if self.queue.ack(task['id'], self.worker_id, items, follow_ups=follow_ups):
+            self.stats['done'] += 1
+            self.stats['items'] += len(items)
+        else:
+            self.logger.warning(f"Lease on task {task['id']} expired before ack; result dropped")
+            self.stats['lost'] += 1
+
+    def _run_page_task(self, payload: Dict[str, Any]):
+        page = payload['page']
+        params = payload.get('params', {})
+        result = self.scraper.fetch_page(page, **params)
+        if not result.fetched:
+            raise RuntimeError(f"Could not fetch page {page}")
+
+        if not result.items or not result.has_next:
+            cancelled = self.queue.cancel_pending(self.domain, 'page', params, after_page=page)
+            if cancelled:
+                self.logger.info(f"Last page is {page}; cancelled {cancelled} queued pages")
+
+        follow_ups = [('detail', {'url': url}) for url in self.scraper.detail_urls(result.items)]
+        self.logger.info(f"Scraped page {page}: {len(result.items)} items")
+        return result.items, follow_ups
+
+    def _run_detail_task(self, payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+        fields = self.scraper.fetch_detail(payload['url'])
+        return [{**fields, 'url': payload['url']}]
@@ -0,0 +1,181 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+# Seconds between checks while a stage waits for memory, and between RSS reads
+POLL_SECONDS = 0.05
+
+
+def current_rss() -> Optional[int]:
+    """Resident set size of this process in bytes (None where /proc is not available)"""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class MemoryBudget:
+    """Process-wide memory limit shared by every pipeline stage.
+
+    Stages charge the bytes they hold (raw pages being parsed, records
+    waiting to be saved). ``wait`` blocks an upstream stage while the
+    charged bytes or the process RSS are above ``high_water`` of the limit,
+    until downstream stages have released what they hold. Charged bytes
+    always drain on their own, so a waiting stage never blocks them. With
+    nothing charged it lets the caller through, one item at a time.
+    """
+
+    def __init__(self, limit_bytes: Optional[int] = None, high_water: float = 0.9):
+        self.limit_bytes = limit_bytes
+        self.high_water = high_water
+        self.charged = 0
+        self.holders = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self._rss: Optional[int] = None
+        self._rss_at = 0.0
+        self._lock = threading.Lock()
+
+    def charge(self, nbytes: int):
+        with self._lock:
+            self.charged += nbytes
+            self.holders += 1
+
+    def release(self, nbytes: int, count: int = 1):
+        with self._lock:
+            self.charged -= nbytes
+            self.holders -= count
+
+    def rss(self) -> Optional[int]:
+        now = time.monotonic()
+        if now - self._rss_at >= POLL_SECONDS:
+            self._rss, self._rss_at = current_rss(), now
+        return self._rss
+
+    def over(self) -> bool:
+        if not self.limit_bytes:
+            return False
+        threshold = self.limit_bytes * self.high_water
+        rss = self.rss()
+        return self.charged >= threshold or (rss is not None and rss >= threshold)
+
+    def wait(self) -> float:
+        """Block while over budget and downstream stages still hold charged bytes; returns the seconds waited"""
+        if not self.limit_bytes:
+            return 0.0
+        started = time.monotonic()
+        while self.over() and self.holders > 0:
+            time.sleep(POLL_SECONDS)
+        waited = time.monotonic() - started
+        if waited:
+            with self._lock:
+                self.waits += 1
+                self.wait_seconds += waited
+        return waited
+
+    def stats(self) -> Dict[str, Any]:
+        rss = self.rss()
+        return {
+            'limit_mb': round(self.limit_bytes / 2**20, 1) if self.limit_bytes else None,
+            'charged_mb': round(self.charged / 2**20, 2),
+            'rss_mb': round(rss / 2**20, 1) if rss is not None else None,
+            'waits': self.waits,
+            'wait_seconds': round(self.wait_seconds, 2),
+        }
+
+
+_budget: Optional[MemoryBudget] = None
+
+
+def configure_memory_budget(limit_mb: Optional[float] = None) -> MemoryBudget:
+    """Set the process-wide budget (``SCRAPER_MEMORY_MB`` when not given; unset or 0 = no limit)"""
+    global _budget
+    if limit_mb is None:
+        limit_mb = float(os.getenv('SCRAPER_MEMORY_MB', '0'))
+    limit = int(limit_mb * 2**20) if limit_mb else None
+    if _budget is None:
+        _budget = MemoryBudget(limit)
+    else:
+        _budget.limit_bytes = limit
+    return _budget
+
+
+def memory_budget() -> MemoryBudget:
+    return _budget or configure_memory_budget()
+
+
+class Stage:
+    """Bounded hand-off into one pipeline stage (listing pages, detail fetches, database writes).
+
+    ``enter`` blocks the producer while ``capacity`` items are queued or in
+    progress; ``leave`` marks them done. Bytes held by the stage are charged
+    to the memory budget. ``depth`` and ``stats`` expose the current state.
+    """
+
+    def __init__(self, name: str, capacity: Optional[int] = None, budget: Optional[MemoryBudget] = None):
+        self.name = name
+        self.capacity = capacity
+        self.budget = budget or memory_budget()
+        self.depth = 0
+        self.max_depth = 0
+        self.bytes = 0
+        self.entered = 0
+        self.blocked_seconds = 0.0
+        self._cond = threading.Condition()
+
+    def enter(self, nbytes: int = 0):
+        """Take a place in the stage, waiting while it is full"""
+        started = time.monotonic()
+        with self._cond:
+            while self.capacity and self.depth >= self.capacity:
+                self._cond.wait()
+            self.depth += 1
+            self.entered += 1
+            self.max_depth = max(self.max_depth, self.depth)
+            self.bytes += nbytes
+            self.blocked_seconds += time.monotonic() - started
+        if nbytes:
+            self.budget.charge(nbytes)
+
+    def leave(self, nbytes: int = 0, count: int = 1):
+        with self._cond:
+            self.depth -= count
+            self.bytes -= nbytes
+            self._cond.notify(count)
+        if nbytes:
+            self.budget.release(nbytes, count)
+
+    def wait_for_memory(self) -> float:
+        """Called by the stage's producer before it creates more work"""
+        waited = self.budget.wait()
+        if waited:
+            with self._cond:
+                self.blocked_seconds += waited
+        return waited
+
+    @contextmanager
+    def holding(self, nbytes: int) -> Iterator[None]:
+        """Charge ``nbytes`` to the stage (and the budget) for the duration of the block"""
+        with self._cond:
+            self.bytes += nbytes
+        self.budget.charge(nbytes)
+        try:
+            yield
+        finally:
+            with self._cond:
+                self.bytes -= nbytes
+            self.budget.release(nbytes)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                'depth': self.depth,
+                'capacity': self.capacity,
+                'max_depth': self.max_depth,
+                'bytes': self.bytes,
+                'entered': self.entered,
+                'blocked_seconds': round(self.blocked_seconds, 2),
+            }
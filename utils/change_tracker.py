@@ -0,0 +1,153 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+STATE_DIR = Path("outputs/state")
+
+# Fields that change on every run and must not count as a content change
+VOLATILE_FIELDS = ('scraped_timestamp', 'cluster_id')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    has_next INTEGER NOT NULL,
+    items TEXT NOT NULL,
+    seen_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS items (
+    item_key TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    data TEXT NOT NULL,
+    seen_at REAL NOT NULL
+);
+"""
+
+
+def fingerprint_bytes(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _stable_fields(item: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: v for k, v in item.items() if k not in VOLATILE_FIELDS}
+
+
+def fingerprint_item(item: Dict[str, Any]) -> str:
+    payload = json.dumps(_stable_fields(item), sort_keys=True, default=str)
+    return fingerprint_bytes(payload.encode('utf-8'))
+
+
+class ChangeTracker:
+    """Remember page and item fingerprints between runs of one domain.
+
+    Listing pages whose body hash matches the previous run reuse the items
+    parsed last time, so unchanged pages are never parsed again. At the end of
+    a run ``diff`` compares the scraped items with the stored ones and
+    ``commit`` makes the current run the new baseline. A partial run (fewer
+    pages or queries than usual, or pages that failed) reports no removals and
+    only updates the items it saw.
+    """
+
+    def __init__(self, domain: str, root: Optional[Path] = None):
+        self.domain = domain
+        self.dir = Path(root or STATE_DIR) / domain
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.dir / "fingerprints.db"), timeout=30, check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+        self.pages_skipped = 0
+
+    def cached_page(self, url: str, fingerprint: str) -> Optional[Tuple[List[Dict[str, Any]], bool]]:
+        """Items and next-link flag from the last run if the page body is unchanged"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT fingerprint, items, has_next FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None or row[0] != fingerprint:
+            return None
+        self.pages_skipped += 1
+        return json.loads(row[1]), bool(row[2])
+
+    def remember_page(self, url: str, fingerprint: str, items: List[Dict[str, Any]], has_next: bool):
+        stored = json.dumps([_stable_fields(item) for item in items], default=str)
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO pages (url, fingerprint, has_next, items, seen_at) VALUES (?, ?, ?, ?, ?)",
+                (url, fingerprint, int(has_next), stored, time.time()),
+            )
+            self.conn.commit()
+
+    @staticmethod
+    def item_key(item: Dict[str, Any]) -> str:
+        url = item.get('url')
+        if url and url != "N/A":
+            return url
+        return fingerprint_item(item)
+
+    def diff(self, items: List[Dict[str, Any]], full: bool = True) -> Dict[str, List[Dict[str, Any]]]:
+        """Split the current items into new, changed and removed relative to the last run.
+
+        Items missing from a partial run (``full`` False) are not reported as removed.
+        """
+        with self._lock:
+            previous = {
+                key: (fp, data)
+                for key, fp, data in self.conn.execute("SELECT item_key, fingerprint, data FROM items")
+            }
+
+        delta = {'new': [], 'changed': [], 'removed': []}
+        seen = set()
+        for item in items:
+            key = self.item_key(item)
+            if key in seen:
+                continue
+            seen.add(key)
+            if key not in previous:
+                delta['new'].append(item)
+                continue
+            old_fp, old_data = previous[key]
+            if fingerprint_item(item) != old_fp:
+                old = json.loads(old_data)
+                current = json.loads(json.dumps(_stable_fields(item), default=str))
+                changes = {
+                    field: [old.get(field), value]
+                    for field, value in current.items() if old.get(field) != value
+                }
+                delta['changed'].append({'key': key, 'changes': changes, 'item': item})
+
+        if full:
+            delta['removed'] = [
+                {'key': key, 'item': json.loads(data)}
+                for key, (_, data) in previous.items() if key not in seen
+            ]
+        return delta
+
+    def baseline(self, keys: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Items stored by the last run, optionally only those with the given keys"""
+        with self._lock:
+            rows = self.conn.execute("SELECT item_key, data FROM items").fetchall()
+        wanted = set(keys) if keys is not None else None
+        return [json.loads(data) for key, data in rows if wanted is None or key in wanted]
+
+    def commit(self, items: List[Dict[str, Any]], full: bool = True):
+        """Store the current items as the baseline for the next run (a partial run only updates its own items)"""
+        now = time.time()
+        rows = {
+            self.item_key(item): (fingerprint_item(item), json.dumps(_stable_fields(item), default=str))
+            for item in items
+        }
+        with self._lock:
+            if full:
+                self.conn.execute("DELETE FROM items")
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO items (item_key, fingerprint, data, seen_at) VALUES (?, ?, ?, ?)",
+                [(key, fp, data, now) for key, (fp, data) in rows.items()],
+            )
+            self.conn.commit()
+
+    def close(self):
+        self.conn.close()
@@ -22,5 +22,15 @@ DB_CONFIG = {
     'password': os.getenv('DB_PASSWORD', '')
 }
 
+# Background database writer used while scraping (run.py scrape --save-db)
+DB_STREAM_CONFIG = {
+    'batch_size': int(os.getenv('DB_BATCH_SIZE', '500')),
+    'flush_interval': float(os.getenv('DB_FLUSH_INTERVAL', '2.0'))
+}
+
+# Work queue shared by distributed workers: a SQLAlchemy URL (e.g. postgresql://...) for
+# workers on several machines; unset uses a SQLite file on this machine (run.py worker --queue)
+WORK_QUEUE_URL = os.getenv('WORK_QUEUE_URL')
+
 # API Keys
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
\ No newline at end of file
@@ -1,7 +1,15 @@
+import json
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
 from sqlalchemy import create_engine, Column, String, Float, DateTime, JSON
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from .config import DB_CONFIG
+from .config import DB_CONFIG, DB_STREAM_CONFIG
+from .change_tracker import ChangeTracker, fingerprint_bytes
+from .backpressure import Stage
 import pandas as pd
 from loguru import logger
 
@@ -9,47 +17,228 @@ Base = declarative_base()
 
 class ScrapedData(Base):
     __tablename__ = 'scraped_data'
-    
+
     id = Column(String, primary_key=True)
     domain = Column(String)
     data = Column(JSON)
     timestamp = Column(DateTime)
     source = Column(String)
 
+
+def record_id(domain: str, item: Dict[str, Any]) -> str:
+    """Stable row id: the item's URL (or content fingerprint), so rewrites of an item update one row"""
+    return f"{domain}_{ChangeTracker.item_key(item)}"
+
+
 class DatabaseManager:
-    def __init__(self):
-        self.engine = self._create_engine()
+    def __init__(self, connection_string: Optional[str] = None):
+        self.engine = self._create_engine(connection_string)
         self.Session = sessionmaker(bind=self.engine)
-    
-    def _create_engine(self):
-        connection_string = (
+
+    def _create_engine(self, connection_string: Optional[str] = None):
+        connection_string = connection_string or (
             f"{DB_CONFIG['dialect']}+{DB_CONFIG['driver']}://"
             f"{DB_CONFIG['username']}:{DB_CONFIG['password']}@"
             f"{DB_CONFIG['host']}:{DB_CONFIG['port']}/"
             f"{DB_CONFIG['database']}"
         )
-        return create_engine(connection_string)
-    
-    def save_data(self, domain: str, data: list, source: str):
-        """Save scraped data to database"""
+        # Pooled connections are reused across batches; pre-ping drops ones the server closed
+        return create_engine(connection_string, pool_pre_ping=True)
+
+    def _rows(self, domain: str, data: list, source: str) -> List[Dict[str, Any]]:
+        now = pd.Timestamp.now().to_pydatetime()
+        return [
+            {
+                'id': record_id(domain, item),
+                # Round-trip through JSON so timestamps fit the JSON column
+                'data': json.loads(json.dumps(item, default=str)),
+                'domain': domain,
+                'timestamp': now,
+                'source': source,
+            }
+            for item in data
+        ]
+
+    def write_rows(self, rows: List[Dict[str, Any]]):
+        """Upsert rows in one transaction (one multi-row statement on PostgreSQL and SQLite)"""
+        session = self.Session()
         try:
-            session = self.Session()
-            
-            for item in data:
-                record = ScrapedData(
-                    id=f"{domain}_{hash(str(item))}",
-                    domain=domain,
-                    data=item,
-                    timestamp=pd.Timestamp.now(),
-                    source=source
+            dialect = self.engine.dialect.name
+            if dialect in ('postgresql', 'sqlite'):
+                if dialect == 'postgresql':
+                    from sqlalchemy.dialects.postgresql import insert
+                else:
+                    from sqlalchemy.dialects.sqlite import insert
+                statement = insert(ScrapedData).values(rows)
+                statement = statement.on_conflict_do_update(
+                    index_elements=['id'],
+                    set_={column: statement.excluded[column] for column in ('domain', 'data', 'timestamp', 'source')},
                 )
-                session.merge(record)
-            
+                session.execute(statement)
+            else:
+                for row in rows:
+                    session.merge(ScrapedData(**row))
             session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def save_data(self, domain: str, data: list, source: str) -> bool:
+        """Save scraped data to database; returns False if the write failed"""
+        try:
+            rows = self._rows(domain, data, source)
+            if rows:
+                self.write_rows(rows)
             logger.info(f"Saved {len(data)} records to database for domain: {domain}")
-            
+            return True
+
         except Exception as e:
             logger.error(f"Database save failed: {e}")
-            session.rollback()
+            return False
+
+    def stream(self, domain: str, source: str, batch_size: Optional[int] = None,
+               flush_interval: Optional[float] = None) -> "DatabaseSink":
+        """Start a background writer that saves records while the crawl is still running"""
+        return DatabaseSink(
+            self, domain, source,
+            batch_size=batch_size or DB_STREAM_CONFIG['batch_size'],
+            flush_interval=flush_interval or DB_STREAM_CONFIG['flush_interval'],
+        )
+
+
+_STOP = object()
+
+
+class DatabaseSink:
+    """Writes records on a background thread in batches of ``batch_size`` or every ``flush_interval`` seconds.
+
+    Producers block in ``put`` once ``batch_size`` records are waiting to be
+    committed (queued, batching or in flight), so a crash loses at most one
+    batch. Records are serialized when they are put, so later changes to the
+    item dicts don't race with the writer; a record identical to the last
+    version sent for its id (compared by a hash of its JSON) is skipped.
+    """
+
+    def __init__(self, manager: DatabaseManager, domain: str, source: str,
+                 batch_size: int = 500, flush_interval: float = 2.0, max_retries: int = 3):
+        self.manager = manager
+        self.domain = domain
+        self.source = source
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self._queue: "queue.Queue" = queue.Queue()
+        # Records waiting to be committed; their JSON size counts against the memory budget
+        self.stage = Stage('db', self.batch_size)
+        # Id -> hash of the last version sent; only the hash is kept so this stays small on long crawls
+        self._sent: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.records = 0
+        self.skipped = 0
+        self.failed = 0
+        self.batches = 0
+        self.commit_ms: List[float] = []
+        self.lag_ms: List[float] = []
+        self._thread = threading.Thread(target=self._run, name=f"db-sink-{domain}", daemon=True)
+        self._thread.start()
+
+    def put(self, items: List[Dict[str, Any]]):
+        """Queue items for writing; blocks while a full batch is still uncommitted"""
+        self._put(self.manager._rows(self.domain, items, self.source))
+
+    def _put(self, rows: List[Dict[str, Any]]):
+        for row in rows:
+            encoded = json.dumps(row['data'], sort_keys=True)
+            digest = fingerprint_bytes(encoded.encode('utf-8'))
+            with self._lock:
+                if self._sent.get(row['id']) == digest:
+                    self.skipped += 1
+                    continue
+                self._sent[row['id']] = digest
+            self.stage.enter(len(encoded))
+            self._queue.put((row, time.monotonic(), len(encoded)))
+
+    def _run(self):
+        batch, first_at = [], None
+        while True:
+            timeout = None if not batch else max(0.0, first_at + self.flush_interval - time.monotonic())
+            try:
+                entry = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                entry = None
+            if entry is _STOP:
+                if batch:
+                    self._flush(batch)
+                return
+            if entry is not None:
+                batch.append(entry)
+                first_at = first_at if first_at is not None else entry[1]
+            if batch and (len(batch) >= self.batch_size or time.monotonic() - first_at >= self.flush_interval):
+                self._flush(batch)
+                batch, first_at = [], None
+
+    def _flush(self, batch: List[Any]):
+        # Last version wins when an id repeats within a batch (one upsert can't touch a row twice)
+        rows = list({row['id']: row for row, _, _ in batch}.values())
+        started = time.monotonic()
+        try:
+            for attempt in range(1, self.max_retries + 1):
+                try:
+                    self.manager.write_rows(rows)
+                    break
+                except Exception as e:
+                    if attempt == self.max_retries:
+                        raise
+                    logger.warning(f"DB batch of {len(rows)} failed (attempt {attempt}): {e}")
+                    time.sleep(0.5 * 2 ** (attempt - 1))
+            done = time.monotonic()
+            self.records += len(rows)
+            self.batches += 1
+            self.commit_ms.append((done - started) * 1000)
+            self.lag_ms.append((done - min(enqueued for _, enqueued, _ in batch)) * 1000)
+        except Exception as e:
+            self.failed += len(rows)
+            with self._lock:
+                # Let a later put of the same records try again
+                for row in rows:
+                    self._sent.pop(row['id'], None)
+            logger.error(f"DB batch of {len(rows)} records dropped: {e}")
         finally:
-            session.close()
\ No newline at end of file
+            self.stage.leave(sum(size for _, _, size in batch), count=len(batch))
+
+    def stats(self) -> Dict[str, Any]:
+        def summary(values: List[float]) -> Dict[str, float]:
+            if not values:
+                return {}
+            ordered = sorted(values)
+            return {
+                'avg': round(sum(ordered) / len(ordered), 2),
+                'p50': round(ordered[len(ordered) // 2], 2),
+                'max': round(ordered[-1], 2),
+            }
+        return {
+            'records': self.records,
+            'batches': self.batches,
+            'skipped_unchanged': self.skipped,
+            'failed': self.failed,
+            'queued': self._queue.qsize(),
+            'commit_ms': summary(self.commit_ms),
+            'lag_ms': summary(self.lag_ms),
+        }
+
+    def close(self) -> Dict[str, Any]:
+        """Flush what is left, stop the writer and log its stats"""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+        stats = self.stats()
+        logger.info(f"DB sink for {self.domain}: {stats}")
+        return stats
+
+    def __enter__(self) -> "DatabaseSink":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
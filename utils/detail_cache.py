@@ -0,0 +1,53 @@
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+STATE_DIR = Path("outputs/state")
+
+
+class DetailCache:
+    """Persistent cache of fields extracted from detail pages, keyed by URL.
+
+    Entries are stored with ``spec`` (a digest of the field configuration) and
+    entries written under another spec count as misses.
+    """
+
+    def __init__(self, domain: str, ttl_seconds: float, root: Optional[Path] = None, spec: str = ""):
+        self.ttl_seconds = ttl_seconds
+        self.spec = spec
+        directory = Path(root or STATE_DIR) / domain
+        directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(directory / "details.db"), timeout=30, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS details (url TEXT PRIMARY KEY, fields TEXT NOT NULL, fetched_at REAL NOT NULL, "
+            "spec TEXT NOT NULL DEFAULT '')"
+        )
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(details)")]
+        if 'spec' not in columns:
+            # Caches written before the spec column are treated as another spec
+            self.conn.execute("ALTER TABLE details ADD COLUMN spec TEXT NOT NULL DEFAULT ''")
+            self.conn.commit()
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT fields, fetched_at, spec FROM details WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None or row[2] != self.spec or time.time() - row[1] > self.ttl_seconds:
+            return None
+        return json.loads(row[0])
+
+    def put(self, url: str, fields: Dict[str, Any]):
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO details (url, fields, fetched_at, spec) VALUES (?, ?, ?, ?)",
+                (url, json.dumps(fields, default=str), time.time(), self.spec),
+            )
+            self.conn.commit()
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,229 @@
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+HISTORY_DIR = Path("outputs/history")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS partitions (
+    path TEXT PRIMARY KEY,
+    snapshot_date TEXT NOT NULL,
+    rows INTEGER NOT NULL,
+    stats TEXT NOT NULL,
+    written_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS partitions_date ON partitions (snapshot_date);
+"""
+
+DateLike = Union[str, date, datetime, None]
+
+
+def _day(value: DateLike) -> Optional[str]:
+    if value is None:
+        return None
+    return pd.Timestamp(value).strftime("%Y-%m-%d")
+
+
+def to_number(series: pd.Series) -> pd.Series:
+    """Numeric values of a column that may hold strings like "$1,250" or "N/A" """
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype(float)
+    cleaned = series.astype(str).str.replace(r"[^\d.\-]", "", regex=True)
+    return pd.to_numeric(cleaned, errors='coerce')
+
+
+def _common_type(types: List[pa.DataType]) -> pa.DataType:
+    """One type every snapshot's values of a column can be read as"""
+    types = [t for t in dict.fromkeys(types) if not pa.types.is_null(t)]
+    if not types:
+        return pa.null()
+    if len(types) == 1:
+        return types[0]
+    if all(pa.types.is_integer(t) or pa.types.is_floating(t) for t in types):
+        return pa.float64()
+    return pa.string()
+
+
+def unified_schema(paths: List[Path]) -> pa.Schema:
+    """Schema covering the columns of all files, with drifted column types widened"""
+    types: Dict[str, List[pa.DataType]] = {}
+    for path in paths:
+        for field in pq.read_schema(path):
+            types.setdefault(field.name, []).append(field.type)
+    return pa.schema([(name, _common_type(found)) for name, found in types.items()])
+
+
+class HistoryStore:
+    """Append-only history of scraped items, partitioned by domain and scrape date.
+
+    Every snapshot is written as a Parquet file under
+    ``<root>/<domain>/date=YYYY-MM-DD/``. A small SQLite manifest keeps the row
+    count and per-column min/max of each file, so queries open only the files
+    whose date and value ranges can match.
+    """
+
+    def __init__(self, domain: str, root: Optional[Path] = None):
+        self.domain = domain
+        self.dir = Path(root or HISTORY_DIR) / domain
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.dir / "manifest.db"), timeout=30, check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+
+    @staticmethod
+    def _column_stats(df: pd.DataFrame) -> Dict[str, List[Any]]:
+        stats = {}
+        for column in df.columns:
+            values = df[column].dropna()
+            if values.empty:
+                continue
+            if pd.api.types.is_numeric_dtype(values):
+                stats[column] = [float(values.min()), float(values.max())]
+            else:
+                values = values.astype(str)
+                stats[column] = [values.min(), values.max()]
+        return stats
+
+    def append(self, items: List[Dict[str, Any]], scraped_at: Optional[datetime] = None) -> Optional[Path]:
+        """Write one snapshot and register it in the manifest"""
+        if not items:
+            return None
+        scraped_at = pd.Timestamp(scraped_at or datetime.now())
+        df = pd.DataFrame(items)
+        for column in df.columns:
+            # Mixed object columns (e.g. "N/A" next to numbers) are stored as text
+            if df[column].dtype == object:
+                df[column] = df[column].map(lambda v: None if v is None else str(v))
+        if 'url' in df.columns:
+            # Sorted keys keep Parquet row-group statistics selective
+            df = df.sort_values('url', kind='stable')
+        df['snapshot_ts'] = scraped_at
+        snapshot_date = scraped_at.strftime("%Y-%m-%d")
+
+        partition = self.dir / f"date={snapshot_date}"
+        partition.mkdir(parents=True, exist_ok=True)
+        path = partition / f"part-{scraped_at.strftime('%H%M%S')}-{os.getpid()}-{uuid.uuid4().hex[:8]}.parquet"
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), path, compression='zstd')
+
+        stats = self._column_stats(df.drop(columns=['snapshot_ts']))
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO partitions (path, snapshot_date, rows, stats, written_at) VALUES (?, ?, ?, ?, ?)",
+                (str(path.relative_to(self.dir)), snapshot_date, len(df), json.dumps(stats), datetime.now().timestamp()),
+            )
+            self.conn.commit()
+        return path
+
+    def partitions(self, since: DateLike = None, until: DateLike = None,
+                   equals: Optional[Dict[str, Sequence[Any]]] = None) -> List[Path]:
+        """Files inside the date range whose min/max can contain the ``equals`` values"""
+        sql, params = "SELECT path, stats FROM partitions WHERE 1 = 1", []
+        if since is not None:
+            sql += " AND snapshot_date >= ?"
+            params.append(_day(since))
+        if until is not None:
+            sql += " AND snapshot_date <= ?"
+            params.append(_day(until))
+        with self._lock:
+            rows = self.conn.execute(sql + " ORDER BY snapshot_date, path", params).fetchall()
+
+        selected = []
+        for path, stats in rows:
+            stats = json.loads(stats)
+            if equals and not all(self._may_contain(stats.get(column), values) for column, values in equals.items()):
+                continue
+            selected.append(self.dir / path)
+        return selected
+
+    @staticmethod
+    def _may_contain(bounds: Optional[List[Any]], values: Sequence[Any]) -> bool:
+        if bounds is None:
+            return False
+        low, high = bounds
+        for value in values:
+            value = float(value) if isinstance(low, float) else str(value)
+            if low <= value <= high:
+                return True
+        return False
+
+    def query(self, since: DateLike = None, until: DateLike = None,
+              columns: Optional[List[str]] = None,
+              equals: Optional[Dict[str, Sequence[Any]]] = None) -> pd.DataFrame:
+        """Rows from the snapshots in ``[since, until]``, optionally filtered by exact column values.
+
+        Snapshots may differ in columns (fields added later are null in older
+        files) and in column types (read as float, or text if not all numeric).
+        """
+        paths = self.partitions(since, until, equals)
+        if not paths:
+            return pd.DataFrame(columns=(columns or []) + ['snapshot_ts'])
+        schema = unified_schema(paths)
+        dataset = ds.dataset([str(p) for p in paths], schema=schema, format='parquet')
+        wanted = None
+        if columns is not None:
+            wanted = [c for c in dict.fromkeys(list(columns) + ['snapshot_ts']) if c in schema.names]
+        expression = None
+        for column, values in (equals or {}).items():
+            condition = ds.field(column).isin(self._typed(values, schema.field(column).type))
+            expression = condition if expression is None else expression & condition
+        df = dataset.to_table(columns=wanted, filter=expression).to_pandas()
+        for column in columns or []:
+            if column not in df.columns:
+                df[column] = None
+        return df
+
+    @staticmethod
+    def _typed(values: Sequence[Any], type_: pa.DataType) -> pa.Array:
+        """``values`` as an array of a column's type, for ``isin``"""
+        if pa.types.is_string(type_) or pa.types.is_large_string(type_) or pa.types.is_null(type_):
+            return pa.array([str(v) for v in values], pa.string())
+        return pa.array(list(values)).cast(type_)
+
+    def trend(self, field: str, key: str = 'url', since: DateLike = None, until: DateLike = None,
+              keys: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Daily value of ``field`` per ``key`` (last snapshot of each day), e.g. price per book URL"""
+        df = self.query(since, until, columns=[key, field], equals={key: keys} if keys else None)
+        if df.empty:
+            return pd.DataFrame(columns=[key, 'date', field])
+        df['date'] = pd.to_datetime(df['snapshot_ts']).dt.date
+        df[field] = to_number(df[field])
+        df = df.sort_values('snapshot_ts').groupby([key, 'date'], as_index=False)[field].last()
+        return df[[key, 'date', field]]
+
+    def counts(self, by: str, since: DateLike = None, until: DateLike = None,
+               sep: Optional[str] = None) -> pd.DataFrame:
+        """Items per day per value of ``by`` (e.g. jobs per company); ``sep`` splits list columns like tags"""
+        df = self.query(since, until, columns=[by])
+        if df.empty:
+            return pd.DataFrame(columns=['date', by, 'count'])
+        df['date'] = pd.to_datetime(df['snapshot_ts']).dt.date
+        values = df[by].astype(str)
+        if sep:
+            df = df.assign(**{by: values.str.split(sep)}).explode(by)
+            df[by] = df[by].str.strip()
+        df = df[~df[by].isin(["", "N/A", "None"])]
+        # Several snapshots on one day: count the last one only
+        last = df.groupby('date')['snapshot_ts'].transform('max')
+        df = df[df['snapshot_ts'] == last]
+        return df.groupby(['date', by]).size().reset_index(name='count')
+
+    def close(self):
+        self.conn.close()
+
+
+def summarize_trend(trend: pd.DataFrame, key: str, field: str) -> pd.DataFrame:
+    """First, last, min and max of a trend per key, with the absolute change"""
+    grouped = trend.dropna(subset=[field]).groupby(key)[field]
+    summary = grouped.agg(['first', 'last', 'min', 'max', 'count'])
+    summary['change'] = summary['last'] - summary['first']
+    return summary.reset_index()
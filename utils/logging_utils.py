@@ -0,0 +1,127 @@
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, Optional, TextIO
+
+from loguru import logger
+
+TEXT_FORMAT = "{time} {level} {message}"
+
+
+def _json_format(record: Dict[str, Any]) -> str:
+    # Values bound with logger.bind() (e.g. scraper=...) become fields of the line
+    entry = {
+        'ts': record['time'].isoformat(),
+        'level': record['level'].name,
+        'msg': record['message'],
+        'logger': record['name'],
+    }
+    entry.update({key: value for key, value in record['extra'].items() if key != '_json'})
+    if record['exception'] is not None:
+        entry['error'] = repr(record['exception'].value)
+    record['extra']['_json'] = json.dumps(entry, default=str)
+    return "{extra[_json]}\n"
+
+
+class RateLimitedLog:
+    """Token bucket per message key: at most ``per_second`` messages (bursts of ``burst``).
+
+    ``allow`` returns None for a message to drop, or the number of messages
+    dropped under the key since the last one let through.
+    """
+
+    def __init__(self, per_second: Optional[float] = None, burst: int = 5):
+        self.per_second = per_second
+        self.burst = burst
+        self._state: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def allow(self, key: str) -> Optional[int]:
+        if self.per_second is None:
+            return 0
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated, dropped = self._state.get(key, (self.burst, now, 0))
+            tokens = min(self.burst, tokens + (now - updated) * self.per_second)
+            if tokens < 1:
+                self._state[key] = (tokens, now, dropped + 1)
+                return None
+            self._state[key] = (tokens - 1, now, 0)
+            return dropped
+
+
+# Per-request messages (one per fetched URL); unlimited unless configure_logging sets a rate
+request_log = RateLimitedLog()
+_mode = "dev"
+
+
+def configure_logging(mode: Optional[str] = None, level: Optional[str] = None,
+                      sink: Optional[TextIO] = None, request_rate: Optional[float] = None) -> str:
+    """Install the single log sink for ``mode`` (``LOG_MODE``: dev or prod) and return the mode.
+
+    dev: plain text written synchronously, every per-request message logged.
+    prod: one JSON object per line written from a background thread
+    (``enqueue=True``), so scraper threads never wait on the terminal or a
+    pipe; per-request messages are limited to ``LOG_REQUEST_RATE`` per second.
+    """
+    global _mode
+    mode = (mode or os.getenv('LOG_MODE', 'dev')).lower()
+    level = level or os.getenv('LOG_LEVEL', 'INFO')
+    sink = sink or sys.stdout
+    if mode not in ('dev', 'prod'):
+        raise ValueError(f"Unknown log mode '{mode}' (expected dev or prod)")
+
+    logger.remove()
+    request_log._state.clear()
+    if mode == "prod":
+        logger.add(sink, format=_json_format, level=level, enqueue=True, backtrace=False, diagnose=False)
+        request_log.per_second = request_rate or float(os.getenv('LOG_REQUEST_RATE', '1'))
+    else:
+        logger.add(sink, format=TEXT_FORMAT, level=level)
+        request_log.per_second = request_rate
+    _mode = mode
+    return mode
+
+
+def log_mode() -> str:
+    return _mode
+
+
+class ErrorCounts:
+    """Parse errors counted per selector and exception type.
+
+    The first error of each kind in a run is logged (with its traceback in
+    dev mode); repeats are only counted and reported by ``log_summary``.
+    """
+
+    def __init__(self, log=None):
+        self.log = log or logger
+        self.counts: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._lock = threading.Lock()
+
+    def record(self, selector: str, error: Exception, context: str = ""):
+        kind = type(error).__name__
+        with self._lock:
+            self.counts[selector][kind] += 1
+            first = self.counts[selector][kind] == 1
+        if first:
+            where = f" ({context})" if context else ""
+            self.log.opt(depth=1, exception=error if _mode == "dev" else None).error(
+                f"{kind} with selector '{selector}'{where}: {error}; repeats are counted"
+            )
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {selector: dict(kinds) for selector, kinds in self.counts.items()}
+
+    def log_summary(self) -> Dict[str, Dict[str, int]]:
+        """Log the counts and start counting afresh (one summary per run)"""
+        summary = self.summary()
+        with self._lock:
+            self.counts.clear()
+        if summary:
+            self.log.warning(f"Parse errors by selector: {summary}")
+        return summary
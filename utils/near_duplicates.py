@@ -0,0 +1,129 @@
+import re
+import zlib
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def normalize_text(text: Optional[str]) -> str:
+    if not isinstance(text, str) or text.strip() in ("", "N/A"):
+        return ""
+    text = re.sub(r"[^\w\s]", " ", text.lower())
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def shingles(text: str, size: int = 4) -> np.ndarray:
+    """32-bit hashes of the character n-grams of a normalized text"""
+    if len(text) <= size:
+        grams = {text} if text else set()
+    else:
+        grams = {text[i:i + size] for i in range(len(text) - size + 1)}
+    return np.fromiter((zlib.crc32(g.encode('utf-8')) for g in grams), dtype=np.uint64, count=len(grams))
+
+
+def lsh_params(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """Pick (bands, rows) whose S-curve midpoint (1/b)^(1/r) is closest to ``threshold``"""
+    best = (num_perm, 1)
+    best_gap = float('inf')
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        gap = abs((1 / bands) ** (1 / rows) - threshold)
+        if gap < best_gap:
+            best, best_gap = (bands, rows), gap
+    return best
+
+
+class MinHasher:
+    """MinHash signatures from universal hashes ``(a * x + b) mod p``"""
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        rng = np.random.RandomState(seed)
+        self.num_perm = num_perm
+        self.a = rng.randint(1, np.iinfo(np.int64).max, size=num_perm, dtype=np.int64).astype(np.uint64) % MERSENNE_PRIME
+        self.b = rng.randint(0, np.iinfo(np.int64).max, size=num_perm, dtype=np.int64).astype(np.uint64) % MERSENNE_PRIME
+
+    def signature(self, hashes: np.ndarray) -> np.ndarray:
+        if len(hashes) == 0:
+            return np.full(self.num_perm, MAX_HASH, dtype=np.uint64)
+        with np.errstate(over='ignore'):
+            permuted = (np.outer(hashes, self.a) + self.b) % MERSENNE_PRIME & MAX_HASH
+        return permuted.min(axis=0)
+
+
+class _UnionFind:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, x: int) -> int:
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, x: int, y: int):
+        rx, ry = self.find(x), self.find(y)
+        if rx != ry:
+            # Keep the earliest item as the root so cluster ids are stable
+            self.parent[max(rx, ry)] = min(rx, ry)
+
+
+def cluster_near_duplicates(texts: Sequence[Optional[str]], threshold: float = 0.8,
+                            num_perm: int = 128, shingle_size: int = 4) -> List[int]:
+    """Cluster texts whose estimated Jaccard similarity is at least ``threshold``.
+
+    Each text gets a MinHash signature; signatures are split into LSH bands
+    and only texts sharing a band bucket are compared, so the work grows
+    roughly linearly with the number of texts. Candidates are checked against
+    the bucket's first member using the signature agreement. Returns a
+    cluster id per text: the index of the cluster's first text. Empty texts
+    are never clustered.
+    """
+    hasher = MinHasher(num_perm)
+    normalized = [normalize_text(text) for text in texts]
+    signatures = np.vstack([
+        hasher.signature(shingles(text, shingle_size)) for text in normalized
+    ]) if normalized else np.empty((0, num_perm), dtype=np.uint64)
+
+    bands, rows = lsh_params(threshold, num_perm)
+    uf = _UnionFind(len(normalized))
+    for band in range(bands):
+        buckets: Dict[bytes, int] = {}
+        chunk = signatures[:, band * rows:(band + 1) * rows]
+        for i, text in enumerate(normalized):
+            if not text:
+                continue
+            key = chunk[i].tobytes()
+            first = buckets.setdefault(key, i)
+            if first == i or uf.find(first) == uf.find(i):
+                continue
+            if np.mean(signatures[first] == signatures[i]) >= threshold:
+                uf.union(first, i)
+
+    return [uf.find(i) for i in range(len(normalized))]
+
+
+def cluster_items(items: List[Dict], fields: List[str], threshold: float = 0.8,
+                  num_perm: int = 128, shingle_size: int = 4) -> Dict[str, int]:
+    """Add a ``cluster_id`` to each item from the near-duplicate clusters of ``fields``.
+
+    Returns a summary with the number of items and distinct clusters.
+    """
+    texts = [" ".join(str(item.get(field, "")) for field in fields if item.get(field) not in (None, "N/A"))
+             for item in items]
+    clusters = cluster_near_duplicates(texts, threshold, num_perm, shingle_size)
+    for item, cluster in zip(items, clusters):
+        item['cluster_id'] = cluster
+    sizes = defaultdict(int)
+    for cluster in clusters:
+        sizes[cluster] += 1
+    return {
+        'items': len(items),
+        'clusters': len(sizes),
+        'duplicates': len(items) - len(sizes),
+    }
@@ -0,0 +1,160 @@
+import gzip
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import zstandard
+except ImportError:  # gzip is always available
+    zstandard = None
+
+ARCHIVE_DIR = Path("outputs/archive")
+
+# One lock per segment file for the whole process: every PageArchive writing
+# to the same segment (scheduler, bench-e2e, several scrapers) must serialize
+# its appends or the recorded offsets go stale
+_segment_locks: Dict[Path, threading.Lock] = {}
+_segment_locks_guard = threading.Lock()
+
+
+def _segment_lock(path: Path) -> threading.Lock:
+    with _segment_locks_guard:
+        return _segment_locks.setdefault(path.resolve(), threading.Lock())
+
+INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    status INTEGER,
+    encoding TEXT,
+    codec TEXT NOT NULL,
+    segment TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    raw_length INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_pages_url ON pages (url, fetched_at);
+CREATE INDEX IF NOT EXISTS idx_pages_time ON pages (fetched_at);
+"""
+
+
+def compress(data: bytes, codec: str) -> bytes:
+    if codec == 'zstd':
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+
+def decompress(data: bytes, codec: str) -> bytes:
+    if codec == 'zstd':
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+class PageArchive:
+    """Append-only compressed store of every fetched page for one domain.
+
+    Page bodies are compressed one record at a time and appended to daily
+    segment files (one per process, so concurrent workers never interleave
+    writes; instances within a process share a lock per segment). A SQLite
+    index maps URL and fetch time to the segment offset.
+    """
+
+    def __init__(self, domain: str, root: Optional[Path] = None, codec: Optional[str] = None):
+        self.domain = domain
+        self.dir = Path(root or ARCHIVE_DIR) / domain
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.codec = codec or ('zstd' if zstandard else 'gzip')
+        self._lock = threading.Lock()
+        self._conn = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(str(self.dir / "index.db"), timeout=30, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(INDEX_SCHEMA)
+        return self._conn
+
+    def _segment_name(self, fetched_at: float) -> str:
+        day = time.strftime("%Y%m%d", time.gmtime(fetched_at))
+        suffix = 'zst' if self.codec == 'zstd' else 'gz'
+        return f"pages-{day}-{os.getpid()}.{suffix}"
+
+    def store(self, url: str, body: bytes, kind: str = "page", status: int = 200,
+              encoding: Optional[str] = None, fetched_at: Optional[float] = None) -> None:
+        """Append a page body to the archive"""
+        fetched_at = fetched_at or time.time()
+        blob = compress(body, self.codec)
+        segment = self._segment_name(fetched_at)
+
+        path = self.dir / segment
+        with _segment_lock(path):
+            with open(path, 'ab') as f:
+                offset = f.tell()
+                f.write(blob)
+        with self._lock:
+            self.conn.execute(
+                "INSERT INTO pages (url, kind, fetched_at, status, encoding, codec, segment, offset, length, raw_length) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, kind, fetched_at, status, encoding, self.codec, segment, offset, len(blob), len(body)),
+            )
+            self.conn.commit()
+
+    def entries(self, kind: Optional[str] = None, since: Optional[float] = None,
+                until: Optional[float] = None, latest_only: bool = True) -> List[Dict[str, Any]]:
+        """Index entries, optionally limited to a kind and fetch-time range"""
+        clauses, params = [], []
+        if kind:
+            clauses.append("kind = ?")
+            params.append(kind)
+        if since is not None:
+            clauses.append("fetched_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("fetched_at < ?")
+            params.append(until)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        columns = "url, kind, fetched_at, status, encoding, codec, segment, offset, length"
+        if latest_only:
+            query = (
+                f"SELECT {columns} FROM pages WHERE id IN "
+                f"(SELECT MAX(id) FROM pages {where} GROUP BY url, kind) ORDER BY id"
+            )
+        else:
+            query = f"SELECT {columns} FROM pages {where} ORDER BY id"
+
+        names = columns.split(", ")
+        return [dict(zip(names, row)) for row in self.conn.execute(query, params)]
+
+    def history(self, url: str) -> List[Dict[str, Any]]:
+        """All archived fetches of a URL, oldest first"""
+        rows = self.conn.execute(
+            "SELECT fetched_at, status, raw_length FROM pages WHERE url = ? ORDER BY fetched_at", (url,)
+        ).fetchall()
+        return [{'fetched_at': r[0], 'status': r[1], 'bytes': r[2]} for r in rows]
+
+    def read(self, entry: Dict[str, Any]) -> bytes:
+        """Return the decompressed body of an index entry"""
+        return read_entry(self.dir, entry)
+
+    def iter_pages(self, **filters) -> Iterator[Dict[str, Any]]:
+        for entry in self.entries(**filters):
+            yield {**entry, 'body': self.read(entry)}
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def read_entry(directory: Path, entry: Dict[str, Any]) -> bytes:
+    with open(Path(directory) / entry['segment'], 'rb') as f:
+        f.seek(entry['offset'])
+        blob = f.read(entry['length'])
+    return decompress(blob, entry['codec'])
@@ -0,0 +1,162 @@
+import json
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .change_tracker import ChangeTracker, fingerprint_item
+
+INDEX_PATH = Path("outputs/state/search.db")
+
+# Searchable field -> item columns that feed it (whichever a domain has)
+SEARCH_FIELDS = {
+    'title': ('title', 'name', 'course'),
+    'skills': ('skills',),
+    'tags': ('tags', 'matched_queries'),
+    'company': ('company', 'instructor', 'agent'),
+    'address': ('address', 'location'),
+}
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS docs (
+    id INTEGER PRIMARY KEY,
+    domain TEXT NOT NULL,
+    item_key TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    data TEXT NOT NULL,
+    indexed_at REAL NOT NULL,
+    UNIQUE (domain, item_key)
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS docs_fts USING fts5(
+    domain UNINDEXED, {", ".join(SEARCH_FIELDS)},
+    tokenize = "unicode61 remove_diacritics 2 tokenchars '+#'",
+    prefix = '2 3'
+);
+"""
+
+
+def _quote_symbols(query: str) -> str:
+    """Quote bare terms such as ``c++`` or ``c#`` that FTS5 would reject as syntax"""
+    return re.sub(r'(?<![\w"])(\w*[+#][\w+#]*)', r'"\1"', query)
+
+
+def _field_text(item: Dict[str, Any], columns) -> str:
+    values = [item.get(column) for column in columns]
+    return " ".join(str(v) for v in values if v not in (None, "", "N/A"))
+
+
+class SearchIndex:
+    """Incrementally maintained SQLite FTS5 index over the scraped items of every domain.
+
+    ``update`` compares item fingerprints with the indexed ones, so a run only
+    rewrites the rows of new and changed items and deletes the items that are
+    gone. Queries use the FTS5 syntax: ``pytorch``, ``pyth*`` (prefix),
+    ``tags:rust`` (field filter), ``"machine learning" AND company:google``.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path or INDEX_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def update(self, domain: str, items: List[Dict[str, Any]], prune: bool = True) -> Dict[str, int]:
+        """Index new and changed items of ``domain``; with ``prune``, drop items missing from ``items``"""
+        current = {}
+        for item in items:
+            current[ChangeTracker.item_key(item)] = item
+
+        stats = {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 0}
+        now = time.time()
+        with self._lock, self.conn:
+            indexed = {
+                key: (doc_id, fp) for doc_id, key, fp in self.conn.execute(
+                    "SELECT id, item_key, fingerprint FROM docs WHERE domain = ?", (domain,)
+                )
+            }
+            for key, item in current.items():
+                fp = fingerprint_item(item)
+                existing = indexed.get(key)
+                if existing is not None and existing[1] == fp:
+                    stats['unchanged'] += 1
+                    continue
+                data = json.dumps(item, default=str)
+                if existing is None:
+                    doc_id = self.conn.execute(
+                        "INSERT INTO docs (domain, item_key, fingerprint, data, indexed_at) VALUES (?, ?, ?, ?, ?)",
+                        (domain, key, fp, data, now),
+                    ).lastrowid
+                    stats['added'] += 1
+                else:
+                    doc_id = existing[0]
+                    self.conn.execute(
+                        "UPDATE docs SET fingerprint = ?, data = ?, indexed_at = ? WHERE id = ?",
+                        (fp, data, now, doc_id),
+                    )
+                    self.conn.execute("DELETE FROM docs_fts WHERE rowid = ?", (doc_id,))
+                    stats['updated'] += 1
+                self.conn.execute(
+                    f"INSERT INTO docs_fts (rowid, domain, {', '.join(SEARCH_FIELDS)}) "
+                    f"VALUES (?, ?{', ?' * len(SEARCH_FIELDS)})",
+                    (doc_id, domain, *(_field_text(item, cols) for cols in SEARCH_FIELDS.values())),
+                )
+
+            if prune:
+                gone = [(doc_id,) for key, (doc_id, _) in indexed.items() if key not in current]
+                self.conn.executemany("DELETE FROM docs_fts WHERE rowid = ?", gone)
+                self.conn.executemany("DELETE FROM docs WHERE id = ?", gone)
+                stats['removed'] = len(gone)
+        return stats
+
+    def search(self, query: str, domain: Optional[str] = None, field: Optional[str] = None,
+               limit: int = 20, rank: bool = False) -> List[Dict[str, Any]]:
+        """Items matching an FTS5 query, optionally restricted to a domain or field.
+
+        Results come most recently added first, which lets SQLite stop after
+        ``limit`` matches; ``rank`` orders by BM25 relevance instead, at a cost
+        that grows with the number of matching items.
+        """
+        query = _quote_symbols(query)
+        if field is not None:
+            if field not in SEARCH_FIELDS:
+                raise ValueError(f"Unknown search field {field!r}; choose from {list(SEARCH_FIELDS)}")
+            query = f"{field} : ({query})"
+        order = "rank" if rank else "rowid DESC"
+        sql = f"SELECT rowid, {'rank' if rank else 'NULL'} FROM docs_fts WHERE docs_fts MATCH ?"
+        params: List[Any] = [query]
+        if domain is not None:
+            sql += " AND domain = ?"
+            params.append(domain)
+        sql += f" ORDER BY {order} LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            matches = self.conn.execute(sql, params).fetchall()
+            if not matches:
+                return []
+            docs = dict(
+                (row[0], row[1:]) for row in self.conn.execute(
+                    f"SELECT id, domain, data FROM docs WHERE id IN ({', '.join('?' * len(matches))})",
+                    [doc_id for doc_id, _ in matches],
+                )
+            )
+        results = []
+        for doc_id, score in matches:
+            domain_name, data = docs[doc_id]
+            result = {'domain': domain_name, **json.loads(data)}
+            if score is not None:
+                result['score'] = round(score, 4)
+            results.append(result)
+        return results
+
+    def count(self, domain: Optional[str] = None) -> int:
+        with self._lock:
+            if domain is None:
+                return self.conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+            return self.conn.execute("SELECT COUNT(*) FROM docs WHERE domain = ?", (domain,)).fetchone()[0]
+
+    def close(self):
+        self.conn.close()